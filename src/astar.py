@@ -2,6 +2,8 @@
 Basit A* implementasyonu:
 - Heuristik: düz çizgi (Haversine) mesafesi
 - Kenar maliyeti: graph.edge[u][v]['cost']
+- Kapalı küme: bir düğüm en fazla bir kez genişletilir
+Çok sayıda sorgu için routing.PathEngine (toplu Dijkstra) tercih edilmeli.
 """
 import math
 import heapq
@@ -25,10 +27,15 @@ def astar(g: nx.Graph, start: str, goal: str):
     open_set = [(0, start)]
     g_score = {start: 0}
     came_from = {}
+    closed = set()
 
-    pos = nx.get_node_attributes(g, "pos")
+    nodes = g.nodes                      # O(1) düğüm özniteliği erişimi
+    goal_pos = nodes[goal]["pos"]
     while open_set:
         _, current = heapq.heappop(open_set)
+        if current in closed:
+            continue                     # aynı düğümün eski heap kaydı
+        closed.add(current)
 
         if current == goal:
             # yol oluştur
@@ -39,11 +46,13 @@ def astar(g: nx.Graph, start: str, goal: str):
             return g_score[goal], list(reversed(path))
 
         for neighbor in g.neighbors(current):
+            if neighbor in closed:
+                continue
             tentative = g_score[current] + g[current][neighbor]["cost"]
             if tentative < g_score.get(neighbor, float("inf")):
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative
-                f_score = tentative + haversine(pos[neighbor], pos[goal])
+                f_score = tentative + haversine(nodes[neighbor]["pos"], goal_pos)
                 heapq.heappush(open_set, (f_score, neighbor))
 
     raise ValueError("Goal not reachable")
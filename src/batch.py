@@ -0,0 +1,152 @@
+"""
+Toplu (batched) NumPy popülasyon değerlendirmesi:
+• Popülasyon (P kromozom × D drone × L durak) dolgulu indeks dizisine paketlenir
+• Bacak mesafeleri, varış zamanları, batarya, gecikme cezası ve depoya dönüş
+  enerjisi tüm rotalar için tek seferde gather + accumulate ile hesaplanır
+• Anlam GAOptimizer.fitness / csp.check_route ile birebir aynıdır:
+  np.add/subtract.accumulate Python'daki ardışık += / -= ile aynı sırada
+  topladığı için sonuçlar bit düzeyinde eşleşir (bkz. quick_test_batch.py)
+• Saatli NFZ bacakları: kenar anahtarları (i·N + j) sıralı diziye, yasak
+  aralıkları dolgulu (M, K, 2) tabloya alınır; searchsorted ile vektörel sorgu
+"""
+from typing import List
+import numpy as np
+from chromosome import ArrayChrom
+
+# ga.py ile aynı sabitler (döngüsel import'u önlemek için burada)
+DELIVERY_REWARD   = 1_000.0
+ENERGY_WEIGHT     = 1.0
+LATE_PENALTY_MIN  = 50.0
+METRE_PER_WH      = 40.0
+TAKEOFF_MIN       = 8 * 60
+
+
+def pack_routes(pop, drone_ids, id2node: np.ndarray) -> np.ndarray:
+    """Kromozomları (P, D, L) düğüm indeksine çevirir (drone_ids sırası); dolgu = -1."""
+    routes = [[np.asarray(c.route(c.layout[d])) for d in drone_ids] if isinstance(c, ArrayChrom)
+              else [np.asarray(c[d], dtype=np.int64) for d in drone_ids]
+              for c in pop]
+    L = max((len(r) for rs in routes for r in rs), default=0) or 1
+    idx = np.full((len(pop), len(drone_ids), L), -1, dtype=np.int64)
+    for p, rs in enumerate(routes):
+        for d, r in enumerate(rs):
+            idx[p, d, :len(r)] = id2node[r]
+    return idx
+
+
+class TimedLegs:
+    """Saatli NFZ bacakları: kenar anahtarları (i·N + j) sıralı dizide, yasak
+       aralıklar dolgulu (M, K, 2) tabloda; hit() searchsorted ile vektörel sorgu."""
+
+    def __init__(self, nfz, n: int):
+        self.n = n
+        keys = sorted(i * n + j for i, j in nfz.windows)
+        k_max = max((len(w) for w in nfz.windows.values()), default=1)
+        self.keys = np.array(keys, dtype=np.int64)
+        self.iv = np.empty((len(keys), k_max, 2))
+        self.iv[:, :, 0], self.iv[:, :, 1] = np.inf, -np.inf         # boş aralık
+        for r, key in enumerate(keys):
+            w = nfz.windows[divmod(key, n)]
+            self.iv[r, :len(w)] = w
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def hit(self, i, j, t0, t1) -> np.ndarray:
+        """[t0, t1] uçuşu (i, j) kenarının aktif bir aralığıyla çakışıyor mu."""
+        row = np.searchsorted(self.keys, i * self.n + j)
+        iv = self.iv[row]                                         # (m, K, 2)
+        return ((iv[:, :, 0] <= t1[:, None]) & (t0[:, None] <= iv[:, :, 1])).any(axis=1)
+
+
+class BatchEvaluator:
+    """Bir GAOptimizer senaryosu için toplu fitness hesaplayıcı."""
+
+    def __init__(self, ga):
+        self.ga = ga
+        dm, inst = ga.dm, ga.inst
+        n = len(dm)
+        # Düğüm başına teslimat öznitelikleri (depo düğümleri: nötr değerler)
+        self.weight, self.win_start, self.win_end = inst.weight, inst.win_start, inst.win_end
+        # Drone başına (ga.drones sırası)
+        self.home, self.max_weight = inst.home, inst.max_weight
+        self.capacity, self.speed = inst.battery, inst.speed
+        # teslimat id → düğüm indeksi
+        self.id2node = inst.id2node
+        # Saatli NFZ kenar tablosu
+        self.timed = TimedLegs(ga.nfz, n)
+
+    # --------- paketleme ----------
+    def pack(self, pop) -> np.ndarray:
+        """Popülasyonu (P, D, L) düğüm indeksine çevirir; dolgu = -1."""
+        return pack_routes(pop, [d.id for d in self.ga.drones], self.id2node)
+
+    # --------- değerlendirme ----------
+    def evaluate(self, pop) -> List[float]:
+        """GAOptimizer.fitness ile aynı skorlar (liste)."""
+        if not pop:
+            return []
+        return self.evaluate_packed(self.pack(pop)).tolist()
+
+    def evaluate_packed(self, idx: np.ndarray) -> np.ndarray:
+        P, D, L = idx.shape
+        dist = self.ga.dm.dist
+        nfz = self.ga.nfz
+        home = self.home[None, :, None]
+
+        valid = idx >= 0
+        lens = valid.sum(axis=2)                                   # (P, D)
+        node = np.where(valid, idx, home)
+        prev = np.concatenate([np.broadcast_to(home, (P, D, 1)), node[:, :, :-1]], axis=2)
+        leg = np.where(valid, dist[prev, node].astype(np.float64), 0.0)
+
+        # Batarya: cap - e1 - e2 ...  (check_route'taki ardışık -= ile aynı)
+        energy = leg / METRE_PER_WH
+        cap = np.broadcast_to(self.capacity[None, :, None], (P, D, 1))
+        battery = np.subtract.accumulate(np.concatenate([cap, energy], axis=2), axis=2)
+        # Zaman: 480 + dt1 + dt2 ...
+        dt = leg / self.speed[None, :, None] / 60
+        t0 = np.full((P, D, 1), float(TAKEOFF_MIN))
+        clock = np.add.accumulate(np.concatenate([t0, dt], axis=2), axis=2)
+        arrive = clock[:, :, 1:]
+
+        we = self.win_end[node]
+        fail = valid & (
+            (self.weight[node] > self.max_weight[None, :, None])
+            | (energy > battery[:, :, :-1])
+            | ~((self.win_start[node] <= arrive) & (arrive <= we))
+            | nfz.blocked[prev, node]
+        )
+
+        # Dönüş bacağı
+        last = np.take_along_axis(node, np.maximum(lens - 1, 0)[:, :, None], axis=2)[:, :, 0]
+        last = np.where(lens > 0, last, self.home[None, :])
+        back = dist[last, self.home[None, :]].astype(np.float64)
+        back_energy = back / METRE_PER_WH
+        bat_last = np.take_along_axis(battery, lens[:, :, None], axis=2)[:, :, 0]
+        t_last = np.take_along_axis(clock, lens[:, :, None], axis=2)[:, :, 0]
+        t_home = t_last + back / self.speed[None, :] / 60
+        route_fail = fail.any(axis=2) | (back_energy > bat_last) | nfz.blocked[last, self.home[None, :]]
+
+        # Saatli NFZ'ler: yalnızca işaretli bacaklar tabloya sorulur
+        if len(self.timed):
+            p, d, t = np.nonzero(valid & nfz.timed[prev, node])
+            hit = self.timed.hit(prev[p, d, t], node[p, d, t], clock[p, d, t], clock[p, d, t + 1])
+            route_fail[p[hit], d[hit]] = True
+            home2 = np.broadcast_to(self.home[None, :], (P, D))
+            p, d = np.nonzero(nfz.timed[last, home2])
+            hit = self.timed.hit(last[p, d], home2[p, d], t_last[p, d], t_home[p, d])
+            route_fail[p[hit], d[hit]] = True
+
+        # Rota skoru — fitness ile aynı işlem sırası
+        bat_left = bat_last - back_energy
+        score = lens * DELIVERY_REWARD - (self.capacity[None, :] - bat_left) * ENERGY_WEIGHT
+        late = np.where(valid & (arrive > we), (arrive - we) * LATE_PENALTY_MIN, 0.0)
+        score = np.subtract.accumulate(np.concatenate([score[:, :, None], late], axis=2), axis=2)[:, :, -1]
+        score = score - back_energy * ENERGY_WEIGHT
+
+        total = np.zeros(P)
+        for d in range(D):
+            total = total + score[:, d]
+        total[route_fail.any(axis=1)] = -np.inf
+        return total
@@ -0,0 +1,47 @@
+# src/bench_parallel.py
+"""
+Paralel fitness kıyaslaması: popülasyon boyutuna göre seri ↔ süreç havuzu.
+Kullanım:  python src/bench_parallel.py [teslimat_sayısı] [işçi_sayısı ...]
+"""
+import os
+import sys
+import time
+from data_generator import make_drones, make_deliveries, make_nfz
+from ga import GAOptimizer
+from parallel import PoolEvaluator
+
+POP_SIZES = (60, 300, 1000)
+
+
+def main():
+    n_del = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = [int(w) for w in sys.argv[2:]] or sorted({2, 4, os.cpu_count() or 1})
+
+    drones, deliveries, zones = make_drones(10), make_deliveries(n_del), make_nfz(4)
+    ga = GAOptimizer(drones, deliveries, None, zones)
+    pops = {n: [ga.random_chromosome() for _ in range(n)] for n in POP_SIZES}
+
+    print(f"{n_del} teslimat, {len(drones)} drone, {len(zones)} NFZ, {os.cpu_count()} çekirdek")
+    ref, ref_time = {}, {}
+    for n, pop in pops.items():
+        t = time.perf_counter()
+        ref[n] = [ga.fitness(c) for c in pop]
+        ref_time[n] = time.perf_counter() - t
+        print(f"seri        pop={n:5d}  {ref_time[n]*1000:9.1f} ms")
+
+    for w in workers:
+        t = time.perf_counter()
+        with PoolEvaluator(ga, w) as pool:
+            pool.map(pops[POP_SIZES[0]][:w])           # işçileri ısıt
+            startup = time.perf_counter() - t
+            for n, pop in pops.items():
+                t = time.perf_counter()
+                scores = pool.map(pop)
+                dt = time.perf_counter() - t
+                assert scores == ref[n], "paralel skorlar seri ile aynı olmalı"
+                print(f"workers={w:<3d} pop={n:5d}  {dt*1000:9.1f} ms  "
+                      f"hızlanma ×{ref_time[n] / dt:5.2f}  (başlatma {startup*1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
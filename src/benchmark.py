@@ -0,0 +1,220 @@
+"""
+Kıyaslama paketi (tek giriş noktası, çevrimdışı):
+• Senaryolar : scenario_gen ile tohumlu üretilir (20 … 10k teslimat)
+• Ölçülenler : build_graph, intersects_nfz, astar, check_route,
+               GAOptimizer kurulumu / fitness / run
+• Her vaka   : repeat kez koşulur, en iyi süre + işlem/s kaydedilir;
+               ayrı bir koşu tracemalloc ile tepe bellek (MB) ölçer
+• Sonuçlar JSON'a yazılır; --baseline verilirse (vaka, boyut) başına süre /
+  bellek oranı hesaplanır, tolerans aşımı REGRESYON olarak işaretlenir ve
+  çıkış kodu 1 olur
+Tam grafik ve GA, N² matrisler yüzünden yalnızca --full-max / --ga-max
+teslimata kadar ölçülür; daha büyükte build_graph k=8 seyrek grafik kurar.
+Kullanım (proje kökünden):
+    PYTHONPATH=src python src/benchmark.py --sizes 20 200 1000 --out bench.json
+    PYTHONPATH=src python src/benchmark.py --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from astar import astar
+from csp import check_route
+from ga import GAOptimizer
+from graph import build_graph, build_nfz_polygons, intersects_nfz
+from scenario_gen import GenConfig, generate
+from scenario_io import load_scenario
+
+SIZES = (20, 200, 1000, 10_000)
+MIN_MB = 1.0               # bunun altındaki tepe bellekler karşılaştırılmaz (gürültü)
+
+
+@dataclass
+class Result:
+    case: str
+    n: int
+    seconds: float           # en iyi koşu
+    ops: int                 # koşu başına işlem sayısı
+    throughput: float        # işlem / s
+    peak_mb: float           # tracemalloc tepe bellek
+    note: str = ""
+
+
+# ---- Senaryo ---------------------------------------------------------------
+def scenario_config(n: int, seed: int = 0) -> GenConfig:
+    """Boyuta göre ölçeklenen tohumlu senaryo (drone, depo, NFZ, alan)."""
+    return GenConfig(n_deliveries=n, n_drones=min(200, max(5, n // 50)),
+                     n_depots=min(8, max(1, n // 200)), n_zones=min(40, max(2, n // 250)),
+                     n_clusters=min(64, max(4, n // 100)),
+                     span=min(0.25, 0.05 * (n / 20) ** 0.25), seed=seed)
+
+
+def load_sized(n: int, workdir: Path, seed: int = 0):
+    path = generate(scenario_config(n, seed), workdir / f"bench_{n}_{seed}.scn")
+    drones, deliveries, zones = load_scenario(path)
+    return list(drones), list(deliveries), list(zones)
+
+
+# ---- Ölçüm -----------------------------------------------------------------
+def calls(fn: Callable, *args, each=None, **kw) -> Callable[[], int]:
+    """measure() için koşu: fn(*args) bir kez, ya da each içindeki her argüman
+       demeti için fn(*demet, *args) — dönüş işlem sayısıdır."""
+    if each is None:
+        return lambda: (fn(*args, **kw), 1)[1]
+
+    def run():
+        for item in each:
+            fn(*item, *args, **kw)
+        return len(each)
+    return run
+
+
+def measure(case: str, n: int, fn: Callable[[], int], repeat: int, note: str = "") -> Result:
+    """fn() koşu başına işlem sayısını döndürür."""
+    best, ops = float("inf"), 0
+    for _ in range(repeat):
+        t = time.perf_counter()
+        ops = fn()
+        best = min(best, time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(case, n, best, ops, ops / best if best > 0 else float("inf"),
+                  peak / 2 ** 20, note)
+
+
+def bench_size(n: int, workdir: Path, repeat: int, full_max: int, ga_max: int,
+               generations: int) -> List[Result]:
+    drones, deliveries, zones = load_sized(n, workdir)
+    rnd = random.Random(0)
+    out: List[Result] = []
+
+    k = None if n <= full_max else 8
+    note = "tam" if k is None else f"k={k}"
+    out.append(measure("build_graph", n, calls(build_graph, drones, deliveries, zones, k=k),
+                       repeat, note))
+    g = build_graph(drones, deliveries, zones, k=k)
+
+    polys = build_nfz_polygons(zones)
+    pts = [d.start_pos for d in drones] + [d.pos for d in deliveries]
+    pairs = [(rnd.choice(pts), rnd.choice(pts)) for _ in range(1000)]
+    out.append(measure("intersects_nfz", n,
+                       calls(intersects_nfz, polygons=polys, each=pairs), repeat))
+
+    queries = [(f"drone_{rnd.choice(drones).id}", f"del_{rnd.choice(deliveries).id}")
+               for _ in range(20)]
+
+    def run_astar():
+        for a, b in queries:
+            try:
+                astar(g, a, b)
+            except ValueError:         # NFZ içinde kalan / bağlantısız düğüm
+                pass
+        return len(queries)
+    out.append(measure("astar", n, run_astar, repeat, note))
+
+    routes = [(rnd.choice(drones), rnd.sample(deliveries, min(10, len(deliveries))))
+              for _ in range(500)]
+    out.append(measure("check_route", n, calls(check_route, each=routes), repeat))
+
+    if n > ga_max:
+        return out
+
+    out.append(measure("ga_setup", n, calls(GAOptimizer, drones, deliveries, None, zones),
+                       repeat))
+    ga = GAOptimizer(drones, deliveries, None, zones, pop_size=30, generations=generations)
+    pop = [ga.random_chromosome() for _ in range(200)]
+
+    def run_fitness():
+        ga.route_score.cache_clear()
+        for c in pop:
+            ga.fitness(c)
+        return len(pop)
+    out.append(measure("ga_fitness", n, run_fitness, repeat))
+
+    def run_ga():
+        GAOptimizer(drones, deliveries, None, zones, pop_size=30, generations=generations,
+                    dm=ga.dm, nfz=ga.nfz).run()
+        return generations
+    out.append(measure("ga_run", n, run_ga, repeat, f"pop=30 gen={generations}"))
+    return out
+
+
+# ---- Taban çizgisi karşılaştırması -----------------------------------------
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[Dict]:
+    """(vaka, n) başına süre / bellek oranları; tolerans aşımı regression=True."""
+    base = {(r["case"], r["n"]): r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get((r["case"], r["n"]))
+        if b is None:
+            continue
+        t_ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else 1.0
+        m_ratio = r["peak_mb"] / b["peak_mb"] if b["peak_mb"] >= MIN_MB else 1.0
+        rows.append({"case": r["case"], "n": r["n"], "time_ratio": t_ratio,
+                     "mem_ratio": m_ratio,
+                     "regression": t_ratio > 1 + tolerance or m_ratio > 1 + tolerance})
+    return rows
+
+
+def environment() -> Dict:
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "machine": platform.machine(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+
+
+# ------------------- Komut satırı ---------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Graf / rota / CSP / GA kıyaslama paketi")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--full-max", type=int, default=1000, help="tam grafiğin üst sınırı")
+    ap.add_argument("--ga-max", type=int, default=1000, help="GA ölçümlerinin üst sınırı")
+    ap.add_argument("--generations", type=int, default=20)
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", default=None, help="karşılaştırılacak önceki sonuç JSON'u")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="izin verilen yavaşlama oranı")
+    args = ap.parse_args(argv)
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            for r in bench_size(n, Path(tmp), args.repeat, args.full_max, args.ga_max,
+                                args.generations):
+                results.append(r)
+                print(f"{r.case:15s} n={r.n:<6d} {r.seconds * 1000:10.2f} ms  "
+                      f"{r.throughput:12.1f} işlem/s  tepe {r.peak_mb:8.1f} MB  {r.note}")
+
+    report = {"environment": environment(), "args": vars(args),
+              "results": [asdict(r) for r in results]}
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(report["results"], json.load(f)["results"], args.tolerance)
+        report["comparison"] = rows
+        for row in rows:
+            flag = "REGRESYON" if row["regression"] else "ok"
+            print(f"{row['case']:15s} n={row['n']:<6d} süre ×{row['time_ratio']:.2f}  "
+                  f"bellek ×{row['mem_ratio']:.2f}  {flag}")
+        status = int(any(row["regression"] for row in rows))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✔  {len(results)} ölçüm → {args.out}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+GA kontrol noktaları (uzun koşularda çökme / kesinti sonrası sürdürme):
+• Biçim: tek .npz (np.savez, sıkıştırmasız — yazması hızlı, diziler kompakt)
+    tours / offsets / order : popülasyon; kromozom başına rota sınırları (P, D+1)
+                              ve drone sırası (P, D) — sözlük kromozomda anahtar
+                              sırası onarımı etkilediği için korunur
+    best_*                  : şimdiye kadarki en iyi kromozom, aynı düzende
+    rng                     : random.Random iç durumu (625 × uint32)
+    drone_ids / delivery_ids: senaryo parmak izi (sıra dahil)
+    meta                    : JSON — sürüm, sıradaki nesil, run() durumu
+                              (en iyi skor, durgunluk), GA parametreleri
+• Atomik yazma: aynı dizinde geçici dosya + fsync + os.replace; çökme anında
+  diskte ya eski ya yeni kontrol noktası bulunur
+• Kayıt breed()'den sonra alınır (sıradaki neslin popülasyonu + RNG), bu yüzden
+  sürdürülen koşu kesintisiz koşuyla bit düzeyinde aynıdır. Rota skor önbelleği
+  saf olduğundan saklanmaz; time_budget sürdürmede sıfırdan sayılır
+• Maliyet: Checkpointer.stats (yazma sayısı, süre, bayt); toplam yazma süresi
+  koşu süresinin max_overhead oranını aşacaksa sıradaki kayıt atlanır
+"""
+import itertools
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from chromosome import ArrayChrom
+
+FORMAT_VERSION = 1
+# Sürdürmede aynı olması gereken GAOptimizer öznitelikleri (generations artırılabilir)
+PARAMS = ("pop_size", "elite", "mutation_rate", "encoding", "local_search", "ls_passes",
+          "detour", "prune")
+PARAM_DEFAULTS = {"prune": False}     # eski kontrol noktalarında bulunmayan parametreler
+
+PathLike = Union[str, Path]
+
+
+# ---- Kromozom paketleme ----------------------------------------------------
+def pack(chroms: List) -> Dict[str, np.ndarray]:
+    """Sözlük ya da dizi kromozom listesi → (order, offsets, tours) dizileri."""
+    order, offsets, tours = [], [], []
+    for c in chroms:
+        if isinstance(c, ArrayChrom):
+            order.append(list(c.layout))
+            offsets.append(c.offsets)
+            tours.append(c.tour)
+            continue
+        ids = list(c)
+        off = np.zeros(len(ids) + 1, dtype=np.int32)
+        np.cumsum([len(c[d]) for d in ids], out=off[1:])
+        order.append(ids)
+        offsets.append(off)
+        tours.append(np.fromiter(itertools.chain.from_iterable(c[d] for d in ids),
+                                 dtype=np.int32, count=off[-1]))
+    return {"order": np.array(order, dtype=np.int64).reshape(len(chroms), -1),
+            "offsets": np.array(offsets, dtype=np.int32).reshape(len(chroms), -1),
+            "tours": np.concatenate(tours).astype(np.int32) if tours
+            else np.zeros(0, dtype=np.int32)}
+
+
+def unpack(order: np.ndarray, offsets: np.ndarray, tours: np.ndarray,
+           encoding: str, layout: Dict[int, int]) -> List:
+    out, start = [], 0
+    for ids, off in zip(order.tolist(), offsets):
+        n = int(off[-1])
+        tour = tours[start:start + n]
+        start += n
+        if encoding == "array":
+            out.append(ArrayChrom(np.array(tour, dtype=np.int32), np.array(off, dtype=np.int32),
+                                  layout))
+        else:
+            o, t = off.tolist(), tour.tolist()
+            out.append({d: t[o[k]:o[k + 1]] for k, d in enumerate(ids)})
+    return out
+
+
+# ---- Dosya -----------------------------------------------------------------
+@dataclass
+class Checkpoint:
+    gen: int                      # sıradaki nesil (kaydedilen popülasyon bu nesilde skorlanır)
+    population: List
+    best_fit: float
+    best_chrom: object
+    rng_state: Tuple
+    run: Dict[str, float]         # run() durumu: best, stall
+    params: Dict
+
+
+def _atomic_savez(path: Path, arrays: Dict[str, np.ndarray]) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return size
+
+
+def ga_params(ga) -> Dict:
+    return {k: getattr(ga, k) for k in PARAMS}
+
+
+def save_checkpoint(path: PathLike, ga, gen: int, pop: List, best: Tuple[float, object],
+                    run: Dict[str, float]) -> int:
+    """Kontrol noktasını atomik yazar; dosya boyutunu (bayt) döndürür."""
+    version, internal, gauss = ga.rand.getstate()
+    p, b = pack(pop), pack([best[1]])
+    meta = {"version": FORMAT_VERSION, "gen": gen, "best": best[0], "run": run,
+            "params": ga_params(ga), "rng_version": version, "gauss_next": gauss,
+            "time": time.time()}
+    return _atomic_savez(Path(path), {
+        **p, **{f"best_{k}": v for k, v in b.items()},
+        "rng": np.array(internal, dtype=np.uint32),
+        "drone_ids": np.array([d.id for d in ga.drones], dtype=np.int64),
+        "delivery_ids": np.array([d.id for d in ga.deliveries], dtype=np.int64),
+        "meta": np.array(json.dumps(meta)),
+    })
+
+
+def load_checkpoint(path: PathLike, ga) -> Checkpoint:
+    """Kontrol noktasını ga'nın kodlamasıyla açar; senaryo ya da parametreler
+       uyuşmazsa ValueError."""
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["meta"]))
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: desteklenmeyen sürüm {meta.get('version')}")
+        if (z["drone_ids"].tolist() != [d.id for d in ga.drones]
+                or z["delivery_ids"].tolist() != [d.id for d in ga.deliveries]):
+            raise ValueError(f"{path}: kontrol noktası başka bir senaryoya ait")
+        params = ga_params(ga)
+        saved = {k: meta["params"].get(k, PARAM_DEFAULTS.get(k)) for k in params}
+        diff = {k: (saved[k], v) for k, v in params.items() if saved[k] != v}
+        if diff:
+            raise ValueError(f"{path}: GA parametreleri farklı (kayıt, şimdi): {diff}")
+        pop = unpack(z["order"], z["offsets"], z["tours"], ga.encoding, ga.layout)
+        best = unpack(z["best_order"], z["best_offsets"], z["best_tours"], ga.encoding,
+                      ga.layout)[0]
+        rng = (meta["rng_version"], tuple(z["rng"].tolist()), meta["gauss_next"])
+    return Checkpoint(meta["gen"], pop, meta["best"], best, rng, meta["run"], meta["params"])
+
+
+# ---- run() bağlantısı ------------------------------------------------------
+class Checkpointer:
+    """GAOptimizer.run için periyodik kayıt: her `every` nesilde bir, toplam yazma
+       süresi koşu süresinin max_overhead oranını aşmadığı sürece."""
+
+    def __init__(self, ga, path: PathLike, every: int = 50, max_overhead: Optional[float] = 0.05):
+        if every < 1:
+            raise ValueError(f"checkpoint_every >= 1 olmalı: {every}")
+        self.ga = ga
+        self.path = Path(path)
+        self.every = every
+        self.max_overhead = max_overhead
+        self.stats = {"writes": 0, "skipped": 0, "seconds": 0.0, "bytes": 0, "last_gen": None}
+        self._start = time.perf_counter()
+
+    def resume(self) -> Optional[Checkpoint]:
+        """Dosya varsa yükler ve ga.rand'ı kayıtlı duruma getirir."""
+        if not self.path.exists():
+            return None
+        ck = load_checkpoint(self.path, self.ga)
+        self.ga.rand.setstate(ck.rng_state)
+        return ck
+
+    def maybe_save(self, gen: int, pop: List, best: Tuple[float, object],
+                   run: Dict[str, float]) -> float:
+        """gen: sıradaki nesil. Yazma süresini (s, yazılmadıysa 0) döndürür."""
+        if gen % self.every:
+            return 0.0
+        elapsed = time.perf_counter() - self._start
+        if self.max_overhead is not None and self.stats["seconds"] > self.max_overhead * elapsed:
+            self.stats["skipped"] += 1
+            return 0.0
+        t = time.perf_counter()
+        self.stats["bytes"] = save_checkpoint(self.path, self.ga, gen, pop, best, run)
+        dt = time.perf_counter() - t
+        self.stats["writes"] += 1
+        self.stats["seconds"] += dt
+        self.stats["last_gen"] = gen
+        return dt
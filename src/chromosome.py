@@ -0,0 +1,126 @@
+"""
+Dizi tabanlı kompakt kromozom (giant tour):
+• tour    : int32 NumPy dizisi — tüm teslimat id'leri, drone'lar arka arkaya
+• offsets : int32, uzunluk = drone sayısı + 1; k. drone rotası tour[offsets[k]:offsets[k+1]]
+• layout  : {drone_id: k} — tüm kromozomlarca paylaşılan tek sözlük
+Operatörler deepcopy yapmaz: çaprazlama dilimleri birleştirir, mutasyon yerinde
+takas eder, onarım tekrarları/eksikleri argsort ile vektörel bulur.
+`chrom[drone_id]` sözlük kromozomla aynı şekilde liste döndürür; fitness,
+visualize ve report_metrics için to_dict / from_dict dönüşümleri vardır.
+"""
+import random
+from typing import Dict, List, Sequence
+import numpy as np
+
+
+class ArrayChrom:
+    """{drone_id: [del_id, …]} kromozomunun dizi karşılığı."""
+    __slots__ = ("tour", "offsets", "layout")
+
+    def __init__(self, tour: np.ndarray, offsets: np.ndarray, layout: Dict[int, int]):
+        self.tour = tour
+        self.offsets = offsets
+        self.layout = layout
+
+    @classmethod
+    def from_dict(cls, chrom: Dict[int, List[int]], layout: Dict[int, int]) -> "ArrayChrom":
+        routes = [chrom[d] for d in layout]
+        offsets = np.zeros(len(routes) + 1, dtype=np.int32)
+        np.cumsum([len(r) for r in routes], out=offsets[1:])
+        tour = np.fromiter((r for lst in routes for r in lst), dtype=np.int32, count=offsets[-1])
+        return cls(tour, offsets, layout)
+
+    def to_dict(self) -> Dict[int, List[int]]:
+        return {d: self.route(k).tolist() for d, k in self.layout.items()}
+
+    def route(self, k: int) -> np.ndarray:
+        """k. drone rotası (görünüm; kopya değil)."""
+        return self.tour[self.offsets[k]:self.offsets[k + 1]]
+
+    def __getitem__(self, drone_id: int) -> List[int]:
+        return self.route(self.layout[drone_id]).tolist()
+
+    def copy(self) -> "ArrayChrom":
+        return ArrayChrom(self.tour.copy(), self.offsets.copy(), self.layout)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ArrayChrom) and np.array_equal(self.offsets, other.offsets)
+                and np.array_equal(self.tour, other.tour))
+
+
+def clone(chrom):
+    """Sözlük ya da dizi kromozomun bağımsız kopyası."""
+    if isinstance(chrom, ArrayChrom):
+        return chrom.copy()
+    return {d: list(r) for d, r in chrom.items()}
+
+
+# ------------------------------------------------------------------ #
+#  Operatörler                                                        #
+# ------------------------------------------------------------------ #
+def crossover(p1: ArrayChrom, p2: ArrayChrom, rng: random.Random) -> ArrayChrom:
+    """Her drone rotası %50 olasılıkla p2'den, aksi halde p1'den alınır."""
+    parts = [(p2 if rng.random() < 0.5 else p1).route(k) for k in range(len(p1.offsets) - 1)]
+    offsets = np.zeros(len(parts) + 1, dtype=np.int32)
+    np.cumsum([len(p) for p in parts], out=offsets[1:])
+    return ArrayChrom(np.concatenate(parts), offsets, p1.layout)
+
+
+def mutate(chrom: ArrayChrom, rate: float, rng: random.Random, ok=None):
+    """Rota içi rastgele takas (yerinde). ok(rota, i, j) verilirse False dönen
+       takaslar yapılmaz (csp.FeasibilityMasks.swap_ok)."""
+    tour, off = chrom.tour, chrom.offsets
+    for k in range(len(off) - 1):
+        n = int(off[k + 1] - off[k])
+        if rng.random() < rate and n > 1:
+            i, j = rng.sample(range(n), 2)
+            a = int(off[k])
+            if ok is not None and not ok(tour[a:a + n].tolist(), i, j):
+                continue
+            tour[a + i], tour[a + j] = tour[a + j], tour[a + i]
+
+
+def repair(chrom: ArrayChrom, all_ids: np.ndarray, rng: random.Random):
+    """Tekrarlanan teslimatların (ilk görülen hariç) yerine eksikleri yazar (yerinde).
+       Rota uzunlukları farklıysa (yerel arama teslimat taşır) eksikten fazla
+       kopyalar silinir, kopyadan fazla eksikler rastgele rotaların sonuna eklenir."""
+    tour = chrom.tour
+    order = np.argsort(tour, kind="stable")
+    s = tour[order]
+    dup = s[1:] == s[:-1]
+    if not dup.any() and len(tour) == len(all_ids):
+        return
+    dup_pos = np.sort(order[1:][dup])
+    present = np.zeros(int(max(all_ids[-1], s[-1] if len(s) else 0)) + 1, dtype=bool)
+    present[tour] = True
+    missing = all_ids[~present[all_ids]].tolist()
+    m = min(len(missing), len(dup_pos))
+    picked = rng.sample(missing, m)
+    tour[dup_pos[:m]] = picked
+    off = chrom.offsets
+    extra = dup_pos[m:]
+    if len(extra):
+        k = np.searchsorted(off, extra, side="right") - 1
+        off[1:] -= np.cumsum(np.bincount(k, minlength=len(off) - 1)).astype(off.dtype)
+        chrom.tour = tour = np.delete(tour, extra)
+    rest = sorted(set(missing) - set(picked))
+    if rest:
+        routes = chrom.to_dict()
+        drones = list(chrom.layout)
+        for rid in rest:
+            routes[rng.choice(drones)].append(rid)
+        packed = ArrayChrom.from_dict(routes, chrom.layout)
+        chrom.tour, chrom.offsets = packed.tour, packed.offsets
+
+
+def shuffle_route(chrom: ArrayChrom, k: int, rng: random.Random) -> List[int]:
+    """k. rotayı karıştırıp yerine yazar; yeni rotayı liste olarak döndürür."""
+    seg = chrom.route(k)
+    lst = seg.tolist()
+    rng.shuffle(lst)
+    seg[:] = lst
+    return lst
+
+
+def all_ids_array(ids: Sequence[int]) -> np.ndarray:
+    return np.unique(np.asarray(ids, dtype=np.int32))
@@ -1,7 +1,11 @@
 # src/cluster.py
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 import numpy as np
-from typing import List
+from typing import List, Tuple
+from distance import haversine_matrix, positions
+
+MINIBATCH_FROM = 5_000      # bu kadar teslimattan sonra MiniBatchKMeans
+
 
 def kmeans_partition(deliveries, n_clusters, seed=42) -> List[List]:
     """deliveries listesini k coğrafi kümeye ayırır; her küme listesi teslimat nesnelerini içerir."""
@@ -12,3 +16,36 @@ def kmeans_partition(deliveries, n_clusters, seed=42) -> List[List]:
     for dlv, lab in zip(deliveries, labels):
         clusters[lab].append(dlv)
     return clusters
+
+
+def kmeans_labels(coords: np.ndarray, n_clusters: int, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """(etiketler, merkezler); büyük girdide MiniBatchKMeans (O(N) bellek, hızlı)."""
+    if len(coords) >= MINIBATCH_FROM:
+        km = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed, n_init=3,
+                             batch_size=4096).fit(coords)
+    else:
+        km = KMeans(n_clusters=n_clusters, random_state=seed, n_init=10).fit(coords)
+    return km.labels_, km.cluster_centers_
+
+
+def assign_drones(drones, centres: np.ndarray, load: np.ndarray) -> List[List]:
+    """Drone'ları kümelere böler: küme başına en az bir drone, kalanlar yüke
+       (toplam ağırlık) orantılı (en büyük kalan yöntemi). Ağır kümeler önce
+       seçer ve deposu merkezine en yakın boştaki drone'ları alır."""
+    k, n = len(centres), len(drones)
+    if n < k:
+        raise ValueError(f"{k} küme için en az {k} drone gerekir ({n} var)")
+    share = load / load.sum() * (n - k) if load.sum() > 0 else np.full(k, (n - k) / k)
+    quota = 1 + np.floor(share).astype(int)
+    rest = n - quota.sum()
+    quota[np.argsort(-(share - np.floor(share)), kind="stable")[:rest]] += 1
+
+    dist = haversine_matrix(centres, positions(drones, "start_pos"))
+    free = np.ones(n, dtype=bool)
+    out: List[List] = [[] for _ in range(k)]
+    for c in np.argsort(-load, kind="stable"):
+        d = np.where(free, dist[c], np.inf)
+        pick = np.argsort(d, kind="stable")[: quota[c]]
+        free[pick] = False
+        out[c] = [drones[i] for i in sorted(pick.tolist())]
+    return out
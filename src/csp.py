@@ -3,10 +3,19 @@ CSP (Constraint Satisfaction) katmanı:
 - Her drone için toplu rota listesini alır
 - Ağırlık, batarya ve zaman penceresi kısıtlarını doğrular
 - Uygun değilse 'False', uygunsa 'True' + kalan batarya döndürür
+- check_nodes: ProblemInstance dizileri ve düğüm indeksleri üzerinde aynı
+  kontrol (dize ayrıştırma / sözlük araması yok); check_route(inst=...) ona yönlendirir
+- FeasibilityMasks: aramadan önce kısıt yayılımı — (drone, teslimat) alan
+  maskeleri ve teslimat çiftleri arası öncelik uyumu; GA operatörleri
+  (GAOptimizer(prune=True)) yalnızca bunlardan geçen atamaları üretir
 """
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
 from models import Drone, Delivery
 from graph import haversine
+from distance import DistanceMatrix
+from nfz import NFZIndex
+from instance import ProblemInstance
 
 # Basit enerji modeli: 1 Wh ≈ 15 m (örnek)
 METRE_PER_WH = 40.0
@@ -14,15 +23,25 @@ METRE_PER_WH = 40.0
 
 def check_route(drone: Drone,
                 route: List[Delivery],
-                takeoff_time: int = 8 * 60) -> Tuple[bool, float]:
+                takeoff_time: int = 8 * 60,
+                dm: Optional[DistanceMatrix] = None,
+                nfz: Optional[NFZIndex] = None,
+                inst: Optional[ProblemInstance] = None) -> Tuple[bool, float]:
     """
     route: teslimat sırası (Delivery objeleri)
     takeoff_time: dakikada (örn. 8:00 ➔ 480)
+    dm: verilirse mesafeler Haversine yerine matristen okunur
+    nfz: verilirse (dm ile birlikte) uçuş anında aktif NFZ'yi kesen bacak reddedilir
+    inst: verilirse (dm'i inst.dm olur) önceden derlenmiş dizilerle check_nodes çalışır
     Dönüş: (uygun_mu, kalan_batarya_Wh)
     """
+    if inst is not None:
+        return check_nodes(inst, inst.drone_pos[drone.id], inst.nodes(d.id for d in route),
+                           takeoff_time, nfz)
     battery = drone.battery_capacity
     current_pos = drone.start_pos
     current_time = takeoff_time
+    home = prev = dm.drone_index[drone.id] if dm is not None else None
 
     for d in route:
         # 1) Ağırlık
@@ -30,13 +49,21 @@ def check_route(drone: Drone,
             return False, battery
 
         # 2) Mesafe & enerji
-        dist = haversine(current_pos, d.pos)      # metre
+        if dm is None:
+            dist = haversine(current_pos, d.pos)  # metre
+        else:
+            nxt = dm.del_index[d.id]
+            dist = dm.distance(prev, nxt)
+            leg_from, prev = prev, nxt
         energy_need = dist / METRE_PER_WH         # Wh
         if energy_need > battery:
             return False, battery
         battery -= energy_need
         # 3) Varış zamanı (dk)  — sabit hız
+        depart_time = current_time
         current_time += dist / drone.speed / 60   # m/s -> dk
+        if nfz is not None and nfz.blocked_at(leg_from, prev, depart_time, current_time):
+            return False, battery
         start_win = int(d.time_window[0][:2]) * 60 + int(d.time_window[0][3:])
         end_win   = int(d.time_window[1][:2]) * 60 + int(d.time_window[1][3:])
         if not (start_win <= current_time <= end_win):
@@ -46,10 +73,204 @@ def check_route(drone: Drone,
         current_pos = d.pos
 
     # Eve dönüş kontrolü (opsiyonel)
-    dist_back = haversine(current_pos, drone.start_pos)
+    if dm is None:
+        dist_back = haversine(current_pos, drone.start_pos)
+    else:
+        dist_back = dm.distance(prev, home)
+    energy_need = dist_back / METRE_PER_WH
+    if energy_need > battery:
+        return False, battery
+    if nfz is not None and nfz.blocked_at(
+            prev, home, current_time, current_time + dist_back / drone.speed / 60):
+        return False, battery
+    battery -= energy_need
+
+    return True, battery
+
+
+def check_nodes(inst: ProblemInstance, k: int, nodes: List[int],
+                takeoff_time: float = 8 * 60,
+                nfz: Optional[NFZIndex] = None) -> Tuple[bool, float]:
+    """check_route'un (dm yolu) derlenmiş karşılığı; sonuçlar birebir aynıdır.
+    k: drone'un inst sırası, nodes: teslimat düğüm indeksleri (inst.nodes)."""
+    dist = inst.dm._item
+    weight, ws, we = inst.weight_list, inst.win_start_list, inst.win_end_list
+    battery, speed = inst.battery_list[k], inst.speed_list[k]
+    max_w = inst.max_weight_list[k]
+    blocked_at = nfz.blocked_at if nfz is not None else None
+    current_time = takeoff_time
+    home = prev = inst.home_list[k]
+
+    for nxt in nodes:
+        if weight[nxt] > max_w:
+            return False, battery
+        d = dist(prev, nxt)
+        energy_need = d / METRE_PER_WH
+        if energy_need > battery:
+            return False, battery
+        battery -= energy_need
+        depart_time = current_time
+        current_time += d / speed / 60
+        if blocked_at is not None and blocked_at(prev, nxt, depart_time, current_time):
+            return False, battery
+        if not (ws[nxt] <= current_time <= we[nxt]):
+            return False, battery
+        prev = nxt
+
+    dist_back = dist(prev, home)
     energy_need = dist_back / METRE_PER_WH
     if energy_need > battery:
         return False, battery
+    if blocked_at is not None and blocked_at(
+            prev, home, current_time, current_time + dist_back / speed / 60):
+        return False, battery
     battery -= energy_need
 
     return True, battery
+
+
+# ---- Kısıt yayılımı (arama öncesi) -------------------------------------------
+PAIRWISE_MAX = 4_000        # bu kadar düğümden sonra N² öncelik matrisi kurulmaz
+EPS_MIN = 1e-9              # öncelik sınırında kayan nokta payı (dk)
+ROW_BLOCK = 256             # öncelik matrisi bu kadar satırlık bloklarla hesaplanır
+
+
+class FeasibilityMasks:
+    """check_nodes'un gerekli koşullarından türetilen budama tabloları.
+       Hepsi gerekli koşuldur: maskeden geçmeyen atama / sıra hiçbir uygun
+       rotada bulunamaz, yani budama uygun çözüm kaybettirmez.
+
+       allowed[k, j]  : k. drone j düğümünü taşıyabilir mi —
+                        yük ≤ max_weight, depo → j → depo enerjisi bataryaya
+                        sığar, doğrudan uçuşla en erken varış ≤ pencere sonu,
+                        pencere başı ≤ batarya menzilinin izin verdiği en geç
+                        varış (drone beklemez; dönüş bacağı payı bırakılır)
+       precede[i, j]  : aynı rotada j, i'den sonra gelebilir mi — i'ye en erken
+                        (beklemesiz: max(en erken varış, pencere başı)) varıp
+                        filonun en hızlı drone'uyla j'ye uçunca j'nin penceresi
+                        kapanmamış olmalı. Düğüm sayısı PAIRWISE_MAX'ı aşarsa None.
+                        Sıcak döngüler satır başına bit kümesi (Python int) okur:
+                        n² / 8 bayt, iç içe listelerin ~64 katı küçük
+       Operatörler teslimat id'leriyle çalışır (inst.id2node ile çevrilir)."""
+
+    def __init__(self, inst: ProblemInstance, pairwise_max: int = PAIRWISE_MAX,
+                 takeoff_time: float = 8 * 60):
+        self.inst = inst
+        n = len(inst)
+        dist = inst.dm.dist             # saklandığı dtype ile (float32 / memmap kopyalanmaz)
+        home, speed = inst.home, inst.speed
+        is_del = np.zeros(n, dtype=bool)
+        is_del[inst.id2node[inst.id2node >= 0]] = True
+
+        # (drone, düğüm) alanları — check_nodes ile aynı işlem sırası
+        out = np.asarray(dist[home, :n], dtype=np.float64)            # (D, n): yalnızca depo satırları
+        back = np.asarray(dist[:n, home], dtype=np.float64).T
+        e_out = out / METRE_PER_WH
+        arrive = takeoff_time + out / speed[:, None] / 60
+        # Beklemesiz en geç varış: toplam uçuş batarya menzilini aşamaz, dönüş payı kalır
+        latest = takeoff_time + (inst.battery[:, None] * METRE_PER_WH - back) / speed[:, None] / 60
+        self.allowed = (is_del[None, :]
+                        & (inst.weight[None, :] <= inst.max_weight[:, None])
+                        & (e_out <= inst.battery[:, None])
+                        & (back / METRE_PER_WH <= inst.battery[:, None] - e_out)
+                        & (arrive <= inst.win_end[None, :])
+                        & (inst.win_start[None, :] <= latest + EPS_MIN))
+
+        # En erken hizmet anı (filo geneli) ve çift öncelik uyumu
+        self.earliest = np.maximum(arrive.min(axis=0, initial=np.inf), inst.win_start)
+        self.precede = None
+        vmax = float(speed.max()) if len(speed) else 1.0
+        if n <= pairwise_max:
+            # satır blokları: geçici float64 kopya ROW_BLOCK × n ile sınırlı
+            self.precede = np.empty((n, n), dtype=bool)
+            limit = inst.win_end[None, :] + EPS_MIN
+            for a in range(0, n, ROW_BLOCK):
+                b = min(a + ROW_BLOCK, n)
+                block = dist[a:b, :n].astype(np.float64)               # kopya; yerinde işlenir
+                block /= vmax
+                block /= 60
+                block += self.earliest[a:b, None]
+                np.less_equal(block, limit, out=self.precede[a:b])
+
+        # Sıcak döngüler için Python yapıları
+        self._id2node = inst.id2node_list
+        self._drones_of: Dict[int, List[int]] = {
+            j: np.flatnonzero(self.allowed[:, j]).tolist() for j in np.flatnonzero(is_del).tolist()}
+        self._win_end = inst.win_end_list
+        self._prec = None
+        if self.precede is not None:
+            bits = np.packbits(self.precede, axis=1, bitorder="little")
+            self._prec = [int.from_bytes(row.tobytes(), "little") for row in bits]
+
+    # --------- sorgular (teslimat id'leri) ----------
+    def drones_for(self, rid: int) -> List[int]:
+        """rid'i taşıyabilecek drone'ların inst sırası (boşsa hiçbiri)."""
+        return self._drones_of.get(self._id2node[rid], [])
+
+    def allows(self, k: int, rid: int) -> bool:
+        return bool(self.allowed[k, self._id2node[rid]])
+
+    def can_follow(self, a: int, b: int) -> bool:
+        """Aynı rotada b, a'dan sonra gelebilir mi."""
+        if self._prec is None:
+            return True
+        return bool(self._prec[self._id2node[a]] >> self._id2node[b] & 1)
+
+    def arrange(self, route: Sequence[int], rng) -> List[int]:
+        """route öğelerini verilen sırayla, öncelik ihlali doğurmayan rastgele bir
+           konuma ekler (uygun konum yoksa sona). Tam sıralama yapılmaz: yalnızca
+           precede'e aykırı çiftler ayrılır, kalan sıra rastgele kalır."""
+        out: List[int] = []
+        for rid in route:
+            pos = self.insert_positions(out, rid)
+            out.insert(rng.choice(pos) if pos else len(out), rid)
+        return out
+
+    def swap_ok(self, route: Sequence[int], i: int, j: int) -> bool:
+        """route[i] ↔ route[j] takası yeni bir öncelik ihlali doğurur mu (i < j)?
+           Yalnızca göreli sırası değişen çiftler denetlenir."""
+        if self._prec is None:
+            return True
+        if i > j:
+            i, j = j, i
+        prec, id2node = self._prec, self._id2node
+        a, b = id2node[route[i]], id2node[route[j]]
+        pb = prec[b]
+        if not pb >> a & 1:
+            return False
+        for x in route[i + 1:j]:
+            x = id2node[x]
+            if not (pb >> x & 1 and prec[x] >> a & 1):
+                return False
+        return True
+
+    def insert_positions(self, route: Sequence[int], rid: int) -> List[int]:
+        """rid'in önceliği bozmadan eklenebileceği konumlar (0 … len(route))."""
+        if self._prec is None:
+            return list(range(len(route) + 1))
+        prec, id2node = self._prec, self._id2node
+        j = id2node[rid]
+        nodes = [id2node[r] for r in route]
+        pj = prec[j]
+        after = [True] * (len(nodes) + 1)                  # sonrakilerin hepsi j'den sonra gelebilir
+        for p in range(len(nodes) - 1, -1, -1):
+            after[p] = after[p + 1] and bool(pj >> nodes[p] & 1)
+        out, before = [], True
+        for p in range(len(nodes) + 1):
+            if before and after[p]:
+                out.append(p)
+            if p < len(nodes):
+                before = before and bool(prec[nodes[p]] >> j & 1)
+                if not before:
+                    break
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        """Budama oranları: (drone, teslimat) çiftleri, sıralı teslimat çiftleri."""
+        dels = np.array(sorted(self._drones_of), dtype=np.int64)
+        out = {"pairs_pruned": float(1 - self.allowed[:, dels].mean()) if len(dels) else 0.0,
+               "unservable": sum(1 for v in self._drones_of.values() if not v)}
+        if self.precede is not None and len(dels) > 1:
+            sub = self.precede[np.ix_(dels, dels)]
+            out["order_pruned"] = float(1 - (sub.sum() - np.trace(sub)) / (len(dels) * (len(dels) - 1)))
+        return out
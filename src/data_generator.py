@@ -1,5 +1,6 @@
 import json
 import random
+from dataclasses import asdict
 from pathlib import Path
 from models import Drone, Delivery, NoFlyZone
 
@@ -66,7 +67,7 @@ def make_nfz(n=2):
 def save_json(obj, path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump([o.__dict__ for o in obj], f, indent=2)
+        json.dump([asdict(o) for o in obj], f, indent=2)
 
 
 # --- Ana --------------------------------------------------------------------
@@ -0,0 +1,197 @@
+"""
+Önce kümele, sonra rotala (cluster-first, route-second) ayrıştırması:
+• Teslimatlar coğrafi kümelere bölünür (cluster.kmeans_labels; büyük
+  girdide MiniBatchKMeans), küme sayısı ≈ N / cluster_size, en fazla drone sayısı
+• Drone'lar kümelere yüke (toplam ağırlık) orantılı dağıtılır; her küme
+  deposu merkezine en yakın drone'ları alır (cluster.assign_drones)
+• Her küme bağımsız bir GAOptimizer ile çözülür — matrisler yalnızca küme
+  düğümleri için (Σ küme² ≪ N²); workers > 1 ise kümeler süreç havuzunda.
+  Popülasyon en ucuz uygun ekleme ile kurulan bir kromozomla sıcak başlar
+• Birleştirme: her drone tek kümede olduğundan toplam fitness küme
+  fitness'larının toplamıdır (biri -inf ise -inf); birleşik çözümde her
+  teslimatın tam bir kez yer aldığı denetlenir (check_routes)
+• Sınır dengeleme (rebalance=True): ikinci en yakın merkezine göre sınırda
+  kalan teslimatlar, iki komşu kümenin birleşik GA'sında rotalarından
+  çıkarılıp LocalSearch.insert ile en ucuz uygun konuma yeniden eklenir;
+  çift fitness'ı artarsa kabul edilir
+"""
+import math
+import multiprocessing as mp
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from models import Drone, Delivery, NoFlyZone
+from cluster import assign_drones, kmeans_labels
+from distance import positions
+from ga import GAOptimizer, NFZ_PENALTY
+from local_search import LocalSearch
+from chromosome import ArrayChrom
+
+
+def _solve(task) -> Tuple[float, Dict[int, List[int]], float]:
+    """Tek küme: (fitness, rotalar, süre)."""
+    idx, drones, deliveries, zones, seed, ga_kwargs = task
+    t = time.perf_counter()
+    ga = GAOptimizer(drones, deliveries, None, zones, **ga_kwargs)
+    ga.rand.seed(seed + idx)
+    fit, best = ga.run(initial=[construct(ga)])
+    return fit, {d: list(r) for d, r in best.items()}, time.perf_counter() - t
+
+
+def construct(ga: GAOptimizer):
+    """Boş rotalardan en ucuz uygun ekleme (ağırlık / batarya / pencere uyumlu)
+       başlangıç kromozomu; ağır ve erken kapanan teslimatlar önce yerleşir."""
+    order = sorted(ga.deliveries, key=lambda d: (-d.weight, d.time_window[1]))
+    chrom = LocalSearch(ga).insert({dr.id: [] for dr in ga.drones}, [d.id for d in order])
+    return ArrayChrom.from_dict(chrom, ga.layout) if ga.encoding == "array" else chrom
+
+
+class ClusterDecomposition:
+    """Büyük senaryoyu kümelere bölüp küme başına GA çalıştırır."""
+
+    def __init__(
+        self,
+        drones: List[Drone],
+        deliveries: List[Delivery],
+        zones: List[NoFlyZone],
+        n_clusters: Optional[int] = None,
+        cluster_size: int = 200,
+        workers: int = 1,
+        rebalance: bool = True,
+        boundary: float = 0.15,
+        seed: int = 42,
+        **ga_kwargs,
+    ):
+        self.drones, self.deliveries, self.zones = list(drones), list(deliveries), list(zones)
+        if n_clusters is None:
+            n_clusters = math.ceil(len(self.deliveries) / cluster_size)
+        self.n_clusters = max(1, min(n_clusters, len(self.drones), len(self.deliveries)))
+        self.workers = workers
+        self.rebalance = rebalance
+        self.boundary = boundary          # d2 / d1 < 1 + boundary → sınır teslimatı
+        self.seed = seed
+        self.ga_kwargs = ga_kwargs
+        self.id2del = {d.id: d for d in self.deliveries}
+
+    # --------- bölme ----------
+    def partition(self):
+        """(etiketler, merkezler, küme başına drone listeleri)."""
+        coords = positions(self.deliveries, "pos")
+        labels, centres = kmeans_labels(coords, self.n_clusters, self.seed)
+        k = len(centres)
+        load = np.bincount(labels, weights=[d.weight for d in self.deliveries], minlength=k)
+        return labels, centres, assign_drones(self.drones, centres, load)
+
+    # --------- ana akış ----------
+    def run(self) -> Tuple[float, Dict[int, List[int]]]:
+        labels, centres, crew = self.partition()
+        k = len(centres)
+        members: List[List[Delivery]] = [[] for _ in range(k)]
+        for dlv, lab in zip(self.deliveries, labels.tolist()):
+            members[lab].append(dlv)
+        tasks = [(c, crew[c], members[c], self.zones, self.seed, self.ga_kwargs)
+                 for c in range(k)]
+        if self.workers > 1:
+            with mp.Pool(self.workers) as pool:
+                results = pool.map(_solve, tasks, chunksize=1)
+        else:
+            results = [_solve(t) for t in tasks]
+
+        self.crew = crew
+        self.routes: Dict[int, List[int]] = {}
+        self.cluster_fitness = [fit for fit, _, _ in results]
+        for _, routes, _ in results:
+            self.routes.update(routes)
+        self.report = [dict(cluster=c, drones=len(crew[c]), deliveries=len(members[c]),
+                            fitness=fit, seconds=sec)
+                       for c, (fit, _, sec) in enumerate(results)]
+        self.moved = 0
+        if self.rebalance and k > 1:
+            self._rebalance(labels, centres)
+        self.check_routes()
+        return self.fitness(), self.routes
+
+    def check_routes(self):
+        """Birleşik çözümde her teslimat tam bir kez yer almalı (küme GA'ları ve
+           sınır dengeleme ayrı rotalar ürettiği için); değilse RuntimeError."""
+        count = Counter(r for lst in self.routes.values() for r in lst)
+        extra = sorted(r for r, c in count.items() if c > 1)
+        missing = sorted(set(self.id2del) - count.keys())
+        unknown = sorted(count.keys() - set(self.id2del))
+        if extra or missing or unknown:
+            raise RuntimeError(f"birleşik çözüm geçersiz: tekrarlanan {extra[:10]}, "
+                               f"eksik {missing[:10]}, bilinmeyen {unknown[:10]}")
+
+    def fitness(self) -> float:
+        """Küme fitness toplamı (her drone tek kümede)."""
+        if any(f == -NFZ_PENALTY for f in self.cluster_fitness):
+            return -NFZ_PENALTY
+        return sum(self.cluster_fitness)
+
+    # --------- sınır dengeleme ----------
+    def _rebalance(self, labels: np.ndarray, centres: np.ndarray):
+        coords = positions(self.deliveries, "pos")
+        d = np.linalg.norm(coords[:, None, :] - centres[None, :, :], axis=2)
+        order = np.argsort(d, axis=1)[:, :2]
+        d1 = d[np.arange(len(d)), order[:, 0]]
+        d2 = d[np.arange(len(d)), order[:, 1]]
+        near = d2 < d1 * (1 + self.boundary)
+        # Sınır teslimatlarını (kendi kümesi, komşu küme) çiftlerine grupla
+        pairs: Dict[Tuple[int, int], List[int]] = {}
+        for i in np.flatnonzero(near).tolist():
+            a, b = int(labels[i]), int(order[i, 1] if order[i, 0] == labels[i] else order[i, 0])
+            pairs.setdefault((min(a, b), max(a, b)), []).append(self.deliveries[i].id)
+        counts = Counter({p: len(ids) for p, ids in pairs.items()})
+        for (a, b), _ in counts.most_common():
+            self._rebalance_pair(a, b, pairs[(a, b)])
+
+    def _rebalance_pair(self, a: int, b: int, ids: List[int]):
+        drones = self.crew[a] + self.crew[b]
+        routes = {dr.id: list(self.routes[dr.id]) for dr in drones}
+        on_route = {r for lst in routes.values() for r in lst}
+        ids = [i for i in ids if i in on_route]
+        if not ids:
+            return
+        dels = [self.id2del[r] for r in sorted(on_route)]
+        ga = GAOptimizer(drones, dels, None, self.zones, **self.ga_kwargs)
+        before = ga.fitness(routes)
+        gone = set(ids)
+        trial = {d: [r for r in lst if r not in gone] for d, lst in routes.items()}
+        ls = LocalSearch(ga)
+        trial = ls.insert(trial, ids)
+        after, trial = ls.improve(trial, ga.fitness(trial))
+        if after <= before:
+            return
+        side = {r: c for c in (a, b) for dr in self.crew[c] for r in routes[dr.id]}
+        self.moved += sum(1 for c in (a, b) for dr in self.crew[c] for r in trial[dr.id]
+                          if side.get(r) != c)          # küme değiştiren teslimatlar
+        self.routes.update(trial)
+        # Rota skoru yalnızca drone'a ve rotasına bağlı: küme fitness'ları çift
+        # GA'sının önbellekli rota skorlarından toplanır (drone'lar kümelerinde kalır)
+        for c in (a, b):
+            scores = [ga.route_score(dr.id, tuple(trial[dr.id])) for dr in self.crew[c]]
+            self.cluster_fitness[c] = -NFZ_PENALTY if -NFZ_PENALTY in scores else sum(scores)
+
+
+# ------------------- Hızlı test -----------------------------------
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    from scenario_gen import GenConfig, generate
+    from scenario_io import load_scenario
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = GenConfig(n_deliveries=n, n_drones=max(10, n // 20), n_depots=6, n_zones=10,
+                        span=0.1, tight_share=0.0, timed_share=0.0, seed=1)
+        drones, deliveries, zones = (list(x) for x in load_scenario(generate(cfg, tmp + "/s.scn")))
+    t = time.perf_counter()
+    dec = ClusterDecomposition(drones, deliveries, zones, cluster_size=100,
+                               pop_size=30, generations=40)
+    fit, routes = dec.run()
+    ok = sum(1 for r in dec.report if r["fitness"] > -NFZ_PENALTY)
+    stops = sum(len(r) for r in routes.values())
+    print(f"{n} teslimat ({stops} durak, her biri tam bir kez), {dec.n_clusters} küme "
+          f"({ok} uygun), fitness={fit:,.0f}, sınırda taşınan={dec.moved}, "
+          f"{time.perf_counter() - t:.1f} s")
@@ -0,0 +1,179 @@
+"""
+Önceden hesaplanmış mesafe matrisi (senaryo başına bir kez):
+• Düğüm sırası   : drone başlangıç konumları + teslimat noktaları
+                   (build_graph ile aynı sıra)
+• Haversine      : NumPy ile vektörel, satır blokları halinde
+• Sorgular       : indeks üzerinden O(1) mesafe / uçuş süresi / enerji
+• Büyük senaryo  : float32 ve/veya diskte memory‑mapped (.npy) matris
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+from models import Drone, Delivery
+
+R_EARTH      = 6_371_000  # metre — graph.R_EARTH ile aynı
+METRE_PER_WH = 40.0       # csp / ga ile aynı enerji modeli
+
+
+def haversine_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N,2) ve (M,2) derece dizileri için N×M Haversine mesafe matrisi (metre)."""
+    a = np.radians(np.asarray(a, dtype=np.float64).reshape(-1, 2))
+    b = np.radians(np.asarray(b, dtype=np.float64).reshape(-1, 2))
+    lat1, lon1 = a[:, 0:1], a[:, 1:2]
+    lat2, lon2 = b[:, 0], b[:, 1]
+    h = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * R_EARTH * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def haversine_pairs(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Eleman bazında Haversine: a[k] ↔ b[k] mesafeleri (metre), (M,2) → (M,)."""
+    a = np.radians(np.asarray(a, dtype=np.float64).reshape(-1, 2))
+    b = np.radians(np.asarray(b, dtype=np.float64).reshape(-1, 2))
+    h = (np.sin((b[:, 0] - a[:, 0]) / 2) ** 2
+         + np.cos(a[:, 0]) * np.cos(b[:, 0]) * np.sin((b[:, 1] - a[:, 1]) / 2) ** 2)
+    return 2 * R_EARTH * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def project(coords: np.ndarray) -> np.ndarray:
+    """(lat, lon) derece → ortalama enlem etrafında eşdikdörtgen (x, y) metre.
+       Şehir ölçeğinde komşuluk aramaları (KD‑ağacı) için yeterince doğru."""
+    c = np.radians(np.asarray(coords, dtype=np.float64).reshape(-1, 2))
+    lat0 = c[:, 0].mean() if len(c) else 0.0
+    return np.column_stack([R_EARTH * c[:, 1] * np.cos(lat0), R_EARTH * c[:, 0]])
+
+
+def positions(items, attr: str) -> np.ndarray:
+    """Konum sütunu (N,2); sütunlu kayıtlar (scenario_io.Records) için diziden
+       kopyalanır, nesne listesi için öznitelikten toplanır."""
+    col = getattr(items, "column", None)
+    if col is not None:
+        return np.asarray(col(attr), dtype=np.float64).reshape(-1, 2)
+    return np.array([getattr(o, attr) for o in items], dtype=np.float64).reshape(-1, 2)
+
+
+def grow_square(buf: np.ndarray, n: int, new_n: int, fill=0) -> np.ndarray:
+    """Kare tamponu en az new_n × new_n olacak şekilde (2 katına) büyütür;
+       ilk n × n blok korunur. Kapasite yetiyorsa tamponun kendisi döner."""
+    if new_n <= buf.shape[0]:
+        return buf
+    cap = max(new_n, 2 * buf.shape[0])
+    out = np.full((cap, cap), fill, dtype=buf.dtype)
+    out[:n, :n] = buf[:n, :n]
+    return out
+
+
+def _ids(items) -> List[int]:
+    col = getattr(items, "column", None)
+    return col("id").tolist() if col is not None else [o.id for o in items]
+
+
+class DistanceMatrix:
+    """Tüm depo + teslimat noktaları arasındaki mesafe kahini.
+
+    drone_index[drone.id] / del_index[delivery.id] → matris indeksi.
+    """
+
+    def __init__(
+        self,
+        drones: List[Drone],
+        deliveries: List[Delivery],
+        dtype=np.float64,
+        mmap_path: Optional[str] = None,
+        block: int = 1024,
+        dist: Optional[np.ndarray] = None,
+    ):
+        n0 = len(drones)
+        self.drone_index = {i: k for k, i in enumerate(_ids(drones))}
+        self.del_index = {i: n0 + k for k, i in enumerate(_ids(deliveries))}
+        self.coords = np.concatenate([positions(drones, "start_pos"),
+                                      positions(deliveries, "pos")])
+        n = len(self.coords)
+
+        if dist is not None:                      # hazır matris (paylaşımlı bellek vb.)
+            self.dist = dist
+        else:
+            if mmap_path is not None:
+                self.dist = np.lib.format.open_memmap(
+                    mmap_path, mode="w+", dtype=dtype, shape=(n, n))
+            else:
+                self.dist = np.empty((n, n), dtype=dtype)
+            # Satır blokları: float64 ara sonuç en fazla block×n yer kaplar
+            for s in range(0, n, block):
+                self.dist[s:s + block] = haversine_matrix(self.coords[s:s + block], self.coords)
+            if mmap_path is not None:
+                self.dist.flush()
+
+        # ndarray.item → Python float; sıcak döngülerde NumPy skalerinden hızlı
+        self._item = self.dist.item
+        self._buf = self.dist          # extend() için kapasite tamponu
+
+    @classmethod
+    def from_array(cls, drones: List[Drone], deliveries: List[Delivery],
+                   dist: np.ndarray) -> "DistanceMatrix":
+        """Önceden hesaplanmış (ör. diskteki) bir matrisi sarmalar."""
+        return cls(drones, deliveries, dist=dist)
+
+    @classmethod
+    def load(cls, drones: List[Drone], deliveries: List[Delivery],
+             path: str) -> "DistanceMatrix":
+        """mmap_path ile kaydedilmiş matrisi belleğe kopyalamadan açar."""
+        return cls(drones, deliveries, dist=np.load(path, mmap_mode="r"))
+
+    def with_dist(self, dist: np.ndarray) -> "DistanceMatrix":
+        """Aynı düğüm indeksleriyle başka bir maliyet matrisi (ör. sapma mesafeleri)."""
+        new = DistanceMatrix.__new__(DistanceMatrix)
+        new.__dict__.update(self.__dict__)
+        new.dist, new._item, new._buf = dist, dist.item, dist
+        new.drone_index, new.del_index = dict(self.drone_index), dict(self.del_index)
+        return new
+
+    # --------- artımlı güncelleme ----------------------------------------
+    def extend(self, drones: List[Drone] = (), deliveries: List[Delivery] = ()) -> np.ndarray:
+        """Yeni düğümleri sona ekler; yalnızca yeni satır / sütunlar hesaplanır.
+           Tampon kapasitesi ikiye katlanarak büyür (amortize O(yeni × N)).
+           Dönüş: yeni düğüm indeksleri."""
+        n = len(self.coords)
+        new = np.array([d.start_pos for d in drones] + [dlv.pos for dlv in deliveries],
+                       dtype=np.float64).reshape(-1, 2)
+        m = len(new)
+        for k, d in enumerate(drones):
+            self.drone_index[d.id] = n + k
+        for k, dlv in enumerate(deliveries):
+            self.del_index[dlv.id] = n + len(drones) + k
+        self.coords = np.concatenate([self.coords, new])
+
+        buf = grow_square(self._buf, n, n + m)
+        rows = haversine_matrix(new, self.coords)
+        buf[n:n + m, :n + m] = rows
+        buf[:n + m, n:n + m] = rows.T
+        self._buf = buf
+        self.dist = buf[:n + m, :n + m]
+        self._item = self.dist.item
+        return np.arange(n, n + m)
+
+    def discard(self, drone_ids=(), delivery_ids=()):
+        """Düğümleri indeks haritalarından çıkarır; satırları mezar taşı olarak kalır."""
+        for i in drone_ids:
+            self.drone_index.pop(i, None)
+        for i in delivery_ids:
+            self.del_index.pop(i, None)
+
+    # --------- O(1) sorgular ------------------------------------------
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def distance(self, i: int, j: int) -> float:
+        """i → j mesafesi (metre)."""
+        return self._item(i, j)
+
+    def flight_min(self, i: int, j: int, speed: float) -> float:
+        """Sabit hızda (m/s) i → j uçuş süresi (dakika)."""
+        return self._item(i, j) / speed / 60
+
+    def energy(self, i: int, j: int) -> float:
+        """i → j için gereken enerji (Wh)."""
+        return self._item(i, j) / METRE_PER_WH
+
+    def route_indices(self, drone: Drone, route_ids: List[int]) -> Tuple[int, List[int]]:
+        """(depo_indeksi, [teslimat indeksleri]) döndürür."""
+        return self.drone_index[drone.id], [self.del_index[r] for r in route_ids]
@@ -1,14 +1,22 @@
-import random, copy, json
-from pathlib import Path
-from typing import List, Dict
+import random, time
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import List, Dict, Optional
 from models import Drone, Delivery, NoFlyZone
-from csp import check_route
-from graph import (
-    build_graph,
-    build_nfz_polygons,
-    intersects_nfz,
-    haversine,
-)
+from csp import FeasibilityMasks, check_nodes
+from instance import ProblemInstance
+from distance import DistanceMatrix
+from nfz import NFZIndex
+from parallel import PoolEvaluator
+from island import IslandConfig, IslandModel
+from graph import build_graph, extend_graph
+import chromosome
+from chromosome import ArrayChrom
+from batch import BatchEvaluator
+from local_search import LocalSearch
+from visibility import detour_scenario
+from telemetry import Counters, generation_record
+from checkpoint import Checkpointer
 
 # ----------------- Küresel sabitler (ödül / ceza) -----------------
 DELIVERY_REWARD   = 1_000.0
@@ -29,6 +37,17 @@ class GAOptimizer:
         elite_ratio: float = 0.2,
         mutation_rate: float = 0.2,
         generations: int = 150,
+        dm: Optional[DistanceMatrix] = None,
+        nfz: Optional[NFZIndex] = None,
+        workers: int = 1,
+        cache_size: int = 100_000,
+        encoding: str = "dict",
+        batch: bool = False,
+        local_search: int = 0,
+        ls_passes: int = 3,
+        detour: bool = False,
+        telemetry=None,
+        prune: bool = False,
     ):
         self.drones = drones
         self.deliveries = deliveries
@@ -38,148 +57,600 @@ class GAOptimizer:
         self.elite = max(2, int(pop_size * elite_ratio))
         self.mutation_rate = mutation_rate
         self.generations = generations
+        self.workers = workers          # >1 → fitness süreç havuzunda
         self.rand = random.Random(42)
+        # Senaryo başına bir kez: mesafe matrisi, NFZ matrisi, id → teslimat
+        self.dm  = dm if dm is not None else DistanceMatrix(drones, deliveries)
+        self.nfz = nfz if nfz is not None else NFZIndex(self.dm.coords, zones)
+        # detour=True → NFZ kesen bacak -inf yerine görünürlük grafiği sapma
+        # mesafesi alır (visibility.py); ulaşılamayan çiftler kapalı kalır
+        self.detour = detour
+        if detour:
+            self.dm, self.nfz = detour_scenario(self.dm, self.nfz)
+        # (drone id, rota tuple) → rota skoru; boyutu sınırlı LRU
+        self.cache_size = cache_size
+        self.route_score = lru_cache(maxsize=cache_size)(self._route_score)
+        # "dict": {drone_id: [del_id, …]}  |  "array": chromosome.ArrayChrom
+        if encoding not in ("dict", "array"):
+            raise ValueError(f"encoding 'dict' ya da 'array' olmalı: {encoding!r}")
+        self.encoding = encoding
+        # batch=True → popülasyon tek seferde NumPy ile skorlanır (batch.py)
+        self.batch = batch
+        # local_search=k → her nesil en iyi k uygun elite memetik yerel arama
+        self.local_search = local_search
+        self.ls_passes = ls_passes
+        # telemetry: telemetry.Telemetry alıcısı → nesil başına yapılandırılmış kayıt;
+        # None iken sayaç / zamanlayıcı hiç çalışmaz
+        self.telemetry = telemetry
+        self._counters = Counters() if telemetry is not None else None
+        # prune=True → csp.FeasibilityMasks: operatörler yalnızca (drone, teslimat)
+        # maskelerinden ve pencere öncelik uyumundan geçen atamalar üretir
+        self.prune = prune
+        self._rebuild_lookups()
+        # Son çalıştırmanın skor sıralı popülasyonu (artımlı yeniden planlama için)
+        self.population = []
+        self._retired = set()           # çıkarılmış id'ler (önbellek geçerliliği)
+
+    def _rebuild_lookups(self):
+        """drones / deliveries değiştiğinde türetilmiş yapıları yeniler."""
+        self.id2del = {d.id: d for d in self.deliveries}
+        self.id2drone = {d.id: d for d in self.drones}
+        self.inst = ProblemInstance(self.drones, self.deliveries, self.dm)
+        self.layout = {d.id: k for k, d in enumerate(self.drones)}
+        self.all_ids = chromosome.all_ids_array([dlv.id for dlv in self.deliveries])
+        self._ls = LocalSearch(self, self.ls_passes) if self.local_search else None
+        # Toplu değerlendirici (saatli NFZ tablosu) ve budama maskeleri (O(N²))
+        # ilk kullanımda kurulur: art arda add / remove çağrıları yalnızca
+        # yukarıdaki O(N) yapıları yeniler
+        for name in ("_batch", "csp"):
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def _batch(self) -> Optional[BatchEvaluator]:
+        return BatchEvaluator(self) if self.batch else None
+
+    @cached_property
+    def csp(self) -> Optional[FeasibilityMasks]:
+        """prune=True iken senaryonun FeasibilityMasks'ı, değilse None."""
+        return FeasibilityMasks(self.inst) if self.prune else None
 
     # --------- kromozom: {drone_id: [del_id, …]} ----------
-    def random_chromosome(self) -> Dict[int, List[int]]:
+    def random_chromosome(self):
         chrom = {d.id: [] for d in self.drones}
         ids = [dlv.id for dlv in self.deliveries]
         self.rand.shuffle(ids)
-        for i, did in enumerate(ids):
-            chrom[self.drones[i % len(self.drones)].id].append(did)
+        if self.csp is not None:
+            self._assign_pruned(chrom, ids)
+        else:
+            for i, did in enumerate(ids):
+                chrom[self.drones[i % len(self.drones)].id].append(did)
+        if self.encoding == "array":
+            return ArrayChrom.from_dict(chrom, self.layout)
         return chrom
 
+    def _assign_pruned(self, chrom, ids):
+        """Sıradaki drone'a (i mod D) verir; maske izin vermiyorsa döngüde izin veren
+           ilk drone'a kayar. Rota sırası yalnızca öncelik ihlallerini ayıracak
+           kadar düzeltilir (csp.arrange); tam pencere sıralaması yapılmaz."""
+        D, csp = len(self.drones), self.csp
+        for i, did in enumerate(ids):
+            ks = csp.drones_for(did)
+            k = i % D
+            if ks and k not in ks:
+                k = next((q for q in ks if q > k), ks[0])
+            chrom[self.drones[k].id].append(did)
+        for d in self.drones:
+            chrom[d.id] = csp.arrange(chrom[d.id], self.rand)
+
+    def to_dict(self, chrom) -> Dict[int, List[int]]:
+        """Her iki kodlamayı da visualize / report_metrics'in beklediği sözlüğe çevirir."""
+        return chrom.to_dict() if isinstance(chrom, ArrayChrom) else chrom
+
     # --------- fitness ---------------------------------------------
     def fitness(self, chrom) -> float:
-        score     = 0.0
-        polygons  = build_nfz_polygons(self.zones)
-        id2del    = {d.id: d for d in self.deliveries}
-
+        """Drone rotası skorlarının toplamı; herhangi biri uygunsuzsa -inf.
+           Rota skorları (drone id, rota) anahtarıyla LRU önbellekten gelir,
+           böylece ebeveynden aynen kopyalanan rotalar yeniden hesaplanmaz."""
+        score       = 0.0
+        route_score = self.route_score
         for dr in self.drones:
-            route = [id2del[r] for r in chrom[dr.id]]
-            ok, bat_left = check_route(dr, route)
-            if not ok:
-                return -NFZ_PENALTY          # batarya / zaman ihlali
-
-            score += len(route) * DELIVERY_REWARD
-            score -= (dr.battery_capacity - bat_left) * ENERGY_WEIGHT
-
-            pos, time_min, nfz_hit = dr.start_pos, 8*60, False
-            for task in route:
-                dist = haversine(pos, task.pos)
-                time_min += dist / dr.speed / 60
-                if intersects_nfz(pos, task.pos, polygons, step_m=500):
-                    nfz_hit = True
-                deadline = int(task.time_window[1][:2])*60 + int(task.time_window[1][3:])
-                if time_min > deadline:
-                    score -= (time_min - deadline) * LATE_PENALTY_MIN
-                pos = task.pos
-
-            dist_back = haversine(pos, dr.start_pos)
-            if intersects_nfz(pos, dr.start_pos, polygons, step_m=500):
+            s = route_score(dr.id, tuple(chrom[dr.id]))
+            if s == -NFZ_PENALTY:
+                return -NFZ_PENALTY
+            score += s
+        return score
+
+    def evaluate(self, pop) -> List[float]:
+        """Popülasyonun fitness listesi (batch=True ise toplu NumPy yolu)."""
+        if self._batch is not None:
+            return self._batch.evaluate(pop)
+        return [self.fitness(c) for c in pop]
+
+    def cache_info(self):
+        """Rota skoru önbelleği: hits / misses / maxsize / currsize."""
+        return self.route_score.cache_info()
+
+    def _route_score(self, drone_id: int, route_ids) -> float:
+        # Derlenmiş dizilerden (self.inst): dize ayrıştırma / nesne erişimi yok
+        inst      = self.inst
+        k         = inst.drone_pos[drone_id]
+        speed     = inst.speed_list[k]
+        dist      = self.dm._item
+        blocked_at = self.nfz.blocked_at
+
+        check = check_nodes
+        if self._counters is not None:
+            check = self._counters.counting("check_route", check_nodes)
+            blocked_at = self._counters.counting("nfz_checks", blocked_at)
+
+        nodes = inst.nodes(route_ids)
+        ok, bat_left = check(inst, k, nodes)
+        if not ok:
+            return -NFZ_PENALTY              # batarya / zaman ihlali
+
+        score  = len(nodes) * DELIVERY_REWARD
+        score -= (inst.battery_list[k] - bat_left) * ENERGY_WEIGHT
+
+        time_min, nfz_hit = 8*60, False
+        deadline = inst.win_end_list
+        home = prev = inst.home_list[k]
+        for nxt in nodes:
+            depart = time_min
+            time_min += dist(prev, nxt) / speed / 60
+            if blocked_at(prev, nxt, depart, time_min):
                 nfz_hit = True
-            score -= (dist_back / METRE_PER_WH) * ENERGY_WEIGHT
+            if time_min > deadline[nxt]:
+                score -= (time_min - deadline[nxt]) * LATE_PENALTY_MIN
+            prev = nxt
+
+        dist_back = dist(prev, home)
+        if blocked_at(prev, home, time_min, time_min + dist_back / speed / 60):
+            nfz_hit = True
+        score -= (dist_back / METRE_PER_WH) * ENERGY_WEIGHT
 
-            if nfz_hit:
-                return -NFZ_PENALTY          # NFZ kesen rota diskalifiye
+        if nfz_hit:
+            return -NFZ_PENALTY              # NFZ kesen rota diskalifiye
         return score
 
     # --------- crossover ----------
     def crossover(self, p1, p2):
-        child = copy.deepcopy(p1)
+        if isinstance(p1, ArrayChrom):
+            return chromosome.crossover(p1, p2, self.rand)
+        child = {d: list(r) for d, r in p1.items()}
         for d in self.drones:
             if self.rand.random() < 0.5:
-                child[d.id] = copy.deepcopy(p2[d.id])
+                child[d.id] = list(p2[d.id])
         return child
 
     # --------- mutasyon ----------
     def mutate(self, chrom):
+        ok = self.csp.swap_ok if self.csp is not None else None
+        if isinstance(chrom, ArrayChrom):
+            chromosome.mutate(chrom, self.mutation_rate, self.rand, ok)
+            return
         for d in self.drones:
             if self.rand.random() < self.mutation_rate and len(chrom[d.id]) > 1:
                 i, j = self.rand.sample(range(len(chrom[d.id])), 2)
+                if ok is not None and not ok(chrom[d.id], i, j):
+                    continue        # öncelik ihlali doğuracak takas yapılmaz
                 chrom[d.id][i], chrom[d.id][j] = chrom[d.id][j], chrom[d.id][i]
 
     # --------- repair ----------
     def repair(self, chrom):
+        if self.csp is not None:
+            self._repair_pruned(chrom)
+            return
+        if isinstance(chrom, ArrayChrom):
+            chromosome.repair(chrom, self.all_ids, self.rand)
+            return
         all_ids = {dlv.id for dlv in self.deliveries}
-        used, duplicates = set(), []
+        used, duplicates = set(), Counter()
         for lst in chrom.values():
             for rid in lst:
-                (duplicates if rid in used else used).append(rid) if rid in used else used.add(rid)
+                if rid in used:
+                    duplicates[rid] += 1
+                else:
+                    used.add(rid)
         missing = list(all_ids - used)
         self.rand.shuffle(missing)
+        # Rota uzunlukları farklı olabilir (yerel arama teslimat taşır): eksik
+        # kalmayınca fazla kopyalar silinir, artan eksikler rastgele rotaya eklenir
         for lst in chrom.values():
-            for i, rid in enumerate(lst):
-                if rid in duplicates:
-                    lst[i] = missing.pop() if missing else rid
-                    duplicates.remove(rid)
-
+            keep = []
+            for rid in lst:
+                if duplicates[rid] > 0:
+                    duplicates[rid] -= 1
+                    if not missing:
+                        continue
+                    rid = missing.pop()
+                keep.append(rid)
+            lst[:] = keep
+        for rid in missing:
+            chrom[self.rand.choice(self.drones).id].append(rid)
 
+    def _repair_pruned(self, chrom):
+        """Tekrarları (ilk görülen hariç) siler, eksikleri izin verilen bir drone'da
+           önceliği bozmayan rastgele bir konuma ekler; tüm teslimatlar tam bir kez
+           yer alır. Uygun konum yoksa izinli ilk drone'un sonuna eklenir."""
+        routes = chrom.to_dict() if isinstance(chrom, ArrayChrom) else chrom
+        csp, seen = self.csp, set()
+        for d in self.drones:
+            routes[d.id] = [r for r in routes[d.id] if not (r in seen or seen.add(r))]
+        missing = [dlv.id for dlv in self.deliveries if dlv.id not in seen]
+        self.rand.shuffle(missing)
+        for rid in missing:
+            ks = csp.drones_for(rid) or list(range(len(self.drones)))
+            start = self.rand.randrange(len(ks))
+            for q in range(len(ks)):
+                lst = routes[self.drones[ks[(start + q) % len(ks)]].id]
+                pos = csp.insert_positions(lst, rid)
+                if pos:
+                    lst.insert(self.rand.choice(pos), rid)
+                    break
+            else:
+                routes[self.drones[ks[start]].id].append(rid)
+        if isinstance(chrom, ArrayChrom):
+            packed = ArrayChrom.from_dict(routes, chrom.layout)
+            chrom.tour, chrom.offsets = packed.tour, packed.offsets
 
     # --------- NFZ düzeltme ----------
     def fix_nfz(self, chrom):
-        """Her drone rotasını NFZ'den çıkana kadar karıştırır; 30 denemeden sonra vazgeçer."""
-        polygons = build_nfz_polygons(self.zones)
-        id2del   = {d.id: d for d in self.deliveries}
+        """Her drone rotasını NFZ'den çıkana kadar karıştırır; 30 denemeden sonra vazgeçer.
+           Bacaklar, fitness ile aynı kalkış saatine göre uçuş anında kontrol edilir."""
         MAX_TRIES = 30          # sonsuz döngüyü engelle
+        is_array  = isinstance(chrom, ArrayChrom)
 
-        for dr in self.drones:
+        for k, dr in enumerate(self.drones):
             lst = chrom[dr.id]
             tries = 0
             while tries < MAX_TRIES:
-                hit = False
-                prev = dr.start_pos
-                # rota içi kenarlar
-                for rid in lst:
-                    nxt = id2del[rid].pos
-                    if intersects_nfz(prev, nxt, polygons, step_m=1000):
-                        hit = True
-                        break
-                    prev = nxt
-                # dönüş kenarı
-                if not hit and intersects_nfz(prev, dr.start_pos, polygons, step_m=1000):
-                    hit = True
-
-                if not hit:
+                if not self._route_hits_nfz(dr, lst):
                     break          # NFZ'yi hiç kesmiyor → rota kabul
                 # kesişiyorsa karıştır ve tekrar dene
-                self.rand.shuffle(lst)
+                if is_array:
+                    lst = chromosome.shuffle_route(chrom, k, self.rand)
+                else:
+                    self.rand.shuffle(lst)
+                if self.csp is not None:        # karışık rotada yalnızca ihlalli çiftleri ayır
+                    lst[:] = self.csp.arrange(lst, self.rand)
+                    if is_array:
+                        chrom.route(k)[:] = lst
                 tries += 1
 
+    def _route_hits_nfz(self, dr: Drone, lst: List[int]) -> bool:
+        dm         = self.dm
+        blocked_at = self.nfz.blocked_at
+        if self._counters is not None:
+            blocked_at = self._counters.counting("nfz_checks", blocked_at)
+        home = prev = dm.drone_index[dr.id]
+        t = 8*60
+        # rota içi kenarlar
+        for rid in lst:
+            nxt = dm.del_index[rid]
+            t_next = t + dm.flight_min(prev, nxt, dr.speed)
+            if blocked_at(prev, nxt, t, t_next):
+                return True
+            prev, t = nxt, t_next
+        # dönüş kenarı
+        return blocked_at(prev, home, t, t + dm.flight_min(prev, home, dr.speed))
+
 
     # --------- ana döngü ----------
-    def run(self):
-        pop = [self.random_chromosome() for _ in range(self.pop_size)]
-        for gen in range(self.generations):
-            print("debug → evaluating generation", gen)
-            scored = sorted(((self.fitness(c), c) for c in pop), key=lambda x: x[0], reverse=True)
-            best_score = scored[0][0]
-            pop = [c for s, c in scored[: self.elite] if s > -NFZ_PENALTY]
-            while len(pop) < self.pop_size:
-                p1, p2 = self.rand.sample(scored[: self.elite], 2)
-                child = self.crossover(p1[1], p2[1])
-                self.mutate(child)
-                self.repair(child)
-                self.fix_nfz(child)
-                pop.append(child)
-            if gen % 10 == 0:
-                print(f"Gen {gen:3d}  best={best_score:,.0f}")
-        return scored[0]  # (fitness, chrom)
+    def run(self, time_budget: Optional[float] = None, patience: Optional[int] = None,
+            min_delta: float = 0.0, callback=None, verbose: bool = False, initial=None,
+            checkpoint=None, checkpoint_every: int = 50, resume: bool = False,
+            checkpoint_overhead: Optional[float] = 0.05):
+        """En iyi (fitness, chrom) çiftini döndürür.
+           time_budget : saniye; bir sonraki nesil bütçeyi aşacaksa durur
+           patience    : en iyi skor bu kadar nesil boyunca min_delta'dan fazla
+                         iyileşmezse durur
+           callback    : callback(gen, best_fitness, best_chrom) her nesilden sonra
+                         çağrılır; True döndürürse durur
+           initial     : başlangıç popülasyonuna konacak kromozomlar (sıcak başlangıç);
+                         kalan yerler rastgele doldurulur
+           checkpoint  : .npz yolu; her checkpoint_every nesilde popülasyon + RNG
+                         atomik yazılır (checkpoint.py). Yazma süresi koşunun
+                         checkpoint_overhead oranını aşacaksa kayıt atlanır
+           resume      : True ise checkpoint dosyası varsa oradan bit düzeyinde
+                         aynı şekilde sürdürülür (initial yok sayılır)
+           Durma nedeni self.stop_reason, koşulan nesil sayısı self.generations_run,
+           kayıt maliyeti self.checkpoint_stats."""
+        ckpt = None
+        if checkpoint is not None:
+            ckpt = Checkpointer(self, checkpoint, checkpoint_every, checkpoint_overhead)
+        kw = dict(time_budget=time_budget, patience=patience, min_delta=min_delta,
+                  callback=callback, verbose=verbose, initial=initial, ckpt=ckpt, resume=resume)
+        if self.workers > 1:
+            with PoolEvaluator(self, self.workers) as pool:
+                return self._run(pool.map, **kw)
+        return self._run(self.evaluate, **kw)
+
+    def run_islands(self, islands=4, topology="ring", migration_interval=10,
+                    migrants=2, workers=None):
+        """Ada modeli: islands adet alt popülasyon (int ya da IslandConfig listesi)
+           ayrı süreçlerde evrilir, elitler periyodik olarak göç eder.
+           Ada başına yakınsama raporu self.island_report içindedir."""
+        if isinstance(islands, int):
+            islands = [IslandConfig(seed=42 + i, pop_size=self.pop_size,
+                                    elite_ratio=self.elite / self.pop_size,
+                                    mutation_rate=self.mutation_rate)
+                       for i in range(islands)]
+        model = IslandModel(self, islands, topology=topology,
+                            migration_interval=migration_interval,
+                            migrants=migrants, workers=workers)
+        fit, best = model.run()
+        self.island_report = model.report()
+        return fit, self.to_dict(best)
+
+    def _run(self, evaluate, time_budget, patience, min_delta, callback, verbose, initial=None,
+             ckpt=None, resume=False):
+        start = time.perf_counter()
+        best, stall = -NFZ_PENALTY, 0
+        fit, chrom = -NFZ_PENALTY, None
+        self.stop_reason, self.generations_run = "generations", 0
+        state = ckpt.resume() if ckpt is not None and resume else None
+        if state is not None:
+            best, stall = state.run["best"], state.run["stall"]
+            self.generations_run = state.gen
+        on_bred = None
+        if ckpt is not None:
+            def on_bred(gen, pop, best_pair):
+                dt = ckpt.maybe_save(gen + 1, pop, best_pair, {"best": best, "stall": stall})
+                if self._counters is not None:
+                    self._counters.seconds["checkpoint"] += dt
+        if self.telemetry is not None:
+            self.telemetry.on_run_start({"pop_size": self.pop_size, "generations": self.generations,
+                                         "drones": len(self.drones),
+                                         "deliveries": len(self.deliveries)})
+        for gen, fit, chrom in self.iterate(evaluate, initial, state, on_bred):
+            self.generations_run = gen + 1
+            if verbose and gen % 10 == 0:
+                print(f"Gen {gen:3d}  best={fit:,.0f}")
+            if callback is not None and callback(gen, fit, chrom):
+                self.stop_reason = "callback"
+                break
+            stall = 0 if fit > best + min_delta else stall + 1
+            best = max(best, fit)
+            if patience is not None and stall >= patience:
+                self.stop_reason = "stagnation"
+                break
+            if time_budget is not None:
+                elapsed = time.perf_counter() - start
+                if elapsed + elapsed / (gen + 1) > time_budget:   # sonraki nesil sığmıyor
+                    self.stop_reason = "time_budget"
+                    break
+        if self.telemetry is not None:
+            self.telemetry.on_run_end({"best": fit if fit > -NFZ_PENALTY else None,
+                                       "generations_run": self.generations_run,
+                                       "stop_reason": self.stop_reason,
+                                       "seconds": time.perf_counter() - start})
+        self.checkpoint_stats = ckpt.stats if ckpt is not None else None
+        return fit, chrom  # (fitness, chrom)
+
+    def iterate(self, evaluate=None, initial=None, resume=None, on_bred=None):
+        """Anytime arayüz: her nesilden sonra (gen, en_iyi_fitness, en_iyi_kromozom)
+           verir (şimdiye kadarki en iyi, sözlük biçiminde). Çağıran döngüyü istediği
+           an kırıp son verilen çözümü kullanabilir; kalan nesiller hiç hesaplanmaz.
+           Son skorlanan popülasyon self.population'da (en iyi önde) tutulur.
+           resume : checkpoint.Checkpoint — kayıtlı nesilden devam eder (RNG
+                    durumu çağıran tarafından yüklenmiş olmalı)
+           on_bred: on_bred(gen, sonraki_popülasyon, (en_iyi_fitness, en_iyi))
+                    her breed()'den sonra (kontrol noktası kaydı için)"""
+        evaluate = evaluate or self.evaluate
+        if resume is not None:
+            first, pop = resume.gen, resume.population
+            best = (resume.best_fit, resume.best_chrom)
+        else:
+            first = 0
+            pop = [chromosome.clone(c) for c in (initial or [])][: self.pop_size]
+            pop += [self.random_chromosome() for _ in range(self.pop_size - len(pop))]
+            best = (-NFZ_PENALTY, pop[0])
+        if self.telemetry is not None:
+            evaluate = self._timed_evaluate(evaluate)
+            self._counters.reset()
+            self._clock = (time.perf_counter(), self.cache_info())
+        for gen in range(first, self.generations):
+            scored = sorted(zip(evaluate(pop), pop), key=lambda x: x[0], reverse=True)
+            self.population = [c for _, c in scored]
+            if scored[0][0] > best[0] or gen == 0:
+                best = scored[0]
+            if self.telemetry is not None:
+                self._emit(gen, [s for s, _ in scored])
+            yield gen, best[0], self.to_dict(best[1])
+            pop = self.breed(scored)
+            if on_bred is not None:
+                on_bred(gen, pop, best)
+
+    def evolve(self, pop, generations, evaluate, history=None):
+        """pop'u `generations` nesil ilerletir.
+           Dönüş: (son nesil skor sıralı [(fitness, chrom)], bir sonraki popülasyon).
+           history verilirse her neslin en iyi skoru eklenir."""
+        scored = []
+        for gen in range(generations):
+            scored = sorted(zip(evaluate(pop), pop), key=lambda x: x[0], reverse=True)
+            if history is not None:
+                history.append(scored[0][0])
+            pop = self.breed(scored)
+        return scored, pop
+
+    def breed(self, scored):
+        """Elitleri korur, kalan yerleri çaprazlama + mutasyon + onarım ile doldurur."""
+        if self._counters is not None:
+            return self._breed_timed(scored)
+        if self._ls is not None:
+            scored = self.improve_elites(scored)
+        pop = [c for s, c in scored[: self.elite] if s > -NFZ_PENALTY]
+        while len(pop) < self.pop_size:
+            p1, p2 = self.rand.sample(scored[: self.elite], 2)
+            child = self.crossover(p1[1], p2[1])
+            self.mutate(child)
+            self.repair(child)
+            self.fix_nfz(child)
+            pop.append(child)
+        return pop
+
+    # --------- telemetri ----------
+    # Bir nesil kaydı: o neslin skorlanması + onu üreten breed() süreleri.
+    def _breed_timed(self, scored):
+        sec, clock = self._counters.seconds, time.perf_counter
+        if self._ls is not None:
+            t = clock()
+            scored = self.improve_elites(scored)
+            sec["local_search"] += clock() - t
+        pop = [c for s, c in scored[: self.elite] if s > -NFZ_PENALTY]
+        while len(pop) < self.pop_size:
+            p1, p2 = self.rand.sample(scored[: self.elite], 2)
+            t0 = clock()
+            child = self.crossover(p1[1], p2[1])
+            t1 = clock()
+            self.mutate(child)
+            t2 = clock()
+            self.repair(child)
+            t3 = clock()
+            self.fix_nfz(child)
+            t4 = clock()
+            sec["crossover"] += t1 - t0
+            sec["mutate"] += t2 - t1
+            sec["repair"] += t3 - t2
+            sec["fix_nfz"] += t4 - t3
+            pop.append(child)
+        return pop
+
+    def _timed_evaluate(self, evaluate):
+        sec = self._counters.seconds
+
+        def timed(pop):
+            t = time.perf_counter()
+            scores = evaluate(pop)
+            sec["fitness"] += time.perf_counter() - t
+            return scores
+        return timed
+
+    def _emit(self, gen: int, scores: List[float]):
+        start, before = self._clock
+        after = self.cache_info()
+        self.telemetry.on_generation(generation_record(
+            gen, scores, time.perf_counter() - start, self._counters,
+            after.hits - before.hits, after.misses - before.misses))
+        self._counters.reset()
+        self._clock = (start, after)
+
+    def improve_elites(self, scored):
+        """En iyi self.local_search uygun bireye yerel arama (local_search.py) uygular."""
+        head = [self._ls.improve(c, s) if s > -NFZ_PENALTY else (s, c)
+                for s, c in scored[: self.local_search]]
+        return sorted(head + scored[self.local_search:], key=lambda x: x[0], reverse=True)
+
+    # --------- artımlı yeniden planlama ----------
+    # Gün içinde gelen / iptal edilen siparişler ve drone değişiklikleri:
+    # dm / nfz yalnızca yeni satırları hesaplar, çıkarılan düğümler mezar taşı
+    # olarak kalır; self.population yeni siparişler en ucuz uygun konuma
+    # eklenerek güncellenir ve reoptimize() onunla sıcak başlar. detour=True
+    # senaryolarda artımlı güncelleme yoktur (ValueError).
+    def add_deliveries(self, deliveries: List[Delivery]):
+        """Yeni teslimatları ekler. detour=True iken desteklenmez (ValueError):
+           sapma matrisi tüm senaryonun görünürlük grafiğinden kurulur, yeni
+           satırlar için artımlı hesap yoktur — GA'yı yeniden kurun."""
+        self._check_incremental()
+        deliveries = list(deliveries)
+        self._revive([d.id for d in deliveries])
+        self.dm.extend(deliveries=deliveries)
+        self.nfz.extend(self.dm.coords)
+        self.deliveries = list(self.deliveries) + deliveries
+        self._rebuild_lookups()
+        if self.graph is not None:
+            extend_graph(self.graph, self.dm, self.nfz, deliveries=deliveries)
+        self._update_population(insert=[d.id for d in deliveries])
+
+    def remove_deliveries(self, ids):
+        self._check_incremental()
+        ids = set(ids)
+        self.deliveries = [d for d in self.deliveries if d.id not in ids]
+        self.dm.discard(delivery_ids=ids)
+        self._retired |= {("del", i) for i in ids}
+        self._rebuild_lookups()
+        if self.graph is not None:
+            self.graph.remove_nodes_from(f"del_{i}" for i in ids)
+        self._update_population(drop=ids)
+
+    def add_drones(self, drones: List[Drone]):
+        self._check_incremental()
+        drones = list(drones)
+        self._revive([d.id for d in drones], kind="drone")
+        self.dm.extend(drones=drones)
+        self.nfz.extend(self.dm.coords)
+        self.drones = list(self.drones) + drones
+        self._rebuild_lookups()
+        if self.graph is not None:
+            extend_graph(self.graph, self.dm, self.nfz, drones=drones)
+        self._update_population()
+
+    def remove_drones(self, ids):
+        """Drone'ları çıkarır; rotalarındaki teslimatlar kalan drone'lara eklenir."""
+        self._check_incremental()
+        ids = set(ids)
+        orphans = [[r for i in ids if i in self.layout for r in c[i]] for c in self.population]
+        self.drones = [d for d in self.drones if d.id not in ids]
+        self.dm.discard(drone_ids=ids)
+        self._retired |= {("drone", i) for i in ids}
+        self._rebuild_lookups()
+        if self.graph is not None:
+            self.graph.remove_nodes_from(f"drone_{i}" for i in ids)
+        self._update_population(insert=orphans)
+
+    def reoptimize(self, time_budget: Optional[float] = 0.5, **run_kw):
+        """Son popülasyondan sıcak başlayarak yeniden çalıştırır."""
+        return self.run(time_budget=time_budget, initial=self.population, **run_kw)
+
+    def _check_incremental(self):
+        if self.detour:
+            raise ValueError("detour=True ile artımlı güncelleme desteklenmiyor; "
+                             "GAOptimizer'ı güncel senaryoyla yeniden kurun")
+
+    def _revive(self, ids, kind="del"):
+        """Daha önce çıkarılmış bir id yeniden gelirse rota önbelleği geçersizdir."""
+        if any((kind, i) in self._retired for i in ids):
+            self.route_score.cache_clear()
+            self._retired -= {(kind, i) for i in ids}
+
+    def _update_population(self, insert=(), drop=()):
+        """self.population'ı yeni düzene uyarlar: drop id'leri silinir, insert
+           (tek liste ya da kromozom başına liste) en ucuz uygun konuma eklenir.
+           Sonuçta her teslimat her kromozomda tam bir kez bulunur: tekrarlar
+           (ilk görülen hariç) silinir, eksik kalanlar da eklenir."""
+        if not self.population:
+            return
+        inserter = LocalSearch(self)
+        per_chrom = insert and isinstance(insert[0], list)
+        valid = self.id2del
+        pop = []
+        for k, chrom in enumerate(self.population):
+            old = self.to_dict(chrom)
+            seen = set()
+            routes = {d.id: [r for r in old.get(d.id, [])
+                             if r in valid and r not in drop and not (r in seen or seen.add(r))]
+                      for d in self.drones}
+            ids = list(dict.fromkeys(r for r in (insert[k] if per_chrom else insert)
+                                     if r not in seen))
+            ids += [dlv.id for dlv in self.deliveries if dlv.id not in seen and dlv.id not in ids]
+            if ids:
+                routes = inserter.insert(routes, ids)
+            pop.append(ArrayChrom.from_dict(routes, self.layout)
+                       if self.encoding == "array" else routes)
+        self.population = pop
 
 
 # ------------------- Hızlı test -----------------------------------
 if __name__ == "__main__":
-    def load(p, cls):
-        with open(p, encoding="utf-8") as f:
-            return [cls(**o) for o in json.load(f)]
+    from scenario_io import load_scenario
 
-    drones     = load(Path("data/drones_s1.json"),     Drone)
-    deliveries = load(Path("data/deliveries_s1.json"), Delivery)
-    zones      = load(Path("data/nofly_s1.json"),      NoFlyZone)
+    drones, deliveries, zones = load_scenario("s1")
 
-    g = build_graph(drones, deliveries, zones)
-    ga = GAOptimizer(drones, deliveries, g, zones)
-    fit, best = ga.run()
+    dm  = DistanceMatrix(drones, deliveries)
+    nfz = NFZIndex(dm.coords, zones)
+    g = build_graph(drones, deliveries, zones, dm=dm, nfz=nfz)
+    ga = GAOptimizer(drones, deliveries, g, zones, dm=dm, nfz=nfz)
+    fit, best = ga.run(verbose=True)
     print("\nEn iyi fitness:", fit)
     for did, lst in best.items():
         print(f"Drone {did}: {lst}")
@@ -3,17 +3,22 @@ Tam bağlantılı yönsüz grafik:
 • Düğümler   : drone başlangıç konumları + teslimat noktaları
 • Kenar ağırlığı : Haversine mesafe (metre)
 • NFZ (No‑Fly Zone) poligonlarını kesen kenarlar otomatik atılır
+  (yalnızca tüm gün aktif bölgeler; saatli bölgeler kenara `nfz_windows` yazar)
 Hız optimizasyonu:
   –  Bounding‑box ön filtresi
   –  Shapely LineString.intersects   (C seviyesinde hızlı)
   –  Gerekirse seyrek örnekleme (step_m = 2 000 m)
 """
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import math
+import numpy as np
 import networkx as nx
 from shapely.geometry import Polygon, LineString, Point, box
 from functools import lru_cache
 from models import Drone, Delivery, NoFlyZone
+from distance import DistanceMatrix
+from nfz import NFZIndex
+from sparse_graph import build_sparse_graph
 
 # ------------------------------------------------------------------ #
 #  Temel yardımcılar                                                 #
@@ -92,10 +97,19 @@ def build_graph(
     drones: List[Drone],
     deliveries: List[Delivery],
     zones: List[NoFlyZone],
+    dm: Optional[DistanceMatrix] = None,
+    nfz: Optional[NFZIndex] = None,
+    k: Optional[int] = None,
 ) -> nx.Graph:
-    """NFZ kesişen kenarları atlayarak tam bağlantılı grafik üretir."""
+    """NFZ kesişen kenarları atlayarak tam bağlantılı grafik üretir.
+       Mesafe ve NFZ kontrolleri toplu hesaplanmış matrislerden okunur.
+       k verilirse tam grafik yerine k‑NN seyrek grafik (sparse_graph.py)
+       kurulur; CSR biçimi için doğrudan build_sparse_graph kullanılabilir."""
+    if k is not None:
+        return build_sparse_graph(drones, deliveries, zones, k=k).to_networkx()
     g = nx.Graph()
-    polygons = build_nfz_polygons(zones)
+    dm  = dm  if dm  is not None else DistanceMatrix(drones, deliveries)
+    nfz = nfz if nfz is not None else NFZIndex(dm.coords, zones)
 
     # Düğümler
     for d in drones:
@@ -105,17 +119,50 @@ def build_graph(
             f"del_{dlv.id}", pos=dlv.pos, kind="delivery", weight=dlv.weight
         )
 
-    # Kenarlar
-    nodes = list(g.nodes(data=True))
-    for i in range(len(nodes)):
-        n1, dat1 = nodes[i]
-        p1 = dat1["pos"]
-        for j in range(i + 1, len(nodes)):
-            n2, dat2 = nodes[j]
-            p2 = dat2["pos"]
-            if intersects_nfz(p1, p2, polygons, step_m=2000.0):
-                continue  # NFZ ihlali → kenarı atla
-            dist = haversine(p1, p2)
-            g.add_edge(n1, n2, distance=dist, cost=dist)
+    # Kenarlar — düğüm sırası DistanceMatrix ile aynı (drone'lar + teslimatlar)
+    names = list(g.nodes)
+    ii, jj = np.triu_indices(len(names), 1)
+    keep = ~nfz.blocked[ii, jj]                   # tüm gün NFZ ihlali → kenarı atla
+    ii, jj = ii[keep], jj[keep]
+    dists = dm.dist[ii, jj].tolist()
+    g.add_edges_from(
+        (names[i], names[j], {"distance": d, "cost": d})
+        for i, j, d in zip(ii.tolist(), jj.tolist(), dists)
+    )
+    # Saatli NFZ'ler kenarı silmez; yasak aralıkları (dakika) kenara yazılır
+    for (i, j), windows in nfz.windows.items():
+        if i < j and g.has_edge(names[i], names[j]):
+            g[names[i]][names[j]]["nfz_windows"] = windows
 
     return g
+
+
+def extend_graph(
+    g: nx.Graph,
+    dm: DistanceMatrix,
+    nfz: NFZIndex,
+    drones: List[Drone] = (),
+    deliveries: List[Delivery] = (),
+) -> nx.Graph:
+    """dm / nfz'ye extend() ile eklenmiş düğümleri ve yalnızca onlara ait
+       kenarları mevcut grafiğe ekler (build_graph ile aynı öznitelikler)."""
+    names = {i: f"drone_{d}" for d, i in dm.drone_index.items()}
+    names.update({i: f"del_{d}" for d, i in dm.del_index.items()})
+    for d in drones:
+        g.add_node(f"drone_{d.id}", pos=d.start_pos, kind="start")
+    for dlv in deliveries:
+        g.add_node(f"del_{dlv.id}", pos=dlv.pos, kind="delivery", weight=dlv.weight)
+
+    others = np.fromiter(names, dtype=np.int64, count=len(names))
+    new = [dm.drone_index[d.id] for d in drones] + [dm.del_index[dlv.id] for dlv in deliveries]
+    for i in new:
+        keep = ~nfz.blocked[i, others] & (others != i)
+        jj = others[keep]
+        g.add_edges_from(
+            (names[i], names[j], {"distance": d, "cost": d})
+            for j, d in zip(jj.tolist(), dm.dist[i, jj].tolist())
+        )
+        for j in jj[nfz.timed[i, jj]].tolist():
+            g[names[i]][names[j]]["nfz_windows"] = nfz.windows[(i, j)]
+    return g
+
@@ -0,0 +1,87 @@
+"""
+Derlenmiş problem örneği (struct‑of‑arrays, senaryo başına bir kez):
+• Düğüm dizileri (DistanceMatrix düğüm sırası): ağırlık, öncelik, zaman
+  penceresi başlangıç / bitiş (dakika, "HH:MM" bir kez ayrıştırılır).
+  Depo ve çıkarılmış (mezar taşı) düğümler nötrdür: ağırlık 0, pencere ±inf
+• Drone dizileri (drones listesi sırası): depo düğümü, taşıma kapasitesi,
+  batarya, hız; drone_pos[id] → sıra
+• id2node: teslimat id → düğüm indeksi (dizi; sıcak döngüde sözlük yok)
+• *_list öznitelikleri aynı verinin Python listeleri: skaler döngülerde
+  (csp.check_nodes, GA fitness, local_search) NumPy skalerinden hızlı
+Girdi scenario_io.Records ise pencereler doğrudan "window" sütunundan okunur.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from models import Drone, Delivery, hhmm_to_min
+from distance import DistanceMatrix
+
+
+def _ids(items) -> np.ndarray:
+    col = getattr(items, "column", None)
+    return np.asarray(col("id") if col is not None else [o.id for o in items], dtype=np.int64)
+
+
+def _column(items, name: str, attr: str, dtype) -> np.ndarray:
+    col = getattr(items, "column", None)
+    if col is not None:
+        return np.asarray(col(name), dtype=dtype)
+    return np.array([getattr(o, attr) for o in items], dtype=dtype)
+
+
+def _windows(deliveries) -> np.ndarray:
+    col = getattr(deliveries, "column", None)
+    if col is not None:
+        return np.asarray(col("window"), dtype=np.float64).reshape(-1, 2)
+    return np.array([[hhmm_to_min(t) for t in d.time_window] for d in deliveries],
+                    dtype=np.float64).reshape(-1, 2)
+
+
+class ProblemInstance:
+    """drones + deliveries + DistanceMatrix düğüm indeksleri → bitişik diziler."""
+
+    def __init__(self, drones: List[Drone], deliveries: List[Delivery],
+                 dm: Optional[DistanceMatrix] = None):
+        dm = dm if dm is not None else DistanceMatrix(drones, deliveries)
+        self.dm = dm
+        n = len(dm)
+        self.n_nodes = n
+
+        # Teslimat düğümleri
+        del_ids = _ids(deliveries)
+        nodes = np.array([dm.del_index[i] for i in del_ids.tolist()], dtype=np.int64)
+        self.weight = np.zeros(n)
+        self.priority = np.zeros(n, dtype=np.int8)
+        self.win_start = np.full(n, -np.inf)
+        self.win_end = np.full(n, np.inf)
+        self.weight[nodes] = _column(deliveries, "weight", "weight", np.float64)
+        self.priority[nodes] = _column(deliveries, "priority", "priority", np.int8)
+        win = _windows(deliveries)
+        self.win_start[nodes], self.win_end[nodes] = win[:, 0], win[:, 1]
+        self.id2node = np.full(int(del_ids.max()) + 1 if len(del_ids) else 1, -1, dtype=np.int64)
+        self.id2node[del_ids] = nodes
+
+        # Drone'lar (liste sırası)
+        drone_ids = _ids(drones)
+        self.drone_pos: Dict[int, int] = {i: k for k, i in enumerate(drone_ids.tolist())}
+        self.home = np.array([dm.drone_index[i] for i in drone_ids.tolist()], dtype=np.int64)
+        self.max_weight = _column(drones, "max_weight", "max_weight", np.float64)
+        self.battery = _column(drones, "battery_capacity", "battery_capacity", np.float64)
+        self.speed = _column(drones, "speed", "speed", np.float64)
+
+        # Skaler döngüler için liste kopyaları
+        self.weight_list = self.weight.tolist()
+        self.win_start_list = self.win_start.tolist()
+        self.win_end_list = self.win_end.tolist()
+        self.id2node_list = self.id2node.tolist()
+        self.home_list = self.home.tolist()
+        self.max_weight_list = self.max_weight.tolist()
+        self.battery_list = self.battery.tolist()
+        self.speed_list = self.speed.tolist()
+
+    def nodes(self, route_ids) -> List[int]:
+        """Teslimat id dizisi → düğüm indeksleri."""
+        id2node = self.id2node_list
+        return [id2node[r] for r in route_ids]
+
+    def __len__(self) -> int:
+        return self.n_nodes
@@ -0,0 +1,170 @@
+"""
+Ada modeli (island model) GA:
+• K alt popülasyon ayrı süreçlerde birbirinden bağımsız evrilir
+• Her `migration_interval` nesilde her adanın elitleri komşulara göç eder
+    topology="ring" : i → i+1
+    topology="all"  : i → diğer tüm adalar
+• Gelen göçmenler hedef adanın son üretilen çocuklarının yerini alır
+  (breed() çocukları skorlamaz; elitler listenin başındadır)
+• Her adanın kendi tohumu ve operatör oranları vardır (IslandConfig)
+• Ada RNG durumu görevle birlikte taşınır → işçi sayısından bağımsız,
+  aynı tohumlar için aynı sonuç
+"""
+import math
+import multiprocessing as mp
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from parallel import SharedScenario, attach_scenario, ga_flags
+from chromosome import clone
+
+TOPOLOGIES = ("ring", "all")
+
+
+@dataclass
+class IslandConfig:
+    """Tek adanın ayarları."""
+    seed: int = 42
+    pop_size: int = 60
+    elite_ratio: float = 0.2
+    mutation_rate: float = 0.2
+
+
+class _IslandHost:
+    """Bir süreçteki adaların GAOptimizer örneklerini tutar (matrisler ortak)."""
+
+    def __init__(self, base):
+        self.base = base
+        self.islands: Dict[int, object] = {}
+
+    def _ga(self, idx: int, cfg: IslandConfig):
+        ga = self.islands.get(idx)
+        if ga is None:
+            b = self.base
+            ga = type(b)(b.drones, b.deliveries, b.graph, b.zones,
+                         pop_size=cfg.pop_size, elite_ratio=cfg.elite_ratio,
+                         mutation_rate=cfg.mutation_rate, dm=b.dm, nfz=b.nfz,
+                         **ga_flags(b))
+            self.islands[idx] = ga
+        return ga
+
+    def epoch(self, task):
+        idx, cfg, pop, state, generations = task
+        ga = self._ga(idx, cfg)
+        if state is None:                      # ilk dönem: adanın kendi tohumu
+            ga.rand.seed(cfg.seed)
+            pop = [ga.random_chromosome() for _ in range(ga.pop_size)]
+        else:
+            ga.rand.setstate(state)
+        history: List[float] = []
+        scored, pop = ga.evolve(pop, generations, ga.evaluate, history)
+        return scored[: ga.elite], pop, ga.rand.getstate(), history
+
+
+_HOST: Optional[_IslandHost] = None
+
+
+def _init_worker(spec):
+    global _HOST
+    _HOST = _IslandHost(attach_scenario(spec))
+
+
+def _epoch(task):
+    return _HOST.epoch(task)
+
+
+class IslandModel:
+    """base GAOptimizer'ın senaryosu üzerinde K adalı GA."""
+
+    def __init__(
+        self,
+        base,
+        islands: List[IslandConfig],
+        topology: str = "ring",
+        migration_interval: int = 10,
+        migrants: int = 2,
+        workers: Optional[int] = None,
+    ):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"topology {TOPOLOGIES} içinden olmalı: {topology!r}")
+        self.base = base
+        self.islands = islands
+        self.topology = topology
+        self.migration_interval = max(1, migration_interval)
+        self.migrants = migrants
+        self.workers = min(len(islands), workers or mp.cpu_count())
+        self.history: List[List[float]] = [[] for _ in islands]
+
+    # --------- göç ----------
+    def _targets(self, i: int) -> List[int]:
+        k = len(self.islands)
+        if k < 2:
+            return []
+        if self.topology == "ring":
+            return [(i + 1) % k]
+        return [j for j in range(k) if j != i]
+
+    def _migrate(self, tops, pops):
+        incoming: List[list] = [[] for _ in pops]
+        for i, top in enumerate(tops):
+            for j in self._targets(i):
+                incoming[j].extend(clone(c) for _, c in top[: self.migrants])
+        for pop, inc in zip(pops, incoming):
+            if inc:
+                inc = inc[: len(pop)]
+                pop[len(pop) - len(inc):] = inc    # sondakiler: son üretilen çocuklar
+
+    # --------- ana döngü ----------
+    def run(self) -> Tuple[float, dict]:
+        n_epochs = math.ceil(self.base.generations / self.migration_interval)
+        pops: List[Optional[list]] = [None] * len(self.islands)
+        states: List[Optional[tuple]] = [None] * len(self.islands)
+        tops: List[list] = []
+
+        shared, pool = None, None
+        if self.workers > 1:
+            shared = SharedScenario(self.base)
+            pool = mp.Pool(self.workers, initializer=_init_worker, initargs=(shared.spec,))
+
+            def run_epoch(tasks):
+                return pool.map(_epoch, tasks, chunksize=1)
+        else:
+            host = _IslandHost(self.base)
+
+            def run_epoch(tasks):
+                return [host.epoch(t) for t in tasks]
+        try:
+            done = 0
+            for _ in range(n_epochs):
+                gens = min(self.migration_interval, self.base.generations - done)
+                tasks = [(i, cfg, pops[i], states[i], gens) for i, cfg in enumerate(self.islands)]
+                results = run_epoch(tasks)
+                tops = [r[0] for r in results]
+                pops = [r[1] for r in results]
+                states = [r[2] for r in results]
+                for h, r in zip(self.history, results):
+                    h.extend(r[3])
+                done += gens
+                self._migrate(tops, pops)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+                shared.close()
+
+        return max((top[0] for top in tops if top), key=lambda x: x[0])
+
+    # --------- rapor ----------
+    def report(self) -> List[dict]:
+        """Ada başına yakınsama özeti."""
+        rows = []
+        for cfg, h in zip(self.islands, self.history):
+            best = max(h) if h else float("-inf")
+            rows.append(dict(
+                seed=cfg.seed,
+                mutation_rate=cfg.mutation_rate,
+                elite_ratio=cfg.elite_ratio,
+                best=best,
+                converged_gen=h.index(best) if h else None,   # en iyiye ilk ulaşılan nesil
+                history=h,
+            ))
+        return rows
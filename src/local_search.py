@@ -0,0 +1,314 @@
+"""
+Memetik yerel arama (GA elitlerine uygulanır):
+• Rota içi : 2-opt (segment ters çevirme), Or-opt (1–3'lük segment taşıma)
+• Rotalar arası : relocate (teslimatı başka drone'a taşı), exchange (takas)
+Delta değerlendirme:
+• Maliyet fitness ile aynıdır: Σ bacak + dönüş bacağı (dönüş enerjisi
+  fitness'ta iki kez düşülür), mesafeler DistanceMatrix'ten O(1)
+• Bekleme olmadığı için varış zamanı ve enerji yalnızca kümülatif mesafeye
+  bağlıdır; her rota için kümülatif mesafe (cd) ve sonek boşlukları
+  (slack_lo / slack_hi) tutulur → değişen kısım O(k), kayan sonek O(1)
+  ile zaman penceresi / batarya açısından kontrol edilir
+• Saatli NFZ kesen sonekler kaydırıldığında yalnızca o sonek yeniden taranır
+• Uygulanan her hamle sonunda GAOptimizer.fitness ile doğrulanır
+• insert(): yeni siparişler için en ucuz uygun ekleme (artımlı yeniden planlama)
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from chromosome import ArrayChrom
+
+METRE_PER_WH = 40.0
+TAKEOFF_MIN  = 8 * 60
+EPS          = 1e-9
+
+
+class _Route:
+    """Tek drone rotası + kümülatif mesafe ve sonek boşlukları."""
+    __slots__ = ("ls", "k", "home", "speed", "cap_m", "max_w", "nodes",
+                 "ext", "cd", "slack_lo", "slack_hi", "timed_suffix", "cost")
+
+    def __init__(self, ls: "LocalSearch", k: int, nodes: List[int]):
+        dr = ls.ga.drones[k]
+        self.ls, self.k = ls, k
+        self.home = ls.dm.drone_index[dr.id]
+        self.speed = dr.speed
+        self.cap_m = dr.battery_capacity * METRE_PER_WH    # batarya, metre cinsinden
+        self.max_w = dr.max_weight
+        self.set(nodes)
+
+    def set(self, nodes: List[int]):
+        d, ls = self.ls.d, self.ls
+        self.nodes = nodes
+        self.ext = [self.home] + nodes + [self.home]      # ext[t + 1] == at(t)
+        cd, c, p = [], 0.0, self.home
+        for v in nodes:
+            c += d(p, v)
+            cd.append(c)
+            p = v
+        self.cd = cd
+        n = len(nodes)
+        self.slack_lo = [0.0] * (n + 1)
+        self.slack_hi = [0.0] * (n + 1)
+        self.timed_suffix = [False] * (n + 1)
+        lo, hi = float("-inf"), float("inf")
+        timed = ls.timed(p, self.home)
+        self.slack_lo[n], self.slack_hi[n], self.timed_suffix[n] = lo, hi, timed
+        for t in range(n - 1, -1, -1):
+            v = nodes[t]
+            lo = max(lo, self.lo(v) - cd[t])
+            hi = min(hi, self.hi(v) - cd[t])
+            timed = timed or ls.timed(nodes[t - 1] if t else self.home, v)
+            self.slack_lo[t], self.slack_hi[t], self.timed_suffix[t] = lo, hi, timed
+        back = d(p, self.home)
+        self.cost = c + 2 * back
+
+    # Zaman penceresi, kümülatif mesafe (metre) cinsinden
+    def lo(self, v: int) -> float:
+        return (self.ls.win_start[v] - TAKEOFF_MIN) * self.speed * 60
+
+    def hi(self, v: int) -> float:
+        return (self.ls.win_end[v] - TAKEOFF_MIN) * self.speed * 60
+
+    def clock(self, c: float) -> float:
+        return TAKEOFF_MIN + c / self.speed / 60
+
+    def at(self, t: int) -> int:
+        """t. durak düğümü; rota dışı (−1 / n) → depo."""
+        return self.nodes[t] if 0 <= t < len(self.nodes) else self.home
+
+    def last_after_removal(self, i: int, j: int) -> int:
+        """nodes[i:j] çıkarıldıktan sonraki son düğüm."""
+        return self.nodes[-1] if j < len(self.nodes) else self.at(i - 1)
+
+    # --------- splice: nodes[:i] + middle + nodes[j:] ----------
+    def splice_feasible(self, i: int, middle: List[int], j: int) -> bool:
+        ls, d, nodes = self.ls, self.ls.d, self.nodes
+        blocked_at = ls.nfz.blocked_at
+        p = nodes[i - 1] if i else self.home
+        c = self.cd[i - 1] if i else 0.0
+        for m in middle:
+            c_next = c + d(p, m)
+            if ls.weight[m] > self.max_w or not (self.lo(m) <= c_next <= self.hi(m)):
+                return False
+            if blocked_at(p, m, self.clock(c), self.clock(c_next)):
+                return False
+            p, c = m, c_next
+        if j < len(nodes):
+            s = nodes[j]
+            c_next = c + d(p, s)
+            if blocked_at(p, s, self.clock(c), self.clock(c_next)):
+                return False
+            delta = c_next - self.cd[j]
+            if not (self.slack_lo[j] <= delta <= self.slack_hi[j]):
+                return False
+            if self.timed_suffix[j] and delta != 0.0:
+                for t in range(j + 1, len(nodes)):
+                    if blocked_at(nodes[t - 1], nodes[t],
+                                  self.clock(self.cd[t - 1] + delta), self.clock(self.cd[t] + delta)):
+                        return False
+            p, c = nodes[-1], self.cd[-1] + delta
+        back = d(p, self.home)
+        if c + back > self.cap_m:
+            return False
+        return not blocked_at(p, self.home, self.clock(c), self.clock(c + back))
+
+
+class LocalSearch:
+    """GAOptimizer senaryosu üzerinde first-improvement yerel arama."""
+
+    def __init__(self, ga, max_passes: int = 3):
+        self.ga = ga
+        self.dm = ga.dm
+        self.nfz = ga.nfz
+        self.d = ga.dm._item
+        self.timed = ga.nfz._timed
+        self.max_passes = max_passes
+        # Düğüm başına ağırlık / pencere (ga.inst; depo düğümleri nötr)
+        self.weight = ga.inst.weight_list
+        self.win_start = ga.inst.win_start_list
+        self.win_end = ga.inst.win_end_list
+        self.node2id = {k: i for i, k in ga.dm.del_index.items()}
+        self._optimal = set()          # yerel optimum olduğu bilinen kromozomlar
+
+    # --------- ana giriş ----------
+    def improve(self, chrom, fitness: Optional[float] = None):
+        """Uygun (fitness > -inf) kromozomu iyileştirir; (fitness, kromozom) döndürür."""
+        ga = self.ga
+        if fitness is None:
+            fitness = ga.fitness(chrom)
+        if fitness == float("-inf"):
+            return fitness, chrom
+        key = tuple(tuple(chrom[dr.id]) for dr in ga.drones)
+        if key in self._optimal:       # elitler nesiller boyunca tekrar gelir
+            return fitness, chrom
+        routes = [_Route(self, k, [self.dm.del_index[r] for r in chrom[dr.id]])
+                  for k, dr in enumerate(ga.drones)]
+        for _ in range(self.max_passes):
+            moved = False
+            for r in routes:
+                moved |= self._two_opt(r)
+                moved |= self._or_opt(r)
+            for a in routes:
+                for b in routes:
+                    if a is not b:
+                        moved |= self._relocate(a, b)
+                        moved |= self._exchange(a, b)
+            if not moved:
+                break
+
+        new = {dr.id: [self.node2id[v] for v in r.nodes] for dr, r in zip(ga.drones, routes)}
+        if isinstance(chrom, ArrayChrom):
+            new = ArrayChrom.from_dict(new, chrom.layout)
+        new_fit = ga.fitness(new)
+        if len(self._optimal) > 10_000:
+            self._optimal.clear()
+        if new_fit > fitness:          # kesin doğrulama (yuvarlama sınırları)
+            self._optimal.add(tuple(tuple(r) for r in new.values()) if isinstance(new, dict)
+                              else tuple(tuple(new[dr.id]) for dr in ga.drones))
+            return new_fit, new
+        self._optimal.add(key)
+        return fitness, chrom
+
+    # --------- en ucuz ekleme ----------
+    def insert(self, chrom, ids: List[int], max_checks: int = 64) -> Dict[int, List[int]]:
+        """ids teslimatlarını sırayla en ucuz uygun konuma ekler (sözlük döner).
+           Maliyet deltaları tüm konumlar için vektörel; uygunluk (splice_feasible)
+           yalnızca en ucuz adayların rotalarında, gerektiğinde kurulan _Route ile.
+           Uygun konum yoksa (ör. rota zaten uygunsuz) en ucuz konum seçilir."""
+        ga, dist, del_index = self.ga, self.dm.dist, self.dm.del_index
+        homes = [self.dm.drone_index[dr.id] for dr in ga.drones]
+        max_w = [dr.max_weight for dr in ga.drones]
+        nodes = [[del_index[r] for r in chrom[dr.id]] for dr in ga.drones]
+        built: Dict[int, _Route] = {}
+        for did in ids:
+            v = del_index[did]
+            cand_k, cand_j, cand_d = [], [], []
+            for k, (h, lst) in enumerate(zip(homes, nodes)):
+                if self.weight[v] > max_w[k]:
+                    continue
+                ext = np.array([h] + lst + [h])
+                c, e = ext[:-1], ext[1:]
+                delta = dist[c, v] + dist[v, e] - dist[c, e]
+                delta[-1] += dist[v, h] - dist[c[-1], h]           # son durak değişir
+                cand_k.append(np.full(len(delta), k))
+                cand_j.append(np.arange(len(delta)))
+                cand_d.append(delta)
+            if not cand_d:                               # ağırlık hiçbir drone'a uymuyor
+                cand_k = [np.arange(len(nodes))]
+                cand_j = [np.array([len(lst) for lst in nodes])]
+                cand_d = [np.zeros(len(nodes))]
+            ks, js, ds = (np.concatenate(x) for x in (cand_k, cand_j, cand_d))
+            order = np.argsort(ds, kind="stable")
+            pick = order[0]
+            for o in order[:max_checks].tolist():
+                k, j = int(ks[o]), int(js[o])
+                r = built.get(k)
+                if r is None:
+                    r = built[k] = _Route(self, k, nodes[k])
+                if r.splice_feasible(j, [v], j):
+                    pick = o
+                    break
+            k, j = int(ks[pick]), int(js[pick])
+            nodes[k] = nodes[k][:j] + [v] + nodes[k][j:]
+            built.pop(k, None)
+        return {dr.id: [self.node2id[v] for v in lst] for dr, lst in zip(ga.drones, nodes)}
+
+    # --------- rota içi ----------
+    # Delta'lar simetrik mesafe varsayar (haversine); uygulanan hamleler yine de
+    # splice_feasible ve sonda fitness ile doğrulanır.
+    def _two_opt(self, r: _Route) -> bool:
+        d, moved = self.d, False
+        n = len(r.nodes)
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                a, b = r.ext[i], r.ext[j + 2]
+                ni, nj = r.nodes[i], r.nodes[j]
+                delta = d(a, nj) + d(ni, b) - d(a, ni) - d(nj, b)
+                if j == n - 1:                                  # son durak değişir
+                    delta += d(ni, r.home) - d(nj, r.home)
+                if delta < -EPS:
+                    mid = r.nodes[i:j + 1][::-1]
+                    if r.splice_feasible(i, mid, j + 1):
+                        r.set(r.nodes[:i] + mid + r.nodes[j + 1:])
+                        moved = True
+        return moved
+
+    def _or_opt(self, r: _Route) -> bool:
+        d, moved, home = self.d, False, r.home
+        for seg_len in (1, 2, 3):
+            i = 0
+            while i + seg_len <= len(r.nodes):
+                nodes, n = r.nodes, len(r.nodes)
+                s0, s1 = nodes[i], nodes[i + seg_len - 1]
+                a, b = r.ext[i], r.ext[i + seg_len + 1]
+                remove = d(a, b) - d(a, s0) - d(s1, b)
+                last_rest = r.last_after_removal(i, i + seg_len)
+                for j in range(n - seg_len + 1):              # rest içindeki ekleme yeri
+                    if j == i:
+                        continue
+                    # rest[j-1], rest[j] → ext indeksleri
+                    c = r.ext[j if j <= i else j + seg_len]
+                    e = r.ext[j + 1 if j < i else j + seg_len + 1]
+                    delta = remove + d(c, s0) + d(s1, e) - d(c, e)
+                    last = s1 if j == n - seg_len else last_rest
+                    delta += d(last, home) - d(nodes[-1], home)
+                    if delta < -EPS:
+                        rest = nodes[:i] + nodes[i + seg_len:]
+                        cand = rest[:j] + nodes[i:i + seg_len] + rest[j:]
+                        lo, hi = min(i, j), max(i, j) + seg_len
+                        if r.splice_feasible(lo, cand[lo:hi], hi):
+                            r.set(cand)
+                            moved = True
+                            break
+                i += 1
+        return moved
+
+    # --------- rotalar arası ----------
+    def _relocate(self, a: _Route, b: _Route) -> bool:
+        d, moved = self.d, False
+        i = 0
+        while i < len(a.nodes):
+            v = a.nodes[i]
+            if self.weight[v] > b.max_w:
+                i += 1
+                continue
+            p, q = a.ext[i], a.ext[i + 2]
+            last_a = a.last_after_removal(i, i + 1)
+            gain_a = (d(p, v) + d(v, q) - d(p, q)
+                      + d(a.nodes[-1], a.home) - d(last_a, a.home))
+            done = False
+            nb = len(b.nodes)
+            for j in range(nb + 1):
+                c, e = b.ext[j], b.ext[j + 1]
+                cost_b = d(c, v) + d(v, e) - d(c, e)
+                if j == nb:
+                    cost_b += d(v, b.home) - d(c, b.home)
+                if gain_a - cost_b > EPS and a.splice_feasible(i, [], i + 1) \
+                        and b.splice_feasible(j, [v], j):
+                    b.set(b.nodes[:j] + [v] + b.nodes[j:])
+                    a.set(a.nodes[:i] + a.nodes[i + 1:])
+                    moved = done = True
+                    break
+            if not done:
+                i += 1
+        return moved
+
+    def _exchange(self, a: _Route, b: _Route) -> bool:
+        d, moved = self.d, False
+        na, nb = len(a.nodes), len(b.nodes)
+        for i in range(na):
+            for j in range(nb):
+                u, v = a.nodes[i], b.nodes[j]
+                pa, qa, pb, qb = a.ext[i], a.ext[i + 2], b.ext[j], b.ext[j + 2]
+                delta = (d(pa, v) + d(v, qa) - d(pa, u) - d(u, qa)
+                         + d(pb, u) + d(u, qb) - d(pb, v) - d(v, qb))
+                if i == na - 1:
+                    delta += d(v, a.home) - d(u, a.home)
+                if j == nb - 1:
+                    delta += d(u, b.home) - d(v, b.home)
+                if delta < -EPS and self.weight[v] <= a.max_w and self.weight[u] <= b.max_w \
+                        and a.splice_feasible(i, [v], i + 1) and b.splice_feasible(j, [u], j + 1):
+                    a.set(a.nodes[:i] + [v] + a.nodes[i + 1:])
+                    b.set(b.nodes[:j] + [u] + b.nodes[j + 1:])
+                    moved = True
+        return moved
@@ -1,26 +1,65 @@
 # src/metrics.py
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence
+import numpy as np
 from models import Drone, Delivery, NoFlyZone
 from graph import haversine, intersects_nfz, build_nfz_polygons
+from distance import DistanceMatrix
+from nfz import NFZIndex
+from instance import ProblemInstance
+from batch import TimedLegs, pack_routes, METRE_PER_WH, TAKEOFF_MIN
 
 def route_metrics(drone: Drone,
                   deliveries: List[Delivery],
                   route_ids: List[int],
-                  zones: List[NoFlyZone]) -> Dict[str, float]:
-    """Tek drone için mesafe (km), enerji (Wh), süre (dk), gecikme (dk), NFZ_ihlali(bool)."""
-    id2del = {d.id: d for d in deliveries}
-    polygons = build_nfz_polygons(zones)
+                  zones: List[NoFlyZone],
+                  dm: Optional[DistanceMatrix] = None,
+                  nfz: Optional[NFZIndex] = None,
+                  inst: Optional[ProblemInstance] = None) -> Dict[str, float]:
+    """Tek drone için mesafe (km), enerji (Wh), süre (dk), gecikme (dk), NFZ_ihlali(bool).
+       dm verilirse bacak mesafeleri matristen okunur ve NFZ'ler yalnızca
+       active_time içinde uçulan bacaklarda ihlal sayılır; senaryo başına bir
+       kez kurulan nfz (NFZIndex) da verilmelidir (yoksa ValueError).
+       inst (ProblemInstance) verilirse dm = inst.dm olur; teslimatlar ve
+       son teslim saatleri derlenmiş dizilerden okunur (deliveries kullanılmaz)."""
+    if inst is not None:
+        dm = inst.dm
+        idx_of, deadline_of = inst.id2node_list, inst.win_end_list
+    else:
+        id2del = {d.id: d for d in deliveries}
+    if dm is not None and nfz is None:
+        raise ValueError("dm / inst ile birlikte nfz (NFZIndex) verilmeli — "
+                         "rota başına O(N²) NFZ matrisi kurulmaz")
+    polygons = build_nfz_polygons(zones) if dm is None else None
 
     dist_m, late_min = 0.0, 0.0
     pos = drone.start_pos
+    home = prev = dm.drone_index[drone.id] if dm is not None else None
     time = 8 * 60                       # dakikada
     NFZ_hit = False
 
     for rid in route_ids:
+        if inst is not None:            # derlenmiş yol: nesne / dize yok
+            idx = idx_of[rid]
+            seg = dm.distance(prev, idx)
+            if nfz.blocked_at(prev, idx, time, time + seg / drone.speed / 60):
+                NFZ_hit = True
+            prev = idx
+            dist_m += seg
+            time   += seg / drone.speed / 60
+            if time > deadline_of[idx]:
+                late_min += time - deadline_of[idx]
+            continue
         nxt = id2del[rid]
-        seg = haversine(pos, nxt.pos)
-        if intersects_nfz(pos, nxt.pos, polygons):
-            NFZ_hit = True
+        if dm is None:
+            seg = haversine(pos, nxt.pos)
+            if intersects_nfz(pos, nxt.pos, polygons):
+                NFZ_hit = True
+        else:
+            idx = dm.del_index[rid]
+            seg = dm.distance(prev, idx)
+            if nfz.blocked_at(prev, idx, time, time + seg / drone.speed / 60):
+                NFZ_hit = True
+            prev = idx
         dist_m += seg
         time   += seg / drone.speed / 60
         deadline = int(nxt.time_window[1][:2]) * 60 + int(nxt.time_window[1][3:])
@@ -29,9 +68,14 @@ def route_metrics(drone: Drone,
         pos = nxt.pos
 
     # dönüş
-    seg = haversine(pos, drone.start_pos)
-    if intersects_nfz(pos, drone.start_pos, polygons):
-        NFZ_hit = True
+    if dm is None:
+        seg = haversine(pos, drone.start_pos)
+        if intersects_nfz(pos, drone.start_pos, polygons):
+            NFZ_hit = True
+    else:
+        seg = dm.distance(prev, home)
+        if nfz.blocked_at(prev, home, time, time + seg / drone.speed / 60):
+            NFZ_hit = True
     dist_m += seg
     time   += seg / drone.speed / 60
 
@@ -43,3 +87,140 @@ def route_metrics(drone: Drone,
         late_min    = late_min,
         nfz_violate = NFZ_hit
     )
+
+
+# ---- Filo düzeyi (vektörel) ------------------------------------------------
+# Öncelik → hizmet ağırlığı (1 = yüksek); indeks 0 depo / boş düğüm
+PRIORITY_WEIGHT = np.array([0.0, 3.0, 2.0, 1.0])
+COLUMNS = ("distance_km", "energy_wh", "total_min", "late_min", "nfz_violate",
+           "deliveries", "on_time", "service", "feasible")
+
+
+class FleetMetrics:
+    """Tüm drone'lar × çok sayıda çözüm için metrikler tek vektörel geçişte.
+       Çözümler (P kromozom, sözlük ya da ArrayChrom) batch.pack_routes ile
+       (P, D, L) düğüm dizisine paketlenir; tanımlar route_metrics'in dm yolu
+       ile aynıdır. Ek sütunlar:
+       deliveries / on_time : durak sayısı / pencere içinde varılan durak sayısı
+       service              : pencere içi durakların öncelik ağırlığı toplamı
+       feasible             : rota CSP kısıtlarını (ağırlık, batarya, pencere,
+                              NFZ) sağlıyor mu — GA fitness'ı ile aynı ölçüt
+       Bellek, en fazla `chunk` çözümlük parçalarla sınırlanır."""
+
+    def __init__(self, inst: ProblemInstance, nfz: Optional[NFZIndex] = None,
+                 zones: Sequence[NoFlyZone] = (), chunk: int = 256):
+        self.inst = inst
+        self.nfz = nfz if nfz is not None else NFZIndex(inst.dm.coords, list(zones))
+        self.chunk = chunk
+        self.drone_ids = list(inst.drone_pos)
+        self.timed = TimedLegs(self.nfz, len(inst.dm))
+        self.service_weight = PRIORITY_WEIGHT[np.clip(inst.priority, 0, 3)]
+        self.total_service = float(self.service_weight.sum())
+
+    def compute(self, solutions) -> Dict[str, np.ndarray]:
+        """COLUMNS → (P, D) diziler (D: drone sırası self.drone_ids)."""
+        solutions = list(solutions)
+        parts = [self._compute(pack_routes(solutions[s:s + self.chunk], self.drone_ids,
+                                           self.inst.id2node))
+                 for s in range(0, len(solutions), self.chunk)]
+        if not parts:
+            return {c: np.zeros((0, len(self.drone_ids))) for c in COLUMNS}
+        return {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+
+    def _compute(self, idx: np.ndarray) -> Dict[str, np.ndarray]:
+        inst, nfz = self.inst, self.nfz
+        P, D, L = idx.shape
+        dist = inst.dm.dist
+        home = inst.home[None, :, None]
+        speed = inst.speed[None, :, None]
+
+        valid = idx >= 0
+        lens = valid.sum(axis=2)
+        node = np.where(valid, idx, home)
+        prev = np.concatenate([np.broadcast_to(home, (P, D, 1)), node[:, :, :-1]], axis=2)
+        leg = np.where(valid, dist[prev, node].astype(np.float64), 0.0)
+        last = np.take_along_axis(node, np.maximum(lens - 1, 0)[:, :, None], axis=2)[:, :, 0]
+        last = np.where(lens > 0, last, inst.home[None, :])
+        home2 = np.broadcast_to(inst.home[None, :], (P, D))
+        back = dist[last, home2].astype(np.float64)
+
+        # route_metrics'teki ardışık += ile aynı toplama sırası
+        dist_m = np.add.accumulate(np.concatenate([leg, back[:, :, None]], axis=2), axis=2)[:, :, -1]
+        t0 = np.full((P, D, 1), float(TAKEOFF_MIN))
+        clock = np.add.accumulate(np.concatenate([t0, leg / speed / 60], axis=2), axis=2)
+        arrive = clock[:, :, 1:]
+        t_last = np.take_along_axis(clock, lens[:, :, None], axis=2)[:, :, 0]
+        t_home = t_last + back / inst.speed[None, :] / 60
+
+        we = inst.win_end[node]
+        late = np.where(valid & (arrive > we), arrive - we, 0.0)
+        late_min = np.add.accumulate(np.concatenate([np.zeros((P, D, 1)), late], axis=2),
+                                     axis=2)[:, :, -1]
+        in_window = valid & (inst.win_start[node] <= arrive) & (arrive <= we)
+
+        # NFZ: sabit bloklar + saatli bacaklar uçuş anında
+        nfz_hit = (valid & nfz.blocked[prev, node]).any(axis=2) | nfz.blocked[last, home2]
+        if len(self.timed):
+            p, d, t = np.nonzero(valid & nfz.timed[prev, node])
+            hit = self.timed.hit(prev[p, d, t], node[p, d, t], clock[p, d, t], clock[p, d, t + 1])
+            nfz_hit[p[hit], d[hit]] = True
+            p, d = np.nonzero(nfz.timed[last, home2])
+            hit = self.timed.hit(last[p, d], home2[p, d], t_last[p, d], t_home[p, d])
+            nfz_hit[p[hit], d[hit]] = True
+
+        # CSP uygunluğu (batch.BatchEvaluator ile aynı kısıtlar)
+        energy = leg / METRE_PER_WH
+        cap = np.broadcast_to(inst.battery[None, :, None], (P, D, 1))
+        battery = np.subtract.accumulate(np.concatenate([cap, energy], axis=2), axis=2)
+        bat_last = np.take_along_axis(battery, lens[:, :, None], axis=2)[:, :, 0]
+        fail = valid & ((inst.weight[node] > inst.max_weight[None, :, None])
+                        | (energy > battery[:, :, :-1]) | ~in_window)
+        feasible = ~(fail.any(axis=2) | (back / METRE_PER_WH > bat_last) | nfz_hit)
+
+        return dict(
+            distance_km=dist_m / 1000,
+            energy_wh=dist_m / METRE_PER_WH,
+            total_min=t_home - TAKEOFF_MIN,
+            late_min=late_min,
+            nfz_violate=nfz_hit,
+            deliveries=lens,
+            on_time=in_window.sum(axis=2),
+            service=np.where(in_window, self.service_weight[node], 0.0).sum(axis=2),
+            feasible=feasible,
+        )
+
+    def table(self, solutions, labels: Optional[Sequence] = None) -> Dict[str, np.ndarray]:
+        """Satır başına (çözüm, drone) düz sütunlar — pandas.DataFrame'e doğrudan verilebilir."""
+        cols = self.compute(solutions)
+        P, D = cols["distance_km"].shape
+        labels = np.asarray(list(labels) if labels is not None else range(P))
+        return {"solution": np.repeat(labels, D), "drone": np.tile(self.drone_ids, P),
+                **{c: v.ravel() for c, v in cols.items()}}
+
+    def summary(self, solutions, labels: Optional[Sequence] = None) -> Dict[str, np.ndarray]:
+        """Çözüm başına filo toplamları (çok sayıda GA koşusu / tohum karşılaştırması)."""
+        cols = self.compute(solutions)
+        P = len(cols["distance_km"])
+        return {
+            "solution": np.asarray(list(labels) if labels is not None else range(P)),
+            "distance_km": cols["distance_km"].sum(axis=1),
+            "energy_wh": cols["energy_wh"].sum(axis=1),
+            "makespan_min": cols["total_min"].max(axis=1, initial=0.0),
+            "late_min": cols["late_min"].sum(axis=1),
+            "nfz_violations": cols["nfz_violate"].sum(axis=1),
+            "deliveries": cols["deliveries"].sum(axis=1),
+            "on_time": cols["on_time"].sum(axis=1),
+            "service_rate": cols["service"].sum(axis=1) / self.total_service
+            if self.total_service else np.zeros(P),
+            "feasible": cols["feasible"].all(axis=1),
+        }
+
+
+def fleet_metrics(ga, solutions) -> Dict[str, np.ndarray]:
+    """GAOptimizer senaryosunda çözümlerin (P, D) metrik sütunları."""
+    return FleetMetrics(ga.inst, ga.nfz).compute(solutions)
+
+
+def compare_runs(ga, runs: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """{etiket: en iyi kromozom} (ör. farklı tohumlar / ayarlar) → çözüm başına özet."""
+    return FleetMetrics(ga.inst, ga.nfz).summary(list(runs.values()), labels=list(runs))
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Tuple, List
 
 
-@dataclass
+@dataclass(slots=True)
 class Drone:
     """Teslimat dronu temel modeli."""
     id: int
@@ -12,7 +12,7 @@ class Drone:
     start_pos: Tuple[float, float]  # (lat, lon)
 
 
-@dataclass
+@dataclass(slots=True)
 class Delivery:
     """Tek bir teslimat görevi."""
     id: int
@@ -22,9 +22,19 @@ class Delivery:
     time_window: Tuple[str, str]  # ("HH:MM", "HH:MM")
 
 
-@dataclass
+@dataclass(slots=True)
 class NoFlyZone:
     """Uçuşa yasak bölge (çokgen)."""
     id: int
     coordinates: List[Tuple[float, float]]  # [(lat, lon), …]
     active_time: Tuple[str, str]            # ("HH:MM", "HH:MM")
+
+
+def hhmm_to_min(s: str) -> int:
+    """"HH:MM" → gün içi dakika (örn. "08:30" ➔ 510)."""
+    return int(s[:2]) * 60 + int(s[3:])
+
+
+def min_to_hhmm(m: int) -> str:
+    """Gün içi dakika → "HH:MM" (hhmm_to_min'in tersi)."""
+    return f"{int(m) // 60:02d}:{int(m) % 60:02d}"
@@ -0,0 +1,144 @@
+"""
+Toplu, zamana duyarlı NFZ uygunluk indeksi (senaryo başına bir kez):
+• Poligonlar Shapely 2 STRtree içinde; tüm düğüm çiftleri vektörel
+  `query(..., predicate="intersects")` ile tek seferde test edilir
+• Tüm gün aktif bölgeler    → `blocked` boolean matrisi (kalıcı kapalı bacak)
+• Saatli bölgeler (active_time) → kenar başına birleştirilmiş yasak aralıkları
+  (dakika); sorgu (blocked_at) O(1) + aralık sayısı kadar karşılaştırma
+Not: graph.intersects_nfz'deki seyrek örnekleme, çizgi poligonu kesmiyorsa
+     hiçbir örnek noktası da poligon içinde olamayacağı için sonucu değiştirmez;
+     dolayısıyla tam `intersects` testi aynı cevabı verir.
+"""
+from typing import Dict, List, Tuple
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import Polygon
+from models import NoFlyZone, hhmm_to_min
+from distance import grow_square
+
+DAY_MIN = 24 * 60
+
+
+def zone_intervals(zone: NoFlyZone) -> Tuple[Tuple[int, int], ...]:
+    """active_time → dakika aralıkları; gece yarısını aşan pencere ikiye bölünür."""
+    start, end = (hhmm_to_min(t) for t in zone.active_time)
+    if start <= end:
+        return ((start, end),)
+    return ((start, DAY_MIN), (0, end))
+
+
+def _is_all_day(intervals: Tuple[Tuple[int, int], ...]) -> bool:
+    # "00:00"–"23:59" tüm gün sayılır
+    return any(s <= 0 and e >= DAY_MIN - 1 for s, e in intervals)
+
+
+def _merge(intervals: List[Tuple[int, int]]) -> Tuple[Tuple[int, int], ...]:
+    out: List[Tuple[int, int]] = []
+    for s, e in sorted(intervals):
+        if out and s <= out[-1][1]:
+            out[-1] = (out[-1][0], max(out[-1][1], e))
+        else:
+            out.append((s, e))
+    return tuple(out)
+
+
+class NFZIndex:
+    """coords sırasındaki (DistanceMatrix.coords) düğüm çiftleri için NFZ indeksi."""
+
+    def __init__(self, coords: np.ndarray, zones: List[NoFlyZone], block: int = 256):
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(coords)
+        self._init_zones(zones)
+
+        self.blocked = np.zeros((n, n), dtype=bool)   # kalıcı (tüm gün) kapalı
+        self.timed = np.zeros((n, n), dtype=bool)     # saatli bölge kesiyor
+        self.windows: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = {}
+
+        self._scan(coords, 0, block)
+
+        self._item = self.blocked.item
+        self._timed = self.timed.item
+        self._bufs = (self.blocked, self.timed)   # extend() için kapasite tamponları
+
+    @classmethod
+    def from_arrays(cls, zones: List[NoFlyZone], blocked: np.ndarray, timed: np.ndarray,
+                    windows: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]) -> "NFZIndex":
+        """Önceden hesaplanmış matrisleri (ör. paylaşımlı bellek) yeniden hesaplamadan sarmalar."""
+        self = cls.__new__(cls)
+        self._init_zones(zones)
+        self.blocked, self.timed, self.windows = blocked, timed, windows
+        self._item = self.blocked.item
+        self._timed = self.timed.item
+        self._bufs = (blocked, timed)
+        return self
+
+    def _init_zones(self, zones):
+        self.zones = zones
+        self.polygons = tuple(Polygon(z.coordinates) for z in zones)
+        self.tree = STRtree(self.polygons)
+        self.intervals = [zone_intervals(z) for z in zones]
+        self.permanent = np.array([_is_all_day(iv) for iv in self.intervals], dtype=bool)
+
+    def _scan(self, coords: np.ndarray, start: int, block: int = 256):
+        """coords[start:] düğümlerini kendilerinden önceki tüm düğümlere karşı test eder."""
+        if not self.polygons:
+            return
+        n = len(coords)
+        hits: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # Köşegen: düğümün kendisi bir NFZ içinde mi (boş rota: depo → depo)
+        k, z = self.tree.query(shapely.points(coords[start:]), predicate="intersects")
+        self._mark(k + start, k + start, z, hits)
+        # Alt üçgen (j < i), satır blokları halinde
+        for s in range(start, n, block):
+            rows = np.arange(s, min(s + block, n))
+            ii, jj = np.nonzero(rows[:, None] > np.arange(n)[None, :])
+            ii = rows[ii]
+            if len(ii) == 0:
+                continue
+            segs = np.stack([coords[ii], coords[jj]], axis=1)     # (m, 2, 2)
+            k, z = self.tree.query(shapely.linestrings(segs), predicate="intersects")
+            self._mark(ii[k], jj[k], z, hits)
+
+        for (i, j), ivs in hits.items():
+            self.windows[(i, j)] = self.windows[(j, i)] = _merge(ivs)
+
+    def extend(self, coords: np.ndarray, block: int = 256):
+        """coords (tüm düğümler, DistanceMatrix.coords) yeni düğümlerle uzadığında
+           yalnızca yeni satır / sütunları hesaplar."""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n, new_n = len(self.blocked), len(coords)
+        self._bufs = tuple(grow_square(b, n, new_n) for b in self._bufs)
+        for b in self._bufs:
+            b[n:new_n, :new_n] = False
+            b[:new_n, n:new_n] = False
+        self.blocked, self.timed = (b[:new_n, :new_n] for b in self._bufs)
+        self._scan(coords, n, block)
+        self._item = self.blocked.item
+        self._timed = self.timed.item
+
+    def _mark(self, ii, jj, z, hits):
+        perm = self.permanent[z]
+        self.blocked[ii[perm], jj[perm]] = True
+        self.blocked[jj[perm], ii[perm]] = True
+        for i, j, zi in zip(ii[~perm].tolist(), jj[~perm].tolist(), z[~perm].tolist()):
+            self.timed[i, j] = self.timed[j, i] = True
+            hits.setdefault((i, j), []).extend(self.intervals[zi])
+
+    # --------- sorgular -----------------------------------------------
+    def crosses(self, i: int, j: int) -> bool:
+        """i → j bacağı tüm gün aktif bir NFZ poligonunu kesiyor mu?"""
+        return self._item(i, j)
+
+    def blocked_at(self, i: int, j: int, t0: float, t1: float = None) -> bool:
+        """[t0, t1] dakikaları arasında uçulan i → j bacağı aktif bir NFZ'yi kesiyor mu?"""
+        if self._item(i, j):
+            return True
+        if not self._timed(i, j):
+            return False
+        if t1 is None:
+            t1 = t0
+        for s, e in self.windows[(i, j)]:
+            if s <= t1 and t0 <= e:
+                return True
+        return False
@@ -0,0 +1,111 @@
+"""
+Süreç havuzunda paralel fitness değerlendirmesi:
+• Senaryo (drone'lar, teslimatlar, NFZ'ler) işçilere yalnızca bir kez,
+  havuz başlatılırken gönderilir
+• Büyük matrisler (mesafe, NFZ) multiprocessing.shared_memory üzerinden
+  paylaşılır; işçiler kopyalamadan aynı belleğe bağlanır
+• Her görevde yalnızca kromozom gider, skor döner; Pool.map sırayı korur,
+  rastgelelik ana süreçte kaldığı için aynı tohum → aynı sonuç
+"""
+import math
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from distance import DistanceMatrix
+from nfz import NFZIndex
+
+# İşçi süreç durumu (havuz başlatıcısı doldurur)
+_WORKER = {}
+# İşçideki GAOptimizer'a aynen aktarılan kurucu parametreleri (yeni bayrak buraya);
+# detour aktarılmaz: paylaşılan dm / nfz zaten sapma uygulanmış hâldedir
+WORKER_FLAGS = ("cache_size", "encoding", "batch", "local_search", "ls_passes", "prune")
+
+
+def ga_flags(ga) -> Dict:
+    return {k: getattr(ga, k) for k in WORKER_FLAGS}
+
+
+class SharedScenario:
+    """GAOptimizer'ın senaryo verisini paylaşımlı belleğe yayınlar.
+
+    `spec` picklable'dır; işçide attach_scenario(spec) ile açılır.
+    """
+
+    def __init__(self, ga):
+        self._owned: List[shared_memory.SharedMemory] = []
+        self.spec = dict(
+            ga_cls=type(ga),
+            drones=ga.drones,
+            deliveries=ga.deliveries,
+            zones=ga.zones,
+            # artımlı güncellemelerden sonra düğüm sırası drone'lar + teslimatlar olmayabilir
+            index=(ga.dm.drone_index, ga.dm.del_index, ga.dm.coords),
+            windows=ga.nfz.windows,
+            dist=self._share(np.ascontiguousarray(ga.dm.dist)),
+            blocked=self._share(ga.nfz.blocked),
+            timed=self._share(ga.nfz.timed),
+            ga_kwargs=ga_flags(ga),
+        )
+
+    def _share(self, arr: np.ndarray) -> Tuple[str, tuple, str]:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        self._owned.append(shm)
+        return shm.name, arr.shape, arr.dtype.str
+
+    def close(self):
+        for shm in self._owned:
+            shm.close()
+            shm.unlink()
+        self._owned.clear()
+
+
+def _attach(spec: Tuple[str, tuple, str], keep: Optional[list] = None) -> np.ndarray:
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    # referansı canlı tut (keep verilirse çağıran sahiplenir, bırakınca kapanır)
+    (keep if keep is not None else _WORKER.setdefault("shm", [])).append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def attach_scenario(spec: dict, keep: Optional[list] = None, **ga_kwargs):
+    """İşçi tarafı: paylaşımlı matrisleri kopyalamadan kullanan bir GAOptimizer kurar."""
+    dm = DistanceMatrix.from_array(spec["drones"], spec["deliveries"], _attach(spec["dist"], keep))
+    dm.drone_index, dm.del_index, dm.coords = spec["index"]
+    nfz = NFZIndex.from_arrays(spec["zones"], _attach(spec["blocked"], keep),
+                               _attach(spec["timed"], keep), spec["windows"])
+    return spec["ga_cls"](spec["drones"], spec["deliveries"], None, spec["zones"],
+                          dm=dm, nfz=nfz, **{**spec["ga_kwargs"], **ga_kwargs})
+
+
+def _init_worker(spec):
+    _WORKER["ga"] = attach_scenario(spec)
+
+
+def _score(chrom: Dict[int, List[int]]) -> float:
+    return _WORKER["ga"].fitness(chrom)
+
+
+class PoolEvaluator:
+    """GAOptimizer için paralel fitness; `with` bloğu içinde kullanılır."""
+
+    def __init__(self, ga, workers: int):
+        self.workers = workers
+        self.shared = SharedScenario(ga)
+        self.pool = mp.Pool(workers, initializer=_init_worker, initargs=(self.shared.spec,))
+
+    def map(self, chroms: List[Dict[int, List[int]]]) -> List[float]:
+        chunk = max(1, math.ceil(len(chroms) / (self.workers * 4)))
+        return self.pool.map(_score, chroms, chunksize=chunk)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,17 +1,8 @@
-from pathlib import Path
-import json
-from models import Drone, Delivery, NoFlyZone
+from scenario_io import load_scenario
 from graph import build_graph
 from astar import astar
 
-# --- JSON'ları oku ---
-def load_json(path, cls):
-    with open(path, encoding="utf-8") as f:
-        return [cls(**obj) for obj in json.load(f)]
-
-drones     = load_json(Path("data/drones_s1.json"),     Drone)
-deliveries = load_json(Path("data/deliveries_s1.json"), Delivery)
-zones      = load_json(Path("data/nofly_s1.json"),      NoFlyZone)
+drones, deliveries, zones = load_scenario("s1")
 
 g = build_graph(drones, deliveries, zones)
 
@@ -0,0 +1,40 @@
+# src/quick_test_batch.py
+"""Toplu (batch.py) ve skaler (GAOptimizer.fitness) değerlendirmenin birebir eşitliği."""
+import random
+import time
+from models import Delivery, NoFlyZone
+from scenario_io import load_scenario
+from ga import GAOptimizer
+
+
+drones, deliveries, zones = load_scenario("s1")
+
+# Zaman penceresi / saatli NFZ dallarını da çalıştırmak için varyantlar
+rnd = random.Random(7)
+tight = [Delivery(d.id, d.pos, d.weight, d.priority,
+                  (f"08:{rnd.randint(0, 9):02d}", f"{rnd.randint(8, 11):02d}:{rnd.randint(20, 59):02d}"))
+         for d in deliveries]
+timed = [NoFlyZone(z.id, z.coordinates, ("08:05", "08:20")) for z in zones]
+
+for name, dels, zs in [("örnek", deliveries, zones),
+                       ("NFZ'siz", deliveries, []),
+                       ("dar pencere", tight, []),
+                       ("saatli NFZ", deliveries, timed)]:
+    for enc in ("dict", "array"):
+        ga = GAOptimizer(drones, dels, None, zs, encoding=enc, batch=True)
+        pop = [ga.random_chromosome() for _ in range(200)]
+        scored, nxt = ga.evolve(pop, 3, ga.evaluate)      # uygun bireyler de olsun
+        pop += nxt
+
+        ga.route_score.cache_clear()                      # adil kıyas: önbelleksiz
+        t = time.perf_counter()
+        scalar = [ga.fitness(c) for c in pop]
+        t_scalar = time.perf_counter() - t
+        t = time.perf_counter()
+        batched = ga.evaluate(pop)
+        t_batch = time.perf_counter() - t
+
+        assert batched == scalar, f"{name}/{enc}: toplu ve skaler skorlar farklı"
+        feasible = sum(s > float("-inf") for s in scalar)
+        print(f"{name:12s} {enc:5s} ✔ {len(pop)} kromozom ({feasible} uygun)  "
+              f"skaler {t_scalar*1000:.1f} ms • toplu {t_batch*1000:.1f} ms")
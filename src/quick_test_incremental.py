@@ -0,0 +1,48 @@
+# src/quick_test_incremental.py
+"""Artımlı yeniden planlama (add / remove + reoptimize): her adımdan sonra en iyi
+   çözümde ve sıcak başlangıç popülasyonunda her teslimat tam bir kez yer alır."""
+import dataclasses
+import random
+from collections import Counter
+from scenario_io import load_scenario
+from ga import GAOptimizer
+
+
+drones, deliveries, zones = (list(x) for x in load_scenario("s1"))
+rnd = random.Random(3)
+
+
+def check(step, ga, best):
+    expected = Counter(d.id for d in ga.deliveries)
+    got = Counter(r for route in best.values() for r in route)
+    assert got == expected, f"{step}: {sum(got.values())} durak, {len(expected)} teslimat"
+    for chrom in ga.population:
+        pc = Counter(r for route in ga.to_dict(chrom).values() for r in route)
+        assert pc == expected, f"{step}: popülasyonda tekrarlanan / eksik teslimat"
+    print(f"{step:24s} ✔ {len(expected)} teslimat tam bir kez, {len(ga.drones)} drone")
+
+
+for enc in ("dict", "array"):
+    # NFZ'siz s1 + yerel arama: rota uzunlukları değişir (onarımın zor hâli)
+    ga = GAOptimizer(drones, deliveries, None, [], pop_size=30, generations=30,
+                     local_search=2, encoding=enc)
+    ga.rand.seed(1)
+    _, best = ga.run()
+    check(f"{enc}: ilk çözüm", ga, best)
+
+    new = [dataclasses.replace(rnd.choice(deliveries), id=100 + i) for i in range(1, 6)]
+    ga.add_deliveries(new)
+    _, best = ga.reoptimize(time_budget=0.3)
+    check(f"{enc}: +5 teslimat", ga, best)
+
+    ga.remove_deliveries([new[0].id, deliveries[0].id])
+    _, best = ga.reoptimize(time_budget=0.3)
+    check(f"{enc}: -2 teslimat", ga, best)
+
+    ga.remove_drones([drones[-1].id])
+    _, best = ga.reoptimize(time_budget=0.3)
+    check(f"{enc}: -1 drone", ga, best)
+
+    ga.add_drones([dataclasses.replace(drones[-1], id=99)])
+    _, best = ga.reoptimize(time_budget=0.3)
+    check(f"{enc}: +1 drone", ga, best)
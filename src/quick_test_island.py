@@ -0,0 +1,23 @@
+# src/quick_test_island.py
+"""Ada modeli: sonuç işçi sayısından bağımsız (bayraklar işçilere aktarılır) ve
+   geçerli — her teslimat çözümde tam bir kez yer alır."""
+from collections import Counter
+from scenario_io import load_scenario
+from ga import GAOptimizer
+
+
+drones, deliveries, zones = load_scenario("s1")
+expected = Counter(d.id for d in deliveries)
+
+# NFZ'siz s1 → sonlu skorlar, işçi sayısına bağlı farklılık görünür olsun
+for flags in (dict(local_search=2, ls_passes=2), dict(prune=True)):
+    runs = []
+    for workers in (1, 2):
+        ga = GAOptimizer(drones, deliveries, None, [], pop_size=30, generations=40, **flags)
+        fit, best = ga.run_islands(islands=2, migration_interval=5, workers=workers)
+        got = Counter(r for route in best.values() for r in route)
+        assert got == expected, f"{flags}, workers={workers}: {sum(got.values())} durak"
+        runs.append((fit, best))
+    assert runs[0] == runs[1], f"{flags}: workers=1 ve 2 farklı ({runs[0][0]}, {runs[1][0]})"
+    print(f"Ada modeli {flags}: workers=1 ve 2 → {runs[0][0]:,.2f}, "
+          f"{len(expected)} teslimat tam bir kez ✔")
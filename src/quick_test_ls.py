@@ -0,0 +1,23 @@
+# src/quick_test_ls.py
+"""Yerel arama (local_search) rota uzunluklarını değiştirir: onarım sonrası her
+   teslimat çözümde tam bir kez yer almalı (her iki kodlamada)."""
+from collections import Counter
+from scenario_io import load_scenario
+from ga import GAOptimizer
+
+
+drones, deliveries, zones = load_scenario("s1")
+expected = Counter(d.id for d in deliveries)
+
+
+def check(name, fit, best):
+    got = Counter(r for route in best.values() for r in route)
+    assert got == expected, f"{name}: {sum(got.values())} durak, {len(expected)} teslimat"
+    print(f"{name:28s} ✔ {len(expected)} teslimat tam bir kez, fitness={fit:,.2f}")
+
+
+# NFZ'siz s1 → uygun çözümler bulunur, çoğaltılmış teslimatlar skoru şişirirdi
+for enc in ("dict", "array"):
+    ga = GAOptimizer(drones, deliveries, None, [], pop_size=30, generations=40,
+                     local_search=2, ls_passes=2, encoding=enc)
+    check(f"local_search {enc}", *ga.run())
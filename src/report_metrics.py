@@ -1,34 +1,33 @@
 # src/report_metrics.py
-import json, pandas as pd
-from pathlib import Path
-from models import Drone, Delivery, NoFlyZone
+import pandas as pd
+from scenario_io import load_scenario
 from ga import GAOptimizer
 from graph import build_graph
-from metrics import route_metrics
+from metrics import FleetMetrics
+from distance import DistanceMatrix
+from nfz import NFZIndex
 
-def load(p, cls):
-    with open(p, encoding="utf-8") as f:
-        return [cls(**o) for o in json.load(f)]
-
-drones     = load(Path("data/drones_s1.json"),     Drone)
-deliveries = load(Path("data/deliveries_s1.json"), Delivery)
-zones      = load(Path("data/nofly_s1.json"),      NoFlyZone)
-g = build_graph(drones, deliveries, zones)
+drones, deliveries, zones = load_scenario("s1")
+dm  = DistanceMatrix(drones, deliveries)
+nfz = NFZIndex(dm.coords, zones)
+g = build_graph(drones, deliveries, zones, dm=dm, nfz=nfz)
 
 ga = GAOptimizer(
         drones, deliveries, g, zones,
+        dm=dm, nfz=nfz,
         pop_size=5,
         mutation_rate=0.2,
         generations=5)
 
 _, best = ga.run()
 
-rows = []
-for dr in drones:
-    m = route_metrics(dr, deliveries, best[dr.id], zones)
-    rows.append(dict(drone=dr.id, **m))
-
-df = pd.DataFrame(rows)
+# Tek vektörel geçiş: en iyi planın drone tablosu + son popülasyonun tamamı
+fm = FleetMetrics(ga.inst, nfz)
+df = pd.DataFrame(fm.table([best])).drop(columns="solution")
 print(df.to_string(index=False, float_format="%.2f"))
 
 print("\n⬤  NFZ ihlali var mı? :", df.nfz_violate.any())
+
+plans = pd.DataFrame(fm.summary(ga.population)).drop(columns="solution")
+print(f"\n⬤  Son popülasyon ({len(plans)} plan, {plans.feasible.sum()} uygun):")
+print(plans.describe().loc[["mean", "min", "max"]].to_string(float_format="%.2f"))
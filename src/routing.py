@@ -0,0 +1,178 @@
+"""
+Toplu en kısa yol motoru (NFZ ayıklanmış grafik üzerinde):
+• Grafik bir kez CSR dizilerine (indptr, indices, data) çevrilir
+• Her kaynak düğümden Dijkstra: scipy.sparse.csgraph varsa C hızında,
+  yoksa CSR üzerinde heapq + kapalı küme ile saf Python
+• Maliyet ve öncül (predecessor) matrisleri önbellekte tutulur:
+  maliyet sorgusu O(1), yol sorgusu O(yol uzunluğu)
+• one_to_many / many_to_many : toplu NumPy sorguları
+• distance_matrix()          : GA / metrics için NFZ'den kaçınan yol
+  maliyetlerini DistanceMatrix olarak verir (düz çizgi haversine yerine)
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import networkx as nx
+from models import Drone, Delivery
+from distance import DistanceMatrix
+from sparse_graph import SparseGraph
+
+try:                                       # isteğe bağlı hızlandırıcı
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _sp_dijkstra
+except ImportError:                        # pragma: no cover
+    csr_matrix = _sp_dijkstra = None
+
+NO_PRED = -9999                            # scipy ile aynı "öncül yok" işareti
+
+
+def to_csr(g, weight: str = "cost") -> Tuple[List, np.ndarray, np.ndarray, np.ndarray]:
+    """Yönsüz grafiği (düğümler, indptr, indices, data) CSR dizilerine çevirir.
+       SparseGraph zaten CSR'dır; dizileri kopyalanmadan kullanılır."""
+    if isinstance(g, SparseGraph):
+        return g.names, g.indptr, g.indices, g.data
+    names = list(g.nodes)
+    index = {n: i for i, n in enumerate(names)}
+    n = len(names)
+    src, dst, w = [], [], []
+    for u, v, d in g.edges(data=weight):
+        i, j = index[u], index[v]
+        src += (i, j)
+        dst += (j, i)
+        w += (d, d)
+    src = np.asarray(src, dtype=np.int64)
+    order = np.argsort(src, kind="stable")
+    indices = np.asarray(dst, dtype=np.int32)[order]
+    data = np.asarray(w, dtype=np.float64)[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return names, indptr, indices, data
+
+
+def _dijkstra_py(indptr, indices, data, source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Tek kaynaklı Dijkstra (scipy yoksa). Dönüş: (maliyet, öncül) satırları."""
+    n = len(indptr) - 1
+    dist = [float("inf")] * n
+    pred = [NO_PRED] * n
+    done = [False] * n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    ptr, idx, w = indptr.tolist(), indices.tolist(), data.tolist()
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue                       # eski (tekrar itilmiş) kayıt
+        done[u] = True
+        for k in range(ptr[u], ptr[u + 1]):
+            v = idx[k]
+            nd = d + w[k]
+            if nd < dist[v]:
+                dist[v], pred[v] = nd, u
+                heapq.heappush(heap, (nd, v))
+    return np.array(dist), np.array(pred, dtype=np.int32)
+
+
+class PathEngine:
+    """Önceden hesaplanmış tüm çiftler en kısa yol tablosu (nx.Graph ya da SparseGraph).
+
+    sources verilmezse tüm düğümler kaynak olur (depo + teslimat grafiği
+    için tipik durum). Grafik yönsüz olduğundan kaynak olmayan bir düğümden
+    sorgu, hedefin satırından simetrik olarak cevaplanır.
+    """
+
+    def __init__(self, g, sources: Optional[Iterable] = None, weight: str = "cost"):
+        self.names, indptr, indices, data = to_csr(g, weight)
+        self.index: Dict[str, int] = {n: i for i, n in enumerate(self.names)}
+        src = self.names if sources is None else list(sources)
+        self.src_row: Dict[int, int] = {self.index[s]: r for r, s in enumerate(src)}
+        rows = np.fromiter(self.src_row, dtype=np.int32, count=len(self.src_row))
+
+        if _sp_dijkstra is not None:
+            n = len(self.names)
+            csr = csr_matrix((data, indices, indptr), shape=(n, n))
+            cost, pred = _sp_dijkstra(csr, directed=True, indices=rows, return_predecessors=True)
+        else:
+            out = [_dijkstra_py(indptr, indices, data, int(s)) for s in rows]
+            cost = np.array([c for c, _ in out]).reshape(len(rows), -1)
+            pred = np.array([p for _, p in out], dtype=np.int32).reshape(len(rows), -1)
+        self.cost_matrix: np.ndarray = cost            # (kaynak, düğüm)
+        self.pred: np.ndarray = pred.astype(np.int32)  # (kaynak, düğüm)
+
+    # --------- tekil sorgular ----------
+    def _row(self, a: int, b: int) -> Tuple[int, int, bool]:
+        """(satır, sütun, ters_mi) — a kaynak değilse b'nin satırı kullanılır."""
+        r = self.src_row.get(a)
+        if r is not None:
+            return r, b, False
+        r = self.src_row.get(b)
+        if r is None:
+            raise KeyError(f"{self.names[a]} ve {self.names[b]} kaynak değil")
+        return r, a, True
+
+    def cost(self, a: str, b: str) -> float:
+        """a → b en kısa yol maliyeti (ulaşılamıyorsa inf) — O(1)."""
+        r, c, _ = self._row(self.index[a], self.index[b])
+        return float(self.cost_matrix[r, c])
+
+    def path(self, a: str, b: str) -> List[str]:
+        """a → b en kısa yol düğüm listesi — O(yol uzunluğu)."""
+        ia, ib = self.index[a], self.index[b]
+        r, c, rev = self._row(ia, ib)
+        if not np.isfinite(self.cost_matrix[r, c]):
+            raise ValueError(f"{b} düğümüne {a} düğümünden ulaşılamıyor")
+        pred = self.pred[r]
+        path = [c]
+        while pred[c] != NO_PRED:
+            c = int(pred[c])
+            path.append(c)
+        if not rev:
+            path.reverse()
+        return [self.names[i] for i in path]
+
+    def route_path(self, stops: Sequence[str]) -> Tuple[float, List[str]]:
+        """Ardışık duraklar için birleştirilmiş (maliyet, yol)."""
+        total, full = 0.0, [stops[0]]
+        for a, b in zip(stops, stops[1:]):
+            total += self.cost(a, b)
+            full += self.path(a, b)[1:]
+        return total, full
+
+    # --------- toplu sorgular ----------
+    def one_to_many(self, a: str, targets: Sequence[str]) -> np.ndarray:
+        """a'dan hedeflere maliyet vektörü."""
+        return self.many_to_many([a], targets)[0]
+
+    def many_to_many(self, sources: Sequence[str], targets: Sequence[str]) -> np.ndarray:
+        """(len(sources), len(targets)) maliyet matrisi; sources ya da targets
+           tümüyle kaynak olmalı (değilse KeyError)."""
+        si = [self.index[s] for s in sources]
+        ti = np.array([self.index[t] for t in targets], dtype=np.int64)
+        if all(i in self.src_row for i in si):
+            return self.cost_matrix[[self.src_row[i] for i in si]][:, ti]
+        if all(i in self.src_row for i in ti.tolist()):
+            return self.cost_matrix[[self.src_row[i] for i in ti.tolist()]][:, si].T   # simetri
+        raise KeyError(f"ne {list(sources)} ne {list(targets)} tümüyle kaynak değil")
+
+    def distance_matrix(self, drones: List[Drone], deliveries: List[Delivery]) -> DistanceMatrix:
+        """DistanceMatrix düğüm sırasıyla (drone'lar + teslimatlar) yol maliyetleri.
+           Tüm düğümlerin kaynak olması gerekir."""
+        names = [f"drone_{d.id}" for d in drones] + [f"del_{dlv.id}" for dlv in deliveries]
+        return DistanceMatrix.from_array(drones, deliveries, self.many_to_many(names, names))
+
+
+# ------------------- Hızlı test -----------------------------------
+if __name__ == "__main__":
+    import time
+    from graph import build_graph
+    from scenario_io import load_scenario
+
+    drones, deliveries, zones = load_scenario("s1")
+
+    g = build_graph(drones, deliveries, zones)
+    t = time.perf_counter()
+    eng = PathEngine(g)
+    print(f"{len(eng.names)} düğüm, tüm çiftler: {(time.perf_counter() - t)*1000:.1f} ms")
+    dm = eng.distance_matrix(drones, deliveries)
+    direct = DistanceMatrix(drones, deliveries).dist
+    detour = dm.dist > direct + 1e-6
+    print(f"NFZ yüzünden dolaşan çift sayısı: {int(detour.sum()) // 2}")
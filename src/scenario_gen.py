@@ -0,0 +1,209 @@
+"""
+Büyük ölçekli, vektörel senaryo üretici (benchmark için):
+• Çok depo      : drone'lar n_depots depoya dönüşümlü dağıtılır; kapasite,
+                  batarya ve hız drone başına değişir
+• Kümeli talep  : n_clusters talep merkezi, Dirichlet ağırlıklı (çarpık)
+                  yoğunluk + küme başına farklı yayılım; background oranı
+                  kadar teslimat tüm bölgeye düzgün dağılır
+• Zaman pencere : tight_share oranı 30–180 dk'lık dar pencere, kalanı
+                  08:00–20:00; öncelik ve ağırlık (log‑normal) rastgele
+• NFZ           : düzensiz (yıldız biçimli, basit) 5–12 köşeli çokgenler,
+                  depolardan uzakta; timed_share oranı saatli (gece yarısını
+                  aşabilir), kalanı tüm gün
+• Akış          : teslimat sütunları open_memmap ile doğrudan .scn dizinine
+                  CHUNK'lık parçalar halinde yazılır; Python nesnesi üretilmez
+• Tekrarlanabilir: parça b, SeedSequence(seed, spawn_key=(1, b)) ile
+                  üretilir — aynı GenConfig her zaman aynı senaryoyu verir
+Kullanım (proje kökünden):
+    PYTHONPATH=src python src/scenario_gen.py data/big.scn --deliveries 1000000 --drones 200
+"""
+import math
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
+import shapely
+from shapely import STRtree
+from data_generator import CENTER
+from distance import haversine_matrix
+from scenario_io import PathLike, column_path, write_meta
+
+CHUNK = 1 << 17            # teslimat parça boyu (sonuç buna bağlı; sabit tutulur)
+M_PER_DEG = 111_320.0      # 1° enlem ≈ metre
+DAY_START, DAY_END = 8 * 60, 20 * 60
+TIGHT_WIDTHS = np.array([30, 45, 60, 90, 120, 180])
+
+
+@dataclass
+class GenConfig:
+    n_deliveries: int = 100_000
+    n_drones: int = 200
+    n_depots: int = 8
+    n_zones: int = 40
+    n_clusters: int = 64
+    seed: int = 0
+    center: Tuple[float, float] = CENTER
+    span: float = 0.25                 # ± derece
+    background: float = 0.1            # kümesiz (düzgün) teslimat oranı
+    tight_share: float = 0.6           # dar pencereli teslimat oranı
+    timed_share: float = 0.3           # saatli NFZ oranı
+    zone_radius_m: Tuple[float, float] = (300.0, 1500.0)
+    avoid_zones: bool = True           # tüm gün NFZ içine düşen teslimatları yeniden örnekle
+
+
+# ---- Yardımcılar -----------------------------------------------------------
+def _rng(cfg: GenConfig, *key: int) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(cfg.seed, spawn_key=key))
+
+
+def _offset(center: np.ndarray, dy_m: np.ndarray, dx_m: np.ndarray) -> np.ndarray:
+    """Metre cinsinden (kuzey, doğu) kaydırma → (lat, lon) derece."""
+    lat = center[..., 0] + dy_m / M_PER_DEG
+    lon = center[..., 1] + dx_m / (M_PER_DEG * np.cos(np.radians(center[..., 0])))
+    return np.stack([lat, lon], axis=-1)
+
+
+def _uniform(cfg: GenConfig, rng: np.random.Generator, n: int) -> np.ndarray:
+    return np.asarray(cfg.center) + rng.uniform(-cfg.span, cfg.span, (n, 2))
+
+
+# ---- Küçük tablolar (bellekte) ---------------------------------------------
+def make_drone_columns(cfg: GenConfig, rng, depots: np.ndarray) -> Dict[str, np.ndarray]:
+    n = cfg.n_drones
+    return {
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "max_weight": rng.choice([3.0, 5.0, 8.0], n),
+        "battery_capacity": rng.uniform(1000, 2500, n).round(1),
+        "speed": rng.uniform(15, 25, n).round(1),
+        "start_pos": depots[np.arange(n) % len(depots)],
+    }
+
+
+def make_zone_columns(cfg: GenConfig, rng, depots: np.ndarray) -> Dict[str, np.ndarray]:
+    z = cfg.n_zones
+    r_lo, r_hi = cfg.zone_radius_m
+    radius = rng.uniform(r_lo, r_hi, z)
+    # Merkezler: depolara en az yarıçap + 200 m uzaklıkta (reddetme örneklemesi)
+    centres = _uniform(cfg, rng, z)
+    for _ in range(100):
+        bad = (haversine_matrix(centres, depots) < (radius + 200.0)[:, None]).any(axis=1)
+        if not bad.any():
+            break
+        centres[bad] = _uniform(cfg, rng, int(bad.sum()))
+
+    # Yıldız biçimli çokgen: açılar kesin artan → kendini kesmeyen halka
+    nv = rng.integers(5, 13, z)
+    offsets = np.zeros(z + 1, dtype=np.int64)
+    np.cumsum(nv, out=offsets[1:])
+    owner = np.repeat(np.arange(z), nv)
+    k = np.arange(offsets[-1]) - offsets[owner]
+    ang = 2 * np.pi * (k + rng.uniform(0.0, 0.8, len(k))) / nv[owner] + rng.uniform(0, 2 * np.pi, z)[owner]
+    r = radius[owner] * rng.uniform(0.55, 1.0, len(k))
+    vertices = _offset(centres[owner], r * np.sin(ang), r * np.cos(ang))
+
+    start = rng.integers(6 * 60, 22 * 60, z)
+    end = (start + rng.choice([60, 120, 180, 240], z)) % (24 * 60)
+    timed = rng.random(z) < cfg.timed_share
+    active = np.where(timed[:, None], np.stack([start, end], axis=1), [[0, 23 * 60 + 59]])
+    return {
+        "id": np.arange(1, z + 1, dtype=np.int64),
+        "active": active.astype(np.int16),
+        "vertices": vertices,
+        "offsets": offsets,
+    }
+
+
+def _permanent_tree(zones: Dict[str, np.ndarray]):
+    off, v = zones["offsets"], zones["vertices"]
+    polys = [shapely.polygons(v[a:b]) for a, b, (s, e) in
+             zip(off[:-1].tolist(), off[1:].tolist(), zones["active"].tolist())
+             if s <= 0 and e >= 24 * 60 - 1]
+    return STRtree(polys) if polys else None
+
+
+# ---- Teslimatlar (parça parça) ---------------------------------------------
+def _delivery_chunk(cfg: GenConfig, b: int, m: int, clusters, max_weight: float, tree) -> Dict:
+    rng = _rng(cfg, 1, b)
+    centres, sigma, p = clusters
+    c = rng.choice(len(p), m, p=p)
+    pos = _offset(centres[c], rng.normal(0, sigma[c]), rng.normal(0, sigma[c]))
+    bg = rng.random(m) < cfg.background
+    pos[bg] = _uniform(cfg, rng, int(bg.sum()))
+    if tree is not None and cfg.avoid_zones:
+        for _ in range(20):
+            inside, _ = tree.query(shapely.points(pos), predicate="intersects")
+            if not len(inside):
+                break
+            inside = np.unique(inside)
+            pos[inside] = _uniform(cfg, rng, len(inside))
+
+    weight = np.clip(rng.lognormal(math.log(1.2), 0.6, m), 0.1, max_weight).round(3)
+    priority = rng.choice(np.array([1, 2, 3], dtype=np.int8), m, p=[0.2, 0.5, 0.3])
+    tight = rng.random(m) < cfg.tight_share
+    start = rng.integers(DAY_START, DAY_END - 30, m)
+    end = np.minimum(start + rng.choice(TIGHT_WIDTHS, m), 24 * 60 - 1)
+    window = np.where(tight[:, None], np.stack([start, end], axis=1), [[DAY_START, DAY_END]])
+    return {"pos": pos, "weight": weight, "priority": priority,
+            "window": window.astype(np.int16)}
+
+
+def generate(cfg: GenConfig, path: PathLike) -> Path:
+    """cfg'ye göre senaryoyu .scn dizinine yazar (scenario_io.load_scenario ile açılır)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    rng = _rng(cfg, 0)
+    depots = _uniform(cfg, rng, cfg.n_depots)
+    drones = make_drone_columns(cfg, rng, depots)
+    zones = make_zone_columns(cfg, rng, depots)
+    clusters = (_uniform(cfg, rng, cfg.n_clusters),
+                rng.uniform(200, 1500, cfg.n_clusters),
+                rng.dirichlet(np.full(cfg.n_clusters, 0.5)))
+    for kind, cols in (("drones", drones), ("zones", zones)):
+        for name, arr in cols.items():
+            np.save(column_path(path, kind, name), np.ascontiguousarray(arr))
+
+    n = cfg.n_deliveries
+    shapes = {"id": ((n,), np.int64), "pos": ((n, 2), np.float64), "weight": ((n,), np.float64),
+              "priority": ((n,), np.int8), "window": ((n, 2), np.int16)}
+    out = {name: np.lib.format.open_memmap(column_path(path, "deliveries", name), mode="w+",
+                                           dtype=dt, shape=shape)
+           for name, (shape, dt) in shapes.items()}
+    tree = _permanent_tree(zones)
+    max_weight = float(drones["max_weight"].max()) if cfg.n_drones else 5.0
+    for b, s in enumerate(range(0, n, CHUNK)):
+        e = min(s + CHUNK, n)
+        out["id"][s:e] = np.arange(s + 1, e + 1)
+        for name, arr in _delivery_chunk(cfg, b, e - s, clusters, max_weight, tree).items():
+            out[name][s:e] = arr
+    for arr in out.values():
+        arr.flush()
+    del out
+
+    write_meta(path, {"drones": cfg.n_drones, "deliveries": n, "zones": cfg.n_zones},
+               {"drones": list(drones), "deliveries": list(shapes), "zones": list(zones)},
+               generator=asdict(cfg))
+    return path
+
+
+# ------------------- Komut satırı ---------------------------------------
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Büyük ölçekli .scn senaryosu üretir")
+    ap.add_argument("out")
+    opts = {"deliveries": "n_deliveries", "drones": "n_drones", "depots": "n_depots",
+            "zones": "n_zones", "clusters": "n_clusters", "seed": "seed", "span": "span",
+            "background": "background", "tight-share": "tight_share", "timed-share": "timed_share"}
+    defaults = {f.name: f.default for f in fields(GenConfig)}
+    for flag, name in opts.items():
+        ap.add_argument(f"--{flag}", dest=name, type=type(defaults[name]), default=defaults[name])
+    args = ap.parse_args(argv)
+    cfg = GenConfig(**{name: getattr(args, name) for name in opts.values()})
+    t = time.perf_counter()
+    path = generate(cfg, args.out)
+    print(f"✔  {cfg.n_deliveries} teslimat, {cfg.n_drones} drone, {cfg.n_zones} NFZ → "
+          f"{path} ({time.perf_counter() - t:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Senaryo giriş / çıkışı (tek ortak yükleyici):
+• JSON     : data/{drones,deliveries,nofly}_<ad>.json (data_generator.save_json)
+• İkili    : data/<ad>.scn/ dizini — her sütun ayrı .npy + meta.json
+             drones     : id, max_weight, battery_capacity, speed, start_pos (N,2)
+             deliveries : id, pos (N,2), weight, priority, window (N,2) dakika
+             zones      : id, active (Z,2) dakika, vertices (V,2) + offsets (Z+1)
+  Sütunlar np.load(mmap_mode="r") ile belleğe kopyalanmadan açılır
+• Records  : sütunlar üzerinde salt okunur dizi; Drone / Delivery / NoFlyZone
+             nesneleri yalnızca erişildiğinde (bir kez) üretilir.
+             DistanceMatrix gibi toplu kullanıcılar column() ile dizilere
+             doğrudan erişir, nesne hiç üretilmez
+• Dönüştürücü (proje kökünden):
+    PYTHONPATH=src python src/scenario_io.py to-bin s1
+    PYTHONPATH=src python src/scenario_io.py to-json data/s1.scn --name s1
+"""
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Union
+import numpy as np
+from models import Drone, Delivery, NoFlyZone, hhmm_to_min, min_to_hhmm
+from data_generator import DATA_DIR, save_json
+from distance import positions
+
+FORMAT_VERSION = 1
+JSON_FILES = {"drones": "drones_{}.json", "deliveries": "deliveries_{}.json",
+              "zones": "nofly_{}.json"}
+
+PathLike = Union[str, Path]
+
+
+# ---- JSON ------------------------------------------------------------------
+def load_json(path: PathLike, cls) -> list:
+    """JSON dizisi → dataclass listesi (eski kopyala‑yapıştır load/load_json)."""
+    with open(path, encoding="utf-8") as f:
+        return [cls(**o) for o in json.load(f)]
+
+
+# ---- Tembel kayıt dizisi ---------------------------------------------------
+class Records(Sequence):
+    """Sütun dizileri üzerinde dataclass dizisi; nesneler ilk erişimde üretilir."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], size: int,
+                 make: Callable[[Dict[str, np.ndarray], int], object]):
+        self.columns = columns
+        self._size = size
+        self._make = make
+        self._cache: List[object] = [None] * size
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        o = self._cache[i]
+        if o is None:
+            o = self._cache[i] = self._make(self.columns, i)
+        return o
+
+    def __repr__(self) -> str:
+        return f"Records({self._size} kayıt, sütunlar={list(self.columns)})"
+
+
+def _make_drone(c, i) -> Drone:
+    return Drone(id=c["id"][i].item(), max_weight=c["max_weight"][i].item(),
+                 battery_capacity=c["battery_capacity"][i].item(),
+                 speed=c["speed"][i].item(), start_pos=tuple(c["start_pos"][i].tolist()))
+
+
+def _make_delivery(c, i) -> Delivery:
+    s, e = c["window"][i].tolist()
+    return Delivery(id=c["id"][i].item(), pos=tuple(c["pos"][i].tolist()),
+                    weight=c["weight"][i].item(), priority=c["priority"][i].item(),
+                    time_window=(min_to_hhmm(s), min_to_hhmm(e)))
+
+
+def _make_zone(c, i) -> NoFlyZone:
+    a, b = c["offsets"][i:i + 2].tolist()
+    s, e = c["active"][i].tolist()
+    return NoFlyZone(id=c["id"][i].item(),
+                     coordinates=[tuple(p) for p in c["vertices"][a:b].tolist()],
+                     active_time=(min_to_hhmm(s), min_to_hhmm(e)))
+
+
+MAKERS = {"drones": _make_drone, "deliveries": _make_delivery, "zones": _make_zone}
+
+
+# ---- Nesne listesi → sütunlar ---------------------------------------------
+def to_columns(kind: str, items) -> Dict[str, np.ndarray]:
+    """Nesne listesi → sütun dizileri (ikili biçimin şeması)."""
+    if isinstance(items, Records):
+        return items.columns
+    if kind == "drones":
+        return {
+            "id": np.array([d.id for d in items], dtype=np.int64),
+            "max_weight": np.array([d.max_weight for d in items], dtype=np.float64),
+            "battery_capacity": np.array([d.battery_capacity for d in items], dtype=np.float64),
+            "speed": np.array([d.speed for d in items], dtype=np.float64),
+            "start_pos": positions(items, "start_pos"),
+        }
+    if kind == "deliveries":
+        return {
+            "id": np.array([d.id for d in items], dtype=np.int64),
+            "pos": positions(items, "pos"),
+            "weight": np.array([d.weight for d in items], dtype=np.float64),
+            "priority": np.array([d.priority for d in items], dtype=np.int8),
+            "window": np.array([[hhmm_to_min(t) for t in d.time_window] for d in items],
+                               dtype=np.int16).reshape(-1, 2),
+        }
+    sizes = [len(z.coordinates) for z in items]
+    offsets = np.zeros(len(items) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return {
+        "id": np.array([z.id for z in items], dtype=np.int64),
+        "active": np.array([[hhmm_to_min(t) for t in z.active_time] for z in items],
+                           dtype=np.int16).reshape(-1, 2),
+        "vertices": np.array([p for z in items for p in z.coordinates],
+                             dtype=np.float64).reshape(-1, 2),
+        "offsets": offsets,
+    }
+
+
+# ---- İkili biçim -----------------------------------------------------------
+def save_binary(path: PathLike, drones, deliveries, zones) -> Path:
+    """Senaryoyu sütunlu .scn dizinine yazar."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    counts, names = {}, {}
+    for kind, items in (("drones", drones), ("deliveries", deliveries), ("zones", zones)):
+        cols = to_columns(kind, items)
+        counts[kind], names[kind] = len(items), list(cols)
+        for name, arr in cols.items():
+            np.save(column_path(path, kind, name), np.ascontiguousarray(arr))
+    write_meta(path, counts, names)
+    return path
+
+
+def column_path(path: PathLike, kind: str, name: str) -> Path:
+    return Path(path) / f"{kind}.{name}.npy"
+
+
+def write_meta(path: PathLike, counts: Dict[str, int], columns: Dict[str, List[str]], **extra):
+    """meta.json — sütunlar (ör. parça parça open_memmap ile) yazıldıktan sonra çağrılır."""
+    meta = {"version": FORMAT_VERSION, "counts": counts, "columns": columns, **extra}
+    with open(Path(path) / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_binary(path: PathLike, mmap: bool = True) -> Tuple[Records, Records, Records]:
+    """.scn dizini → (drones, deliveries, zones) tembel Records üçlüsü."""
+    path = Path(path)
+    with open(path / "meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: desteklenmeyen sürüm {meta.get('version')}")
+    mode = "r" if mmap else None
+    out = []
+    for kind in ("drones", "deliveries", "zones"):
+        cols = {name: np.load(column_path(path, kind, name), mmap_mode=mode)
+                for name in meta["columns"][kind]}
+        out.append(Records(cols, meta["counts"][kind], MAKERS[kind]))
+    return tuple(out)
+
+
+# ---- Ortak yükleyici -------------------------------------------------------
+def json_paths(name: str, data_dir: PathLike = DATA_DIR) -> Dict[str, Path]:
+    return {k: Path(data_dir) / v.format(name) for k, v in JSON_FILES.items()}
+
+
+def save_scenario_json(name: str, drones, deliveries, zones, data_dir: PathLike = DATA_DIR):
+    """Senaryoyu data_generator ile aynı JSON üçlüsü olarak yazar."""
+    p = json_paths(name, data_dir)
+    save_json(drones, p["drones"])
+    save_json(deliveries, p["deliveries"])
+    save_json(zones, p["zones"])
+
+
+def resolve_scenario(name: str, data_dir: PathLike = DATA_DIR,
+                     prefer_binary: bool = True) -> Tuple[str, List[Path]]:
+    """load_scenario'nun okuyacağı kaynak: ("binary", [.scn dizini]) ya da
+       ("json", [drones, deliveries, zones dosyaları])."""
+    p = Path(name)
+    if (p / "meta.json").exists():
+        return "binary", [p]
+    scn = Path(data_dir) / f"{name}.scn"
+    if prefer_binary and (scn / "meta.json").exists():
+        return "binary", [scn]
+    js = json_paths(name, data_dir)
+    return "json", [js["drones"], js["deliveries"], js["zones"]]
+
+
+def scenario_signature(name: str, data_dir: PathLike = DATA_DIR,
+                       prefer_binary: bool = True) -> Tuple:
+    """Kaynak dosyaların (yol, mtime_ns) demeti — önbellek geçerliliği için."""
+    kind, paths = resolve_scenario(name, data_dir, prefer_binary)
+    if kind == "binary":
+        paths = [paths[0] / "meta.json"]          # meta sütunlardan sonra yazılır
+    return tuple((str(q.resolve()), q.stat().st_mtime_ns) for q in paths)
+
+
+def load_scenario(name: str = "s1", data_dir: PathLike = DATA_DIR, prefer_binary: bool = True):
+    """(drones, deliveries, zones) — `name` bir .scn dizini ya da senaryo adı olabilir.
+       Ad verilirse önce data_dir/<ad>.scn (ikili), yoksa JSON üçlüsü okunur."""
+    kind, paths = resolve_scenario(name, data_dir, prefer_binary)
+    if kind == "binary":
+        return load_binary(paths[0])
+    drones, deliveries, zones = paths
+    return (load_json(drones, Drone), load_json(deliveries, Delivery),
+            load_json(zones, NoFlyZone))
+
+
+# ------------------- Dönüştürücü (CLI) ----------------------------------
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="JSON ↔ ikili (.scn) senaryo dönüştürücü")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("to-bin", help="JSON üçlüsü → .scn dizini")
+    a.add_argument("name")
+    a.add_argument("--data-dir", default=DATA_DIR)
+    a.add_argument("--out", default=None)
+    b = sub.add_parser("to-json", help=".scn dizini → JSON üçlüsü")
+    b.add_argument("path")
+    b.add_argument("--name", required=True)
+    b.add_argument("--data-dir", default=DATA_DIR)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "to-bin":
+        scn = load_scenario(args.name, args.data_dir, prefer_binary=False)
+        out = save_binary(args.out or Path(args.data_dir) / f"{args.name}.scn", *scn)
+    else:
+        scn = load_binary(args.path)
+        save_scenario_json(args.name, *scn, data_dir=args.data_dir)
+        out = Path(args.data_dir)
+    d, dl, z = scn
+    print(f"✔  {len(d)} drone, {len(dl)} teslimat, {len(z)} NFZ → {out}")
+
+
+if __name__ == "__main__":
+    main()
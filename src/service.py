@@ -0,0 +1,564 @@
+"""
+Yerel optimizasyon servisi (asyncio, satır başına bir JSON — Unix soketi ya da TCP):
+• İstekler : {"op": "solve", "scenario": "s1", "params": {...}, "stream": true}
+             {"op": "watch" | "status" | "cancel", "job": id}   {"op": "stats"}
+• Yanıtlar : {"event": "queued" | "started" | "progress" | "done" | "failed" |
+             "cancelled", "job": id, ...}; progress olayları nesil, en iyi fitness
+             ve en iyi skor iyileştiyse o anki en iyi rotaları taşır
+• İşler sınırlı bir kuyrukta bekler (max_queue; doluysa hata döner), workers
+  adet dağıtıcı onları süreç havuzunda GAOptimizer ile çözer
+• Sıcak senaryolar: mesafe / NFZ matrisleri senaryo başına bir kez kurulur ve
+  parallel.SharedScenario ile paylaşımlı belleğe konur; işçiler kopyalamadan
+  bağlanır ve bağlantıyı senaryo imzası (dosya mtime) değişene dek tutar.
+  Ana süreçte ve her işçide en fazla max_scenarios senaryo (LRU) tutulur
+• Sınırlı bellek: dinleyici başına en fazla PROGRESS_BUFFER olay (dolunca en
+  eskisi atılır; son olay hiç atılmaz), biten işlerden son keep_results kadarı
+Kullanım (proje kökünden):
+    PYTHONPATH=src python src/service.py serve --workers 2
+    PYTHONPATH=src python src/service.py solve s1 --generations 50
+    PYTHONPATH=src python src/service.py demo --jobs 12
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import math
+import multiprocessing as mp
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from data_generator import DATA_DIR
+from ga import GAOptimizer
+from parallel import SharedScenario, attach_scenario
+from scenario_io import load_scenario, scenario_signature
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / "drone-filo.sock"
+PROGRESS_BUFFER = 64           # dinleyici başına bekleyen olay sınırı
+TERMINAL = ("done", "failed", "cancelled")
+# İstekte kabul edilen parametreler: GAOptimizer kurucusu / run() / servis
+GA_PARAMS = {"pop_size", "elite_ratio", "mutation_rate", "generations", "cache_size",
+             "encoding", "batch", "local_search", "ls_passes", "detour", "prune"}
+RUN_PARAMS = {"time_budget", "patience", "min_delta"}
+JOB_PARAMS = {"seed", "progress_every"}
+
+
+def _fit(x: float) -> Optional[float]:
+    """-inf JSON'da geçerli değil → None."""
+    return x if math.isfinite(x) else None
+
+
+def _routes(chrom) -> Dict[int, List[int]]:
+    return {d: list(r) for d, r in chrom.items()}
+
+
+# ---- İşçi süreç --------------------------------------------------------------
+_WORKER = {}
+
+
+def _init_worker(progress, flags, max_scenarios: int):
+    _WORKER.update(progress=progress, flags=flags, max_scenarios=max_scenarios,
+                   warm=OrderedDict())
+
+
+def _base(key, spec) -> Tuple[GAOptimizer, bool]:
+    """Senaryonun paylaşımlı matrislere bağlı taban GA'sı (LRU); (ga, sıcak_mı)."""
+    warm = _WORKER["warm"]
+    if key in warm:
+        warm.move_to_end(key)
+        return warm[key][0], True
+    keep: list = []
+    warm[key] = (attach_scenario(spec, keep=keep), keep)
+    while len(warm) > _WORKER["max_scenarios"]:
+        _, (ga, handles) = warm.popitem(last=False)
+        del ga
+        gc.collect()                     # rota önbelleği döngüsü → diziler bırakılır
+        for shm in handles:
+            try:
+                shm.close()
+            except BufferError:          # hâlâ dışa açık görünüm varsa GC kapatır
+                pass
+    return warm[key][0], False
+
+
+def _solve(job_id: int, slot: int, key, spec: dict, params: dict) -> dict:
+    t = time.perf_counter()
+    base, warm = _base(key, spec)
+    ga = type(base)(base.drones, base.deliveries, None, base.zones, dm=base.dm, nfz=base.nfz,
+                    **{k: v for k, v in params.items() if k in GA_PARAMS})
+    ga.rand.seed(params.get("seed", 42))
+    progress, flags = _WORKER["progress"], _WORKER["flags"]
+    every = max(1, int(params.get("progress_every", 1)))
+    sent = [-math.inf]                   # son gönderilen en iyi skor
+
+    def callback(gen, fit, chrom):
+        if gen % every == 0:
+            msg = {"gen": gen, "best": _fit(fit)}
+            if fit > sent[0]:            # en iyi-şimdiye-kadar yalnızca iyileşince
+                sent[0] = fit
+                msg["routes"] = _routes(ga.to_dict(chrom))
+            progress.put((job_id, msg))
+        return bool(flags[slot])          # iptal bayrağı → run() durur
+
+    fit, best = ga.run(callback=callback,
+                       **{k: v for k, v in params.items() if k in RUN_PARAMS})
+    return dict(fitness=_fit(fit), routes=_routes(ga.to_dict(best)) if best is not None else {},
+                generations_run=ga.generations_run, stop_reason=ga.stop_reason,
+                seconds=time.perf_counter() - t, warm=warm)
+
+
+# ---- Ana süreç: sıcak senaryolar ----------------------------------------------
+@dataclass
+class _Warm:
+    key: tuple
+    shared: SharedScenario
+    users: int = 0
+
+    @property
+    def spec(self) -> dict:
+        return self.shared.spec
+
+
+class WarmScenarios:
+    """Senaryo adı + imza → paylaşımlı bellekteki matrisler (LRU, kullanımdakiler
+       çıkarılmaz). Aynı senaryoya eşzamanlı istekler tek kurulumu bekler."""
+
+    def __init__(self, max_scenarios: int = 4, data_dir=DATA_DIR):
+        self.max_scenarios = max_scenarios
+        self.data_dir = data_dir
+        self._entries: "OrderedDict[tuple, _Warm]" = OrderedDict()
+        self._building: Dict[tuple, asyncio.Task] = {}
+        self.builds = 0
+
+    def key(self, name: str) -> tuple:
+        """Dosya yoksa FileNotFoundError (istek anında doğrulama)."""
+        return name, scenario_signature(name, self.data_dir)
+
+    async def acquire(self, name: str) -> _Warm:
+        key = await asyncio.to_thread(self.key, name)
+        entry = self._entries.get(key)
+        if entry is None:
+            task = self._building.get(key)
+            if task is None:
+                task = self._building[key] = asyncio.create_task(self._load(key, name))
+            entry = await asyncio.shield(task)
+        entry.users += 1
+        self._entries.move_to_end(key)
+        self._evict()
+        return entry
+
+    def release(self, entry: _Warm):
+        entry.users -= 1
+        self._evict()
+
+    async def _load(self, key: tuple, name: str) -> _Warm:
+        try:
+            entry = await asyncio.to_thread(self._build, key, name)
+            self._entries[key] = entry
+            self.builds += 1
+            return entry
+        finally:
+            self._building.pop(key, None)
+
+    def _build(self, key: tuple, name: str) -> _Warm:
+        drones, deliveries, zones = (list(x) for x in load_scenario(name, self.data_dir))
+        return _Warm(key, SharedScenario(GAOptimizer(drones, deliveries, None, zones)))
+
+    def _evict(self):
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_scenarios:
+                break
+            if self._entries[key].users == 0:
+                self._entries.pop(key).shared.close()
+
+    def names(self) -> List[str]:
+        return [k[0] for k in self._entries]
+
+    def close(self):
+        for entry in self._entries.values():
+            entry.shared.close()
+        self._entries.clear()
+
+
+# ---- İşler -------------------------------------------------------------------
+@dataclass
+class Job:
+    id: int
+    scenario: str
+    params: dict
+    state: str = "queued"
+    gen: int = -1
+    best: Optional[float] = None
+    slot: Optional[int] = None
+    cancel_requested: bool = False
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    final: Optional[dict] = None                   # son (terminal) olay
+    listeners: set = field(default_factory=set, repr=False)
+
+    def event(self, name: str, **payload) -> dict:
+        return {"event": name, "job": self.id, **payload}
+
+    def info(self) -> dict:
+        return self.event("status", state=self.state, scenario=self.scenario, gen=self.gen,
+                          best=self.best, created=self.created, started=self.started,
+                          finished=self.finished)
+
+
+def _offer(q: asyncio.Queue, ev: dict):
+    """Dolu kuyrukta en eski olay atılır — yavaş istemci belleği büyütemez."""
+    if q.full():
+        q.get_nowait()
+    q.put_nowait(ev)
+
+
+class OptimizationService:
+    """İş kuyruğu + süreç havuzu + sıcak senaryo önbelleği; start() / close()."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 64, max_scenarios: int = 4,
+                 keep_results: int = 256, data_dir=DATA_DIR):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_scenarios = max_scenarios
+        self.keep_results = keep_results
+        self.warm = WarmScenarios(max_scenarios, data_dir)
+        self.jobs: "OrderedDict[int, Job]" = OrderedDict()
+        self._ids = itertools.count(1)
+
+    # --------- yaşam döngüsü ----------
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        ctx = mp.get_context()
+        self.queue: asyncio.Queue = asyncio.Queue(self.max_queue)
+        self.progress = ctx.Queue()
+        self.flags = ctx.RawArray("b", self.workers)      # dağıtıcı yuvası başına iptal
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_worker,
+                                        initargs=(self.progress, self.flags, self.max_scenarios))
+        self._pump = threading.Thread(target=self._pump_progress, daemon=True)
+        self._pump.start()
+        self._dispatchers = [asyncio.create_task(self._dispatch(k)) for k in range(self.workers)]
+        return self
+
+    async def close(self):
+        for k in range(self.workers):
+            self.flags[k] = 1
+        for t in self._dispatchers:
+            t.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        await asyncio.to_thread(self.pool.shutdown, True, cancel_futures=True)
+        self.progress.put(None)
+        await asyncio.to_thread(self._pump.join)
+        self.warm.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # --------- iş API'si ----------
+    def submit(self, scenario: str, params: Optional[dict] = None) -> Job:
+        """Kuyruğa ekler; bilinmeyen parametre / senaryo → ValueError /
+           FileNotFoundError, kuyruk doluysa asyncio.QueueFull."""
+        params = dict(params or {})
+        unknown = set(params) - GA_PARAMS - RUN_PARAMS - JOB_PARAMS
+        if unknown:
+            raise ValueError(f"bilinmeyen parametre(ler): {sorted(unknown)}")
+        self.warm.key(scenario)
+        if self.queue.full():
+            raise asyncio.QueueFull
+        job = Job(next(self._ids), scenario, params)
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        return job
+
+    def job(self, job_id) -> Job:
+        try:
+            return self.jobs[int(job_id)]
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(f"iş yok: {job_id!r}") from None
+
+    def cancel(self, job_id) -> bool:
+        job = self.job(job_id)
+        if job.state == "queued":
+            self._finish(job, "cancelled")
+            return True
+        if job.state == "running":
+            job.cancel_requested = True
+            self.flags[job.slot] = 1
+            return True
+        return False
+
+    def watch(self, job: Job) -> AsyncIterator[dict]:
+        """Olay akışı (terminal olayda biter). Dinleyici hemen kaydolur, böylece
+           çağrı ile ilk await arasındaki olaylar kaçmaz."""
+        q: asyncio.Queue = asyncio.Queue(PROGRESS_BUFFER)
+        if job.final is not None:
+            q.put_nowait(job.final)
+        else:
+            job.listeners.add(q)
+
+        async def events():
+            try:
+                while True:
+                    ev = await q.get()
+                    yield ev
+                    if ev["event"] in TERMINAL:
+                        return
+            finally:
+                job.listeners.discard(q)
+        return events()
+
+    def stats(self) -> dict:
+        states = {s: 0 for s in ("queued", "running", *TERMINAL)}
+        for job in self.jobs.values():
+            states[job.state] += 1
+        return {"event": "stats", "workers": self.workers, "max_queue": self.max_queue,
+                "jobs": states, "warm": self.warm.names(), "scenario_builds": self.warm.builds}
+
+    # --------- iç akış ----------
+    def _publish(self, job: Job, ev: dict):
+        for q in job.listeners:
+            _offer(q, ev)
+
+    def _finish(self, job: Job, state: str, **payload):
+        job.state, job.finished = state, time.time()
+        job.final = job.event(state, **payload)
+        self._publish(job, job.final)
+        job.listeners.clear()
+        done = [j for j in self.jobs.values() if j.final is not None]
+        for old in done[: max(0, len(done) - self.keep_results)]:
+            del self.jobs[old.id]
+
+    async def _dispatch(self, slot: int):
+        while True:
+            job = await self.queue.get()
+            if job.state != "queued":             # kuyruktayken iptal edilmiş
+                continue
+            self.flags[slot] = 0
+            job.state, job.slot, job.started = "running", slot, time.time()
+            self._publish(job, job.event("started", waited=job.started - job.created))
+            entry = None
+            try:
+                entry = await self.warm.acquire(job.scenario)
+                res = await self.loop.run_in_executor(self.pool, _solve, job.id, slot,
+                                                      entry.key, entry.spec, job.params)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+            else:
+                self._finish(job, "cancelled" if job.cancel_requested else "done", **res)
+            finally:
+                if entry is not None:
+                    self.warm.release(entry)
+
+    def _pump_progress(self):
+        """İşçi kuyruğunu okuyan iş parçacığı → olay döngüsü."""
+        while True:
+            msg = self.progress.get()
+            if msg is None:
+                return
+            self.loop.call_soon_threadsafe(self._on_progress, *msg)
+
+    def _on_progress(self, job_id: int, data: dict):
+        job = self.jobs.get(job_id)
+        if job is None or job.state != "running":  # geç kalan ilerleme (iş bitti)
+            return
+        job.gen, job.best = data["gen"], data["best"]
+        self._publish(job, job.event("progress", **data))
+
+    # --------- JSON satırı protokolü ----------
+    async def serve(self, path=None, host: Optional[str] = None, port: Optional[int] = None):
+        """host / port verilirse TCP, yoksa Unix soketi (path)."""
+        if host is not None or port is not None:
+            return await asyncio.start_server(self._handle, host or "127.0.0.1", port or 8765)
+        path = Path(path or DEFAULT_SOCKET)
+        path.unlink(missing_ok=True)
+        return await asyncio.start_unix_server(self._handle, str(path))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        streams = set()
+
+        async def send(obj: dict):
+            writer.write((json.dumps(obj) + "\n").encode())
+            await writer.drain()
+
+        async def stream(events):
+            async for ev in events:
+                await send(ev)
+
+        def spawn(events):
+            t = asyncio.create_task(stream(events))
+            streams.add(t)
+            t.add_done_callback(streams.discard)
+
+        try:
+            while line := await reader.readline():
+                try:
+                    req = json.loads(line)
+                    op = req.get("op")
+                    if op == "solve":
+                        job = self.submit(req["scenario"], req.get("params"))
+                        events = self.watch(job) if req.get("stream", True) else None
+                        await send(job.event("queued", position=self.queue.qsize()))
+                        if events is not None:
+                            spawn(events)
+                    elif op == "watch":
+                        spawn(self.watch(self.job(req["job"])))
+                    elif op == "status":
+                        await send(self.job(req["job"]).info())
+                    elif op == "cancel":
+                        await send({"event": "cancel", "job": req["job"],
+                                    "ok": self.cancel(req["job"])})
+                    elif op == "stats":
+                        await send(self.stats())
+                    else:
+                        raise ValueError(f"bilinmeyen op: {op!r}")
+                except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+                    await send({"event": "error", "error": f"{type(e).__name__}: {e}"})
+                except asyncio.QueueFull:
+                    await send({"event": "error", "error": "kuyruk dolu"})
+        except ConnectionError:
+            pass
+        finally:
+            for t in list(streams):
+                t.cancel()
+            writer.close()
+
+
+# ---- İstemci -----------------------------------------------------------------
+async def request(req: dict, path=None, host: Optional[str] = None,
+                  port: Optional[int] = None) -> AsyncIterator[dict]:
+    """Tek istek gönderir ve yanıt olaylarını verir; solve / watch terminal olaya
+       kadar akar, diğer işlemler tek yanıt döndürür."""
+    if host is not None or port is not None:
+        reader, writer = await asyncio.open_connection(host or "127.0.0.1", port or 8765)
+    else:
+        reader, writer = await asyncio.open_unix_connection(str(path or DEFAULT_SOCKET))
+    try:
+        writer.write((json.dumps(req) + "\n").encode())
+        await writer.drain()
+        streaming = req.get("op") in ("solve", "watch") and req.get("stream", True)
+        while line := await reader.readline():
+            ev = json.loads(line)
+            yield ev
+            if not streaming or ev["event"] in (*TERMINAL, "error"):
+                break
+    finally:
+        writer.close()
+
+
+# ------------------- Komut satırı ---------------------------------------
+def _print_event(ev: dict):
+    if ev["event"] == "progress":
+        best = "-inf" if ev["best"] is None else f"{ev['best']:,.0f}"
+        print(f"  iş {ev['job']}  nesil {ev['gen']:4d}  en iyi={best}"
+              + ("  (yeni rota)" if "routes" in ev else ""))
+    elif ev["event"] in ("done", "cancelled"):
+        fit = "-inf" if ev.get("fitness") is None else f"{ev['fitness']:,.0f}"
+        print(f"✔ iş {ev['job']} {ev['event']}: fitness={fit}, "
+              f"{ev.get('generations_run', 0)} nesil, {ev.get('seconds', 0):.2f} s, "
+              f"sıcak={ev.get('warm')}")
+    else:
+        print(json.dumps(ev))
+
+
+async def _demo(args):
+    """Süreç içi sunucu + aynı anda --jobs adet istemci (iki senaryo, sıcak önbellek)."""
+    sock = Path(tempfile.mkdtemp()) / "demo.sock"
+    async with OptimizationService(args.workers, args.max_queue, args.max_scenarios) as svc:
+        server = await svc.serve(sock)
+
+        async def client(i: int):
+            params = {"generations": args.generations, "pop_size": 20, "seed": i,
+                      "progress_every": 10}
+            async for ev in request({"op": "solve", "scenario": args.scenario,
+                                     "params": params}, sock):
+                last = ev
+            return last
+
+        t = time.perf_counter()
+        finals = await asyncio.gather(*(client(i) for i in range(args.jobs)))
+        for ev in finals:
+            _print_event(ev)
+        async for ev in request({"op": "stats"}, sock):
+            print(json.dumps(ev))
+        print(f"{args.jobs} eşzamanlı iş, {time.perf_counter() - t:.2f} s")
+        server.close()
+        await server.wait_closed()
+
+
+async def _serve(args):
+    async with OptimizationService(args.workers, args.max_queue, args.max_scenarios,
+                                   data_dir=args.data_dir) as svc:
+        server = await svc.serve(args.socket, args.host, args.port)
+        where = f"{args.host or '127.0.0.1'}:{args.port or 8765}" \
+            if args.host or args.port else str(args.socket or DEFAULT_SOCKET)
+        print(f"✔  servis dinliyor: {where} ({args.workers} işçi)")
+        stop = asyncio.Event()            # SIGINT / SIGTERM → düzenli kapanış
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        async with server:
+            await stop.wait()
+
+
+async def _client(args):
+    if args.cmd == "solve":
+        params = {k: v for k, v in (("generations", args.generations),
+                                    ("pop_size", args.pop_size),
+                                    ("time_budget", args.time_budget),
+                                    ("seed", args.seed)) if v is not None}
+        req = {"op": "solve", "scenario": args.scenario, "params": params}
+    else:
+        req = {"op": args.cmd, **({"job": args.job} if args.cmd in ("status", "cancel") else {})}
+    async for ev in request(req, args.socket, args.host, args.port):
+        _print_event(ev)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Yerel GA optimizasyon servisi (JSON satırları)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    conn = argparse.ArgumentParser(add_help=False)
+    conn.add_argument("--socket", default=None, help=f"Unix soketi (varsayılan {DEFAULT_SOCKET})")
+    conn.add_argument("--host", default=None)
+    conn.add_argument("--port", type=int, default=None)
+    pool = argparse.ArgumentParser(add_help=False)
+    pool.add_argument("--workers", type=int, default=2)
+    pool.add_argument("--max-queue", type=int, default=64)
+    pool.add_argument("--max-scenarios", type=int, default=4)
+
+    s = sub.add_parser("serve", parents=[conn, pool])
+    s.add_argument("--data-dir", default=DATA_DIR)
+    c = sub.add_parser("solve", parents=[conn])
+    c.add_argument("scenario")
+    c.add_argument("--generations", type=int, default=None)
+    c.add_argument("--pop-size", type=int, default=None)
+    c.add_argument("--time-budget", type=float, default=None)
+    c.add_argument("--seed", type=int, default=None)
+    for name in ("status", "cancel"):
+        sub.add_parser(name, parents=[conn]).add_argument("job", type=int)
+    sub.add_parser("stats", parents=[conn])
+    d = sub.add_parser("demo", parents=[pool])
+    d.add_argument("--scenario", default="s1")
+    d.add_argument("--jobs", type=int, default=12)
+    d.add_argument("--generations", type=int, default=30)
+    args = ap.parse_args(argv)
+
+    runner = {"serve": _serve, "demo": _demo}.get(args.cmd, _client)
+    try:
+        asyncio.run(runner(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
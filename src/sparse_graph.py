@@ -0,0 +1,259 @@
+"""
+Büyük senaryolar için seyrek k‑en‑yakın‑komşu grafiği:
+• Her düğüm, izdüşürülmüş (metre) koordinatlarda KD‑ağacı ile bulunan k en
+  yakın komşusuna ve en yakın depoya bağlanır → O(N·k) kenar
+• NFZ testi yalnızca aday kenarlarda, STRtree ile vektörel yapılır; tüm gün
+  aktif bölgeyi kesen kenar atılır, saatli bölgeler kenara pencere yazar
+• Kenarlar networkx sözlükleri yerine CSR dizilerinde (indptr, indices, data)
+• Bağlantılılık: kalan her bileşen, NFZ'siz en yakın dış düğüme bağlanır
+  (kalıcı NFZ içinde kalan düğümler tam grafikte de yalıtıktır; NFZ'lerle
+  çevrili cepler en yakın ~max_probe aday içinde çıkış arar)
+• to_networkx() : astar / quick_test gibi mevcut çağıranlar için
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import networkx as nx
+import shapely
+from shapely import STRtree
+from shapely.geometry import Polygon
+from models import Drone, Delivery, NoFlyZone
+from distance import haversine_pairs, positions, project
+from nfz import zone_intervals, _is_all_day, _merge
+
+try:                                       # isteğe bağlı hızlandırıcılar
+    from scipy.spatial import cKDTree
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:                        # pragma: no cover
+    cKDTree = csr_matrix = connected_components = None
+
+
+class SparseGraph:
+    """CSR biçiminde yönsüz grafik; düğüm sırası DistanceMatrix ile aynı."""
+
+    def __init__(self, drones: List[Drone], deliveries: List[Delivery], coords: np.ndarray,
+                 ii: np.ndarray, jj: np.ndarray, dist: np.ndarray,
+                 windows: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]):
+        self.drones, self.deliveries = drones, deliveries
+        self.coords = coords
+        self.names = [f"drone_{d.id}" for d in drones] + [f"del_{dlv.id}" for dlv in deliveries]
+        self.windows = windows                   # {(i, j): yasak aralıklar}, iki yön
+        n = len(coords)
+        # Her yönsüz kenar iki yönlü kayıt olarak CSR'a yazılır
+        src = np.concatenate([ii, jj])
+        order = np.argsort(src, kind="stable")
+        self.indices = np.concatenate([jj, ii]).astype(np.int32)[order]
+        self.data = np.concatenate([dist, dist])[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def neighbors(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """i düğümünün (komşu indeksleri, kenar mesafeleri) görünümleri."""
+        s, e = self.indptr[i], self.indptr[i + 1]
+        return self.indices[s:e], self.data[s:e]
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Her yönsüz kenar bir kez: (i, j, mesafe), i < j."""
+        src = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.indptr))
+        keep = src < self.indices
+        return src[keep], self.indices[keep], self.data[keep]
+
+    def n_components(self) -> int:
+        return int(_components(len(self), *self.edges()[:2]).max(initial=-1)) + 1
+
+    def to_networkx(self) -> nx.Graph:
+        """build_graph ile aynı düğüm / kenar öznitelikleri."""
+        g = nx.Graph()
+        for d in self.drones:
+            g.add_node(f"drone_{d.id}", pos=d.start_pos, kind="start")
+        for dlv in self.deliveries:
+            g.add_node(f"del_{dlv.id}", pos=dlv.pos, kind="delivery", weight=dlv.weight)
+        names = self.names
+        ii, jj, dd = self.edges()
+        g.add_edges_from(
+            (names[i], names[j], {"distance": d, "cost": d})
+            for i, j, d in zip(ii.tolist(), jj.tolist(), dd.tolist())
+        )
+        for (i, j), windows in self.windows.items():
+            if i < j:
+                g[names[i]][names[j]]["nfz_windows"] = windows
+        return g
+
+
+# ------------------------------------------------------------------ #
+#  Yardımcılar                                                        #
+# ------------------------------------------------------------------ #
+class _Neighbours:
+    """xy üzerinde k en yakın komşu sorgusu (KD‑ağacı bir kez kurulur)."""
+
+    def __init__(self, xy: np.ndarray):
+        self.xy = xy
+        self.tree = cKDTree(xy) if cKDTree is not None else None
+
+    def __call__(self, query: np.ndarray, k: int, block: int = 2048) -> np.ndarray:
+        """query noktalarının k en yakın komşu indeksleri (yakından uzağa)."""
+        xy = self.xy
+        k = min(k, len(xy))
+        if self.tree is not None:
+            _, idx = self.tree.query(query, k=k)
+            return np.asarray(idx).reshape(len(query), k)
+        out = np.empty((len(query), k), dtype=np.int64)
+        for s in range(0, len(query), block):      # kaba kuvvet, satır blokları
+            d2 = ((query[s:s + block, None, :] - xy[None, :, :]) ** 2).sum(axis=2)
+            part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(d2, part, axis=1).argsort(axis=1)
+            out[s:s + block] = np.take_along_axis(part, order, axis=1)
+        return out
+
+
+def _components(n: int, ii: np.ndarray, jj: np.ndarray) -> np.ndarray:
+    """Bağlı bileşen etiketleri."""
+    if connected_components is not None:
+        m = csr_matrix((np.ones(len(ii)), (ii, jj)), shape=(n, n))
+        return connected_components(m, directed=False)[1]
+    parent = list(range(n))                        # union‑find
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for a, b in zip(ii.tolist(), jj.tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+    roots = np.array([find(x) for x in range(n)])
+    return np.unique(roots, return_inverse=True)[1]
+
+
+class _EdgeFilter:
+    """Aday kenarlar için vektörel NFZ testi."""
+
+    def __init__(self, coords: np.ndarray, zones: List[NoFlyZone]):
+        self.coords = coords
+        self.tree = STRtree([Polygon(z.coordinates) for z in zones]) if zones else None
+        self.intervals = [zone_intervals(z) for z in zones]
+        self.permanent = np.array([_is_all_day(iv) for iv in self.intervals], dtype=bool)
+
+    def inside(self, idx: np.ndarray) -> np.ndarray:
+        """Düğüm tüm gün aktif bir NFZ içinde mi (maske)."""
+        mask = np.zeros(len(idx), dtype=bool)
+        if self.tree is not None:
+            k, z = self.tree.query(shapely.points(self.coords[idx]), predicate="intersects")
+            mask[k[self.permanent[z]]] = True
+        return mask
+
+    def __call__(self, ii: np.ndarray, jj: np.ndarray):
+        """(kalıcı kapalı maskesi, {kenar no: saatli aralık listesi})."""
+        blocked = np.zeros(len(ii), dtype=bool)
+        timed: Dict[int, List[Tuple[int, int]]] = {}
+        if self.tree is None or len(ii) == 0:
+            return blocked, timed
+        segs = np.stack([self.coords[ii], self.coords[jj]], axis=1)
+        e, z = self.tree.query(shapely.linestrings(segs), predicate="intersects")
+        perm = self.permanent[z]
+        blocked[e[perm]] = True
+        for k, zi in zip(e[~perm].tolist(), z[~perm].tolist()):
+            timed.setdefault(k, []).extend(self.intervals[zi])
+        return blocked, timed
+
+
+# ------------------------------------------------------------------ #
+#  Grafik inşası                                                      #
+# ------------------------------------------------------------------ #
+def build_sparse_graph(
+    drones: List[Drone],
+    deliveries: List[Delivery],
+    zones: List[NoFlyZone],
+    k: int = 8,
+    coords: Optional[np.ndarray] = None,
+) -> SparseGraph:
+    """k‑NN (+ en yakın depo) seyrek grafik; NFZ kesen kenarlar atlanır."""
+    if coords is None:
+        coords = np.concatenate([positions(drones, "start_pos"), positions(deliveries, "pos")])
+    n, n_dep = len(coords), len(drones)
+    xy = project(coords)
+    check = _EdgeFilter(coords, zones)
+
+    # Aday kenarlar: k komşu (ilk sütun düğümün kendisi) + en yakın depo
+    knn = _Neighbours(xy)
+    nn = knn(xy, k + 1)
+    ii = np.repeat(np.arange(n), nn.shape[1] - 1)
+    jj = nn[:, 1:].ravel()
+    if n_dep and n > n_dep:
+        dep = _Neighbours(xy[:n_dep])(xy[n_dep:], 1)[:, 0]
+        ii = np.concatenate([ii, np.arange(n_dep, n)])
+        jj = np.concatenate([jj, dep])
+    ii, jj = np.minimum(ii, jj), np.maximum(ii, jj)
+    key = np.unique(ii[ii != jj].astype(np.int64) * n + jj[ii != jj])
+    ii, jj = key // n, key % n
+
+    blocked, timed = check(ii, jj)
+    windows = {(int(ii[e]), int(jj[e])): _merge(iv) for e, iv in timed.items() if not blocked[e]}
+    ii, jj = ii[~blocked], jj[~blocked]
+    ii, jj = _connect(knn, ii, jj, check, windows)
+
+    dist = haversine_pairs(coords[ii], coords[jj])
+    windows.update({(j, i): w for (i, j), w in list(windows.items())})
+    return SparseGraph(drones, deliveries, coords, ii, jj, dist, windows)
+
+
+def _candidates(knn, nn, members, outside, max_probe):
+    """Bileşen dışı bağlantı adayları (members, hedef), yakından uzağa: önce
+       önceden bulunmuş komşular, sonra dış düğümler üzerinde genişleyen
+       KD‑ağacı sorgusu (bileşen başına en fazla ~max_probe aday)."""
+    yield np.repeat(members, nn.shape[1]), nn[members].ravel()
+    out_idx = np.flatnonzero(outside)
+    near = _Neighbours(knn.xy[out_idx])
+    for k in (16, max(16, max_probe // len(members))):
+        cand = near(knn.xy[members], k)
+        yield np.repeat(members, cand.shape[1]), out_idx[cand.ravel()]
+        if k >= len(out_idx):
+            break
+
+
+def _connect(knn, ii, jj, check, windows, probe: int = 16, max_probe: int = 4096):
+    """Her küçük bileşeni dışarıdaki en yakın NFZ'siz düğüme bağlar. En yakın
+       ~max_probe dış düğüme de NFZ'siz bağlanamayan bileşen yalıtık kalır."""
+    xy = knn.xy
+    n = len(xy)
+    nn = knn(xy, probe + 1)[:, 1:]
+    isolated = check.inside(np.arange(n))  # kalıcı NFZ içindeki düğümler bağlanamaz
+    while True:
+        labels = _components(n, ii, jj)
+        sizes = np.bincount(labels)
+        if len(sizes) <= 1:
+            return ii, jj
+        main = sizes.argmax()
+        new_i, new_j = [], []
+        for c in np.argsort(sizes):
+            members = np.flatnonzero(labels == c)
+            if c == main or isolated[members].all():
+                continue
+            for a, b in _candidates(knn, nn, members, labels != c, max_probe):
+                out = labels[b] != c
+                a, b = a[out], b[out]
+                order = np.argsort(((xy[a] - xy[b]) ** 2).sum(axis=1), kind="stable")
+                a, b = np.minimum(a, b)[order], np.maximum(a, b)[order]
+                blocked, timed = check(a, b)
+                ok = np.flatnonzero(~blocked)
+                if len(ok):
+                    e = ok[0]
+                    new_i.append(a[e])
+                    new_j.append(b[e])
+                    if e in timed:
+                        windows[(int(a[e]), int(b[e]))] = _merge(timed[e])
+                    break
+            else:
+                isolated[members] = True
+        if not new_i:                      # kalanlar kalıcı NFZ ile yalıtık
+            return ii, jj
+        ii = np.concatenate([ii, new_i])
+        jj = np.concatenate([jj, new_j])
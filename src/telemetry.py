@@ -0,0 +1,169 @@
+"""
+GA telemetrisi (print yerine yapılandırılmış kayıt):
+• GenerationRecord : nesil başına best / mean / worst fitness, uygunsuz (-inf)
+                     oranı, operatör sürelerinin dağılımı (fitness, crossover,
+                     mutate, repair, fix_nfz, local_search, checkpoint),
+                     check_route ve NFZ bacak kontrolü çağrı sayıları, rota
+                     önbelleği isabeti
+• Alıcılar         : JSONLTelemetry (dosyaya satır satır), HookTelemetry
+                     (kullanıcı fonksiyonu), MemoryTelemetry (listede tutar)
+• Kapalıyken (GAOptimizer(telemetry=None), varsayılan) sıcak döngülerde hiçbir
+  sayaç / zamanlayıcı çalışmaz; etkinleştirilince çağrılar sayaçlı sarmalayıcılara
+  yönlendirilir
+Not: sayaçlar süreç içi skaler değerlendirmeyi kapsar; workers > 1 ya da
+     batch=True iken check_route / NFZ çağrıları işçilerde ya da NumPy
+     yolunda yapıldığından sayılmaz (süreler yine ölçülür).
+"""
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+OPERATORS = ("fitness", "crossover", "mutate", "repair", "fix_nfz", "local_search",
+             "checkpoint")
+
+
+@dataclass
+class GenerationRecord:
+    gen: int
+    best: float
+    mean: Optional[float]          # yalnızca uygun (sonlu) bireyler; hiç yoksa None
+    worst: float
+    infeasible: float              # -inf oranı
+    pop_size: int
+    elapsed: float                 # çalıştırma başından beri saniye
+    seconds: Dict[str, float] = field(default_factory=dict)   # operatör → süre
+    calls: Dict[str, int] = field(default_factory=dict)       # check_route / nfz_checks
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    def to_json(self) -> dict:
+        d = asdict(self)
+        d["cache_hit_rate"] = self.cache_hit_rate
+        for k in ("best", "mean", "worst"):      # -inf JSON'da geçerli değil
+            if d[k] is not None and not math.isfinite(d[k]):
+                d[k] = None
+        return d
+
+
+class Counters:
+    """Bir nesil boyunca biriken süre / çağrı sayaçları (GAOptimizer içinde)."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(OPERATORS, 0.0)
+        self.calls = {"check_route": 0, "nfz_checks": 0}
+
+    def reset(self):
+        # Yerinde sıfırlanır: sarmalayıcılar aynı sözlükleri tutar
+        for k in self.seconds:
+            self.seconds[k] = 0.0
+        for k in self.calls:
+            self.calls[k] = 0
+
+    def counting(self, name: str, fn: Callable) -> Callable:
+        calls = self.calls
+
+        def wrapped(*args, **kw):
+            calls[name] += 1
+            return fn(*args, **kw)
+        return wrapped
+
+
+def generation_record(gen: int, scores: Sequence[float], elapsed: float,
+                      counters: Counters, cache_hits: int, cache_misses: int) -> GenerationRecord:
+    feasible = [s for s in scores if s != -math.inf]
+    return GenerationRecord(
+        gen=gen, best=max(scores), worst=min(scores),
+        mean=sum(feasible) / len(feasible) if feasible else None,
+        infeasible=1 - len(feasible) / len(scores), pop_size=len(scores), elapsed=elapsed,
+        seconds=dict(counters.seconds), calls=dict(counters.calls),
+        cache_hits=cache_hits, cache_misses=cache_misses)
+
+
+# ---- Alıcılar --------------------------------------------------------------
+class Telemetry:
+    """Alıcı tabanı; alt sınıflar on_generation'ı (isteğe bağlı diğerlerini) ezer."""
+
+    def on_run_start(self, info: dict):
+        pass
+
+    def on_generation(self, rec: GenerationRecord):
+        pass
+
+    def on_run_end(self, info: dict):
+        pass
+
+    def close(self):
+        pass
+
+
+class HookTelemetry(Telemetry):
+    """Her nesil kaydını hook(rec) ile kullanıcıya iletir."""
+
+    def __init__(self, hook: Callable[[GenerationRecord], None]):
+        self.hook = hook
+
+    def on_generation(self, rec: GenerationRecord):
+        self.hook(rec)
+
+
+class MemoryTelemetry(Telemetry):
+    """Kayıtları self.records listesinde tutar (analiz / kıyaslama için)."""
+
+    def __init__(self):
+        self.records: List[GenerationRecord] = []
+        self.runs: List[dict] = []
+
+    def on_generation(self, rec: GenerationRecord):
+        self.records.append(rec)
+
+    def on_run_end(self, info: dict):
+        self.runs.append(info)
+
+    def totals(self) -> Dict[str, float]:
+        """Tüm nesiller boyunca operatör başına toplam süre (s)."""
+        return {op: sum(r.seconds.get(op, 0.0) for r in self.records) for op in OPERATORS}
+
+
+class JSONLTelemetry(Telemetry):
+    """Her olay bir JSON satırı: {"event": "generation", ...}."""
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 1):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.flush_every = flush_every
+        self._n = 0
+
+    def _write(self, event: str, payload: dict):
+        self._f.write(json.dumps({"event": event, "time": time.time(), **payload}) + "\n")
+        self._n += 1
+        if self._n % self.flush_every == 0:
+            self._f.flush()
+
+    def on_run_start(self, info: dict):
+        self._write("run_start", info)
+
+    def on_generation(self, rec: GenerationRecord):
+        self._write("generation", rec.to_json())
+
+    def on_run_end(self, info: dict):
+        self._write("run_end", info)
+        self._f.flush()
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,143 @@
+"""
+NFZ çevresinden dolaşan görünürlük grafiği (senaryo başına bir kez):
+• Köşe düğümleri : tüm gün aktif NFZ poligonları buffer_m kadar (mitre)
+                   genişletilir, dış köşeleri alınır; başka bir NFZ içine
+                   düşen köşeler atılır
+• Köşe ↔ köşe ve düğüm ↔ köşe görünürlüğü: STRtree ile vektörel
+  `intersects` testi (NFZIndex ile aynı poligonlar)
+• Köşeler arası tüm çiftler en kısa yollar (Floyd–Warshall, NumPy) bir kez
+• detour(i, j)   : düz bacak serbestse haversine, değilse
+                   min_a,b  d(i,a) + D(a,b) + d(b,j); çift başına önbellekli
+• detour_matrix(): kapalı tüm çiftler için blok blok vektörel sapma mesafesi
+• detour_scenario: GA için (DistanceMatrix, NFZIndex) — NFZ kesen bacak artık
+  -inf değil sapma maliyeti alır; yalnızca hiç ulaşılamayan çiftler kapalı kalır
+Not: saatli NFZ'ler zamana bağlı olduğundan dolaşılmaz; pencereleri eskisi
+     gibi düz bacak üzerinden blocked_at ile uygulanır.
+"""
+import math
+from typing import Dict, List, Tuple
+import numpy as np
+import shapely
+from shapely import STRtree
+from distance import DistanceMatrix, haversine_matrix
+from nfz import NFZIndex
+
+M_PER_DEG = 111_320.0     # 1° enlem ≈ metre
+
+
+class VisibilityGraph:
+    """DistanceMatrix düğümleri + NFZ köşeleri üzerinde sapma mesafesi kahini."""
+
+    def __init__(self, dm: DistanceMatrix, nfz: NFZIndex, buffer_m: float = 50.0):
+        self.dm, self.nfz = dm, nfz
+        coords = dm.coords
+        polys = [p for p, perm in zip(nfz.polygons, nfz.permanent) if perm]
+        self.tree = STRtree(polys) if polys else None
+
+        # Köşeler: genişletilmiş poligonların dış halkası (kapanış köşesi hariç)
+        lat0 = math.radians(coords[:, 0].mean()) if len(coords) else 0.0
+        deg = buffer_m / (M_PER_DEG * max(math.cos(lat0), 1e-6))
+        ring = [np.asarray(p.buffer(deg, join_style="mitre").exterior.coords)[:-1] for p in polys]
+        corners = np.concatenate(ring) if ring else np.empty((0, 2))
+        if len(corners) and self.tree is not None:
+            inside, _ = self.tree.query(shapely.points(corners), predicate="intersects")
+            corners = np.delete(corners, np.unique(inside), axis=0)
+        self.corners = corners
+        c = len(corners)
+
+        # Köşe ↔ köşe görünürlüğü + Floyd–Warshall
+        D = haversine_matrix(corners, corners) if c else np.empty((0, 0))
+        D[self._blocked_pairs(corners, corners)] = np.inf
+        nxt = np.tile(np.arange(c), (c, 1))                # a → b yolunda a'dan sonraki köşe
+        for k in range(c):
+            via = D[:, k:k + 1] + D[k:k + 1, :]
+            better = via < D
+            D = np.where(better, via, D)
+            nxt = np.where(better, nxt[:, k:k + 1], nxt)
+        self.corner_dist, self.corner_next = D, nxt
+
+        # Düğüm ↔ köşe görünürlüğü (N, C)
+        V = haversine_matrix(coords, corners) if c else np.empty((len(coords), 0))
+        V[self._blocked_pairs(coords, corners)] = np.inf
+        self.node_corner = V
+        # Düğümden her köşeye "köşe grafiği üzerinden" en kısa: R[i, b] = min_a V[i,a] + D[a,b]
+        self._reach: Dict[int, np.ndarray] = {}
+        self._cache: Dict[Tuple[int, int], float] = {}
+
+    def _blocked_pairs(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """a × b segmentlerinden tüm gün aktif bir NFZ'yi kesenlerin maskesi."""
+        mask = np.zeros((len(a), len(b)), dtype=bool)
+        if self.tree is None or not len(a) or not len(b):
+            return mask
+        ii, jj = np.divmod(np.arange(len(a) * len(b)), len(b))
+        segs = np.stack([a[ii], b[jj]], axis=1)
+        hit, _ = self.tree.query(shapely.linestrings(segs), predicate="intersects")
+        mask.flat[np.unique(hit)] = True
+        return mask
+
+    def _reach_row(self, i: int) -> np.ndarray:
+        r = self._reach.get(i)
+        if r is None:
+            v = self.node_corner[i]
+            r = (v[:, None] + self.corner_dist).min(axis=0) if len(v) else v
+            self._reach[i] = r
+        return r
+
+    # --------- sorgular ----------------------------------------------
+    def detour(self, i: int, j: int) -> float:
+        """i → j en kısa NFZ'siz mesafe (metre); ulaşılamıyorsa inf."""
+        if not self.nfz.crosses(i, j):
+            return self.dm.distance(i, j)
+        key = (i, j) if i <= j else (j, i)
+        d = self._cache.get(key)
+        if d is None:
+            r = self._reach_row(i)
+            d = float((r + self.node_corner[j]).min()) if len(r) else math.inf
+            self._cache[key] = d
+        return d
+
+    def path(self, i: int, j: int) -> List[Tuple[float, float]]:
+        """i → j sapma yolunun (lat, lon) noktaları; ulaşılamıyorsa ValueError."""
+        ci, cj = tuple(self.dm.coords[i]), tuple(self.dm.coords[j])
+        if not self.nfz.crosses(i, j):
+            return [ci, cj]
+        V, D = self.node_corner, self.corner_dist
+        if not math.isfinite(self.detour(i, j)):
+            raise ValueError(f"{i} → {j}: NFZ'siz yol yok")
+        total = V[i][:, None] + D + V[j][None, :]
+        a, b = np.unravel_index(np.argmin(total), total.shape)
+        pts = [ci, tuple(self.corners[a])]
+        while a != b:
+            a = self.corner_next[a, b]
+            pts.append(tuple(self.corners[a]))
+        return pts + [cj]
+
+    def detour_matrix(self, block_elems: int = 1 << 24) -> np.ndarray:
+        """dm.dist kopyası; tüm gün NFZ kesen çiftlere sapma mesafesi yazılır."""
+        dist = np.array(self.dm.dist, dtype=np.float64)
+        blocked = self.nfz.blocked
+        rows = np.flatnonzero(blocked.any(axis=1))
+        V, D = self.node_corner, self.corner_dist
+        if not V.shape[1]:
+            dist[blocked] = np.inf
+            return dist
+        n, c = V.shape
+        step = max(1, block_elems // max(1, n * c))
+        for s in range(0, len(rows), step):
+            r = rows[s:s + step]
+            R = (V[r][:, :, None] + D[None]).min(axis=1)              # (r, C)
+            det = (R[:, None, :] + V[None, :, :]).min(axis=2)         # (r, N)
+            sub = dist[r]
+            sub[blocked[r]] = det[blocked[r]]
+            dist[r] = sub
+        return dist
+
+
+def detour_scenario(dm: DistanceMatrix, nfz: NFZIndex,
+                    buffer_m: float = 50.0) -> Tuple[DistanceMatrix, NFZIndex]:
+    """Tüm gün NFZ'leri sapma mesafesine çeviren (dm, nfz) çifti.
+       Kapalı (blocked) yalnızca NFZ'siz yolu hiç olmayan çiftler kalır."""
+    dist = VisibilityGraph(dm, nfz, buffer_m).detour_matrix()
+    blocked = ~np.isfinite(dist)
+    return (dm.with_dist(dist),
+            NFZIndex.from_arrays(nfz.zones, blocked, nfz.timed, nfz.windows))
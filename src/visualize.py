@@ -1,21 +1,164 @@
-import json, folium, random
-from pathlib import Path
-from models import Drone, Delivery, NoFlyZone
+import argparse
+import folium, random
+import numpy as np
+import shapely
+from folium.plugins import FastMarkerCluster
+from scenario_io import load_scenario
 from graph import haversine, build_graph
+from distance import _ids, haversine_pairs, positions
 from ga import GAOptimizer
 from cluster import kmeans_partition
 
 COLORS = ["blue", "green", "purple", "orange", "darkred",
           "cadetblue", "darkgreen", "pink", "gray", "black"]
+LAZY_FROM   = 50         # bu kadar drone'dan sonra rotalar drone başına gizli katman
+DIGITS      = 5          # GeoJSON koordinat hassasiyeti (~1 m)
+M_PER_DEG   = 111_320.0  # sadeleştirme toleransı: metre → derece (yaklaşık)
 
-def load(p, cls):
-    with open(p, encoding="utf-8") as f:
-        return [cls(**o) for o in json.load(f)]
+# Teslimat noktaları tek JS dizisi olarak gömülür; işaretçiler istemcide kümelenir
+DELIVERY_MARKER = """function (row) {
+    var m = L.circleMarker(new L.LatLng(row[0], row[1]), {radius: 5, color: "orange"});
+    m.bindPopup("Del-" + row[2] + " (" + row[3].toFixed(1) + " kg)");
+    return m;
+}"""
 
-def main():
-    drones     = load(Path("data/drones_s1.json"),     Drone)
-    deliveries = load(Path("data/deliveries_s1.json"), Delivery)
-    zones      = load(Path("data/nofly_s1.json"),      NoFlyZone)
+
+# ---- GeoJSON katmanları ----------------------------------------------------
+def _lonlat(coords: np.ndarray) -> list:
+    """(lat, lon) dizisi → yuvarlanmış [lon, lat] listesi (GeoJSON sırası)."""
+    return np.round(coords[:, ::-1], DIGITS).tolist()
+
+
+def _collection(features: list) -> dict:
+    return {"type": "FeatureCollection", "features": features}
+
+
+def route_lines(drones, deliveries, routes, simplify_m: float = 0.0):
+    """Drone başına depo → duraklar → depo çizgisi: [(drone, (K,2) lat/lon, km)].
+       Teslimatlar id → satır dizisiyle bulunur (durak başına tarama yok);
+       simplify_m > 0 ise çizgiler shapely ile toplu sadeleştirilir (km asıl
+       çizgiden hesaplanır)."""
+    ids = np.asarray(_ids(deliveries), dtype=np.int64)
+    pos = positions(deliveries, "pos")
+    row = np.full(int(ids.max()) + 1 if len(ids) else 1, -1, dtype=np.int64)
+    row[ids] = np.arange(len(ids))
+    homes = positions(drones, "start_pos")
+
+    lines = []
+    for k, dr in enumerate(drones):
+        stops = pos[row[np.asarray(routes.get(dr.id, []), dtype=np.int64)]]
+        lines.append(np.vstack([homes[k], stops, homes[k]]))
+    km = [float(haversine_pairs(ln[:-1], ln[1:]).sum()) / 1000 for ln in lines]
+    if simplify_m > 0 and lines:
+        sizes = [len(ln) for ln in lines]
+        geoms = shapely.linestrings(np.vstack(lines), indices=np.repeat(np.arange(len(lines)), sizes))
+        geoms = shapely.simplify(geoms, simplify_m / M_PER_DEG, preserve_topology=False)
+        pts, which = shapely.get_coordinates(geoms, return_index=True)
+        counts = np.bincount(which, minlength=len(lines))
+        # sıfır uzunluklu (tek noktaya çöken) çizgiler asıl hâliyle kalır
+        lines = [ln if len(s) < 2 else s
+                 for ln, s in zip(lines, np.split(pts, np.cumsum(counts)[:-1]))]
+    return [(dr, ln, d) for dr, ln, d in zip(drones, lines, km)]
+
+
+def zones_geojson(zones, simplify_m: float = 0.0) -> dict:
+    feats = []
+    for z in zones:
+        poly = shapely.Polygon([(lon, lat) for lat, lon in z.coordinates])
+        if simplify_m > 0:
+            poly = poly.simplify(simplify_m / M_PER_DEG, preserve_topology=True)
+        ring = np.round(np.asarray(poly.exterior.coords), DIGITS).tolist()
+        feats.append({"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]},
+                      "properties": {"zone": z.id, "active": " – ".join(z.active_time)}})
+    return _collection(feats)
+
+
+def route_feature(dr, line: np.ndarray, km: float, color: str, stops: int) -> dict:
+    return {"type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": _lonlat(line)},
+            "properties": {"drone": dr.id, "stops": stops, "km": round(km, 2), "color": color}}
+
+
+def _route_style(feature):
+    return {"color": feature["properties"]["color"], "weight": 3, "opacity": 0.8}
+
+
+def export_map(drones, deliveries, zones, routes, path: str = "map.html",
+               simplify_m: float = 0.0, lazy=None, cluster: bool = True) -> folium.Map:
+    """Büyük filolar için harita: teslimatlar, NFZ'ler, depolar ve rotalar
+       birkaç birleşik GeoJSON katmanında (nesne başına folium öğesi yok).
+       cluster    : teslimatlar FastMarkerCluster ile istemcide kümelenir
+       simplify_m : rota / NFZ çizgileri bu toleransla (metre) sadeleştirilir
+       lazy       : True → her drone rotası ayrı, başlangıçta gizli katman (yalnız
+                    açıldığında çizilir); None → drone sayısı LAZY_FROM'u aşarsa"""
+    lazy = len(drones) > LAZY_FROM if lazy is None else lazy
+    homes = positions(drones, "start_pos")
+    m = folium.Map(location=homes[0].tolist(), zoom_start=12, tiles="OpenStreetMap",
+                   prefer_canvas=True)
+
+    # NFZ
+    folium.GeoJson(zones_geojson(zones, simplify_m), name="NFZ",
+                   style_function=lambda f: {"color": "red", "fillColor": "red",
+                                             "fillOpacity": 0.3, "weight": 2},
+                   tooltip=folium.GeoJsonTooltip(["zone", "active"])).add_to(m)
+
+    # Teslimatlar
+    pos = positions(deliveries, "pos")
+    weight = [d.weight for d in deliveries] if getattr(deliveries, "column", None) is None \
+        else deliveries.column("weight").tolist()
+    if cluster:
+        data = [[round(a, DIGITS), round(b, DIGITS), i, round(w, 2)]
+                for (a, b), i, w in zip(pos.tolist(), _ids(deliveries), weight)]
+        FastMarkerCluster(data, callback=DELIVERY_MARKER, name="Teslimatlar").add_to(m)
+    else:
+        folium.GeoJson(_collection([
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": p},
+             "properties": {"id": i, "kg": round(w, 2)}}
+            for p, i, w in zip(_lonlat(pos), _ids(deliveries), weight)]),
+            name="Teslimatlar", marker=folium.CircleMarker(radius=5, color="orange"),
+            tooltip=folium.GeoJsonTooltip(["id", "kg"])).add_to(m)
+
+    # Depolar (aynı konumdaki drone'lar tek işaretçi)
+    depot, inv = np.unique(np.round(homes, DIGITS), axis=0, return_inverse=True)
+    drone_ids = np.asarray(_ids(drones))
+    folium.GeoJson(_collection([
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]},
+         "properties": {"drones": ", ".join(map(str, drone_ids[inv.ravel() == k].tolist()))}}
+        for k, (lat, lon) in enumerate(depot.tolist())]),
+        name="Depolar", marker=folium.CircleMarker(radius=8, color="blue", fill=True),
+        tooltip=folium.GeoJsonTooltip(["drones"])).add_to(m)
+
+    # Rotalar
+    lines = route_lines(drones, deliveries, routes, simplify_m)
+    feats = [route_feature(dr, ln, km, COLORS[k % len(COLORS)], len(routes.get(dr.id, [])))
+             for k, (dr, ln, km) in enumerate(lines) if routes.get(dr.id)]
+    tooltip = ["drone", "stops", "km"]
+    if lazy:
+        for f in feats:
+            folium.GeoJson(f, name=f"Drone {f['properties']['drone']}", show=False,
+                           style_function=_route_style,
+                           tooltip=folium.GeoJsonTooltip(tooltip)).add_to(m)
+    else:
+        folium.GeoJson(_collection(feats), name="Rotalar", style_function=_route_style,
+                       tooltip=folium.GeoJsonTooltip(tooltip)).add_to(m)
+
+    folium.LayerControl(collapsed=lazy).add_to(m)
+    if path:
+        m.save(path)
+    return m
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="GA çözümünü folium haritasına aktarır")
+    ap.add_argument("--scenario", default="s1", help="senaryo adı ya da .scn dizini")
+    ap.add_argument("--out", default="map.html")
+    ap.add_argument("--generations", type=int, default=30)
+    ap.add_argument("--simplify", type=float, default=0.0, help="çizgi sadeleştirme (m)")
+    ap.add_argument("--lazy", action="store_true", default=None,
+                    help="drone başına gizli rota katmanları")
+    args = ap.parse_args(argv)
+
+    drones, deliveries, zones = load_scenario(args.scenario)
 
     # --- K‑Means kümeleri ---
     clusters = kmeans_partition(deliveries, len(drones))
@@ -27,39 +170,15 @@ def main():
     ga = GAOptimizer(
             drones, deliveries, g, zones,
             pop_size=15,
-            generations=30,
-            mutation_rate=0.2,
-            init_chrom=init_chrom)
+            generations=args.generations,
+            mutation_rate=0.2)
 
-    _, best = ga.run()      # best = chrom dict
+    _, best = ga.run(initial=[init_chrom])      # best = chrom dict; kümelerle sıcak başlangıç
 
     # --- Harita ---
-    m = folium.Map(location=drones[0].start_pos, zoom_start=12, tiles="OpenStreetMap")
-
-    # NFZ
-    for z in zones:
-        folium.Polygon(z.coordinates, color="red", fill=True, fill_opacity=0.3).add_to(m)
-
-    # Teslimatlar
-    for d in deliveries:
-        folium.CircleMarker(d.pos, radius=5, color="orange",
-                            popup=f"Del-{d.id} ({d.weight:.1f} kg)").add_to(m)
-
-    # Rotalar
-    for idx, dr in enumerate(drones):
-        color = COLORS[idx % len(COLORS)]
-        folium.Marker(dr.start_pos,
-                      icon=folium.Icon(color="blue", icon="home"),
-                      popup=f"Drone {dr.id}").add_to(m)
-
-        coords = [dr.start_pos] + \
-                 [next(dl.pos for dl in deliveries if dl.id == rid) for rid in best[dr.id]] + \
-                 [dr.start_pos]
-        folium.PolyLine(coords, color=color, weight=3, opacity=0.8,
-                        popup=f"Drone {dr.id} rotası").add_to(m)
-
-    m.save("map.html")
-    print("✔  Harita map.html dosyasına kaydedildi. Tarayıcıda açabilirsiniz.")
+    export_map(drones, deliveries, zones, best, args.out,
+               simplify_m=args.simplify, lazy=args.lazy)
+    print(f"✔  Harita {args.out} dosyasına kaydedildi. Tarayıcıda açabilirsiniz.")
 
 if __name__ == "__main__":
     main()